@@ -8,7 +8,7 @@ import lux
 import warnings
 from lux.utils.tracing_utils import LuxTracer
 import os
-from lux._config.template import postgres_template, mysql_template
+from lux._config.template import postgres_template, mysql_template, sqlite_template
 
 RegisteredOption = namedtuple("RegisteredOption", "name action display_condition args")
 
@@ -47,8 +47,19 @@ class Config:
         self._sampling_start = 100000
         self._sampling_cap = 1000000
         self._sampling_flag = True
+        self._sampling_strategy = "uniform"
+        self._sampling_min_category_count = 30
+        self._progressive_aggregation = False
         self._heatmap_flag = True
         self._heatmap_start = 5000
+        self._approx_cardinality_threshold = None
+        self._metadata_cache_dir = None
+        self._metadata_cache_size = 512 * 1024 * 1024
+        self._metadata_store = None
+        self._metadata_workers = 1
+        self._execution_workers = 1
+        self._aggregate_cache_size = 64 * 1024 * 1024
+        self._aggregate_cache = None
         self.lazy_maintain = True
         self.early_pruning = True
         self.early_pruning_sample_cap = 30000
@@ -267,6 +278,284 @@ class Config:
                 stacklevel=2,
             )
 
+    @property
+    def sampling_strategy(self):
+        """
+        Parameters
+        ----------
+        strategy : str
+            "uniform" to sample rows uniformly at random, or "stratified" to keep
+            every category of low-cardinality nominal attributes and reweight the sampled rows
+        """
+        return self._sampling_strategy
+
+    @sampling_strategy.setter
+    def sampling_strategy(self, strategy: str) -> None:
+        """
+        Parameters
+        ----------
+        strategy : str
+            "uniform" to sample rows uniformly at random, or "stratified" to keep
+            every category of low-cardinality nominal attributes and reweight the sampled rows
+        """
+        if strategy in ["uniform", "stratified"]:
+            self._sampling_strategy = strategy
+        else:
+            warnings.warn(
+                "The sampling strategy must be either 'uniform' or 'stratified'.",
+                stacklevel=2,
+            )
+
+    @property
+    def sampling_min_category_count(self):
+        """
+        Parameters
+        ----------
+        count : int
+            Minimum number of rows kept for every category by stratified sampling
+        """
+        return self._sampling_min_category_count
+
+    @sampling_min_category_count.setter
+    def sampling_min_category_count(self, count: int) -> None:
+        """
+        Parameters
+        ----------
+        count : int
+            Minimum number of rows kept for every category by stratified sampling
+        """
+        if type(count) == int and count >= 1:
+            self._sampling_min_category_count = count
+        else:
+            warnings.warn(
+                "The minimum number of rows per category must be a positive integer.",
+                stacklevel=2,
+            )
+
+    @property
+    def progressive_aggregation(self):
+        """
+        Parameters
+        ----------
+        progressive : bool
+            Whether bar and line charts pruned early on large dataframes are aggregated on growing samples,
+            with confidence intervals, until the ranking of their interestingness is stable
+        """
+        return self._progressive_aggregation
+
+    @progressive_aggregation.setter
+    def progressive_aggregation(self, progressive: bool) -> None:
+        """
+        Parameters
+        ----------
+        progressive : bool
+            Whether bar and line charts pruned early on large dataframes are aggregated on growing samples,
+            with confidence intervals, until the ranking of their interestingness is stable
+        """
+        if type(progressive) == bool:
+            self._progressive_aggregation = progressive
+        else:
+            warnings.warn(
+                "The flag for progressive aggregation must be a boolean.",
+                stacklevel=2,
+            )
+
+    @property
+    def approx_cardinality_threshold(self):
+        """
+        Parameters
+        ----------
+        threshold : int
+            Number of distinct values above which the cardinality of a column is estimated
+            with a HyperLogLog sketch and its unique values are not stored (None, the default, to disable)
+        """
+        return self._approx_cardinality_threshold
+
+    @approx_cardinality_threshold.setter
+    def approx_cardinality_threshold(self, threshold: Optional[int]) -> None:
+        """
+        Parameters
+        ----------
+        threshold : int
+            Number of distinct values above which the cardinality of a column is estimated
+            with a HyperLogLog sketch and its unique values are not stored (None, the default, to disable)
+        """
+        if threshold is None or (type(threshold) == int and threshold > 0):
+            self._approx_cardinality_threshold = threshold
+        else:
+            warnings.warn(
+                "The approximate cardinality threshold must be a positive integer or None.",
+                stacklevel=2,
+            )
+
+    @property
+    def metadata_cache_dir(self):
+        """
+        Parameters
+        ----------
+        directory : str
+            Directory where the metadata computed for dataframes is cached across sessions,
+            so that reopening the same data does not recompute it (None to disable)
+        """
+        return self._metadata_cache_dir
+
+    @metadata_cache_dir.setter
+    def metadata_cache_dir(self, directory: Optional[str]) -> None:
+        """
+        Parameters
+        ----------
+        directory : str
+            Directory where the metadata computed for dataframes is cached across sessions,
+            so that reopening the same data does not recompute it (None to disable)
+        """
+        if directory is None or isinstance(directory, (str, os.PathLike)):
+            self._metadata_cache_dir = directory
+            self._metadata_store = None
+        else:
+            warnings.warn(
+                "The metadata cache directory must be a path or None.",
+                stacklevel=2,
+            )
+
+    @property
+    def metadata_cache_size(self):
+        """
+        Parameters
+        ----------
+        size : int
+            Maximum size of the metadata cache in bytes, least recently used entries are evicted beyond it
+        """
+        return self._metadata_cache_size
+
+    @metadata_cache_size.setter
+    def metadata_cache_size(self, size: int) -> None:
+        """
+        Parameters
+        ----------
+        size : int
+            Maximum size of the metadata cache in bytes, least recently used entries are evicted beyond it
+        """
+        if type(size) == int and size > 0:
+            self._metadata_cache_size = size
+            self._metadata_store = None
+        else:
+            warnings.warn(
+                "The size of the metadata cache must be a positive integer.",
+                stacklevel=2,
+            )
+
+    @property
+    def metadata_workers(self):
+        """
+        Parameters
+        ----------
+        workers : int
+            Number of threads profiling and typing columns concurrently when computing metadata
+        """
+        return self._metadata_workers
+
+    @metadata_workers.setter
+    def metadata_workers(self, workers: int) -> None:
+        """
+        Parameters
+        ----------
+        workers : int
+            Number of threads profiling and typing columns concurrently when computing metadata
+        """
+        if type(workers) == int and workers >= 1:
+            self._metadata_workers = workers
+        else:
+            warnings.warn(
+                "The number of metadata workers must be a positive integer.",
+                stacklevel=2,
+            )
+
+    @property
+    def execution_workers(self):
+        """
+        Parameters
+        ----------
+        workers : int
+            Number of processes executing and scoring the visualizations of large VisLists,
+            by default 1 (executed serially in the calling process)
+        """
+        return self._execution_workers
+
+    @execution_workers.setter
+    def execution_workers(self, workers: int) -> None:
+        """
+        Parameters
+        ----------
+        workers : int
+            Number of processes executing and scoring the visualizations of large VisLists,
+            by default 1 (executed serially in the calling process)
+        """
+        if type(workers) == int and workers >= 1:
+            self._execution_workers = workers
+        else:
+            warnings.warn(
+                "The number of execution workers must be a positive integer.",
+                stacklevel=2,
+            )
+
+    @property
+    def metadata_store(self):
+        """
+        On-disk metadata cache configured by `metadata_cache_dir` and `metadata_cache_size`, or None if disabled
+        """
+        if self._metadata_cache_dir is None:
+            return None
+        if self._metadata_store is None:
+            from lux.utils.metadata_store import MetadataStore
+
+            self._metadata_store = MetadataStore(self._metadata_cache_dir, self._metadata_cache_size)
+        return self._metadata_store
+
+    @property
+    def aggregate_cache_size(self):
+        """
+        Parameters
+        ----------
+        size : int
+            Maximum size in bytes of the group-by aggregates cached in memory by the executor,
+            least recently used aggregates are evicted beyond it (0 disables the cache)
+        """
+        return self._aggregate_cache_size
+
+    @aggregate_cache_size.setter
+    def aggregate_cache_size(self, size: int) -> None:
+        """
+        Parameters
+        ----------
+        size : int
+            Maximum size in bytes of the group-by aggregates cached in memory by the executor,
+            least recently used aggregates are evicted beyond it (0 disables the cache)
+        """
+        if type(size) == int and size >= 0:
+            self._aggregate_cache_size = size
+            if self._aggregate_cache is not None:
+                self._aggregate_cache.max_size = size
+                self._aggregate_cache.evict()
+        else:
+            warnings.warn(
+                "The size of the aggregate cache must be a non-negative integer.",
+                stacklevel=2,
+            )
+
+    @property
+    def aggregate_cache(self):
+        """
+        In-memory cache of group-by aggregates configured by `aggregate_cache_size`, or None if disabled.
+        Its `hits`, `misses` and `hit_rate` count the lookups served from the cache.
+        """
+        if self._aggregate_cache_size == 0:
+            return None
+        if self._aggregate_cache is None:
+            from lux.utils.aggregate_cache import AggregateCache
+
+            self._aggregate_cache = AggregateCache(self._aggregate_cache_size)
+        return self._aggregate_cache
+
     @property
     def heatmap(self):
         """
@@ -423,8 +712,16 @@ class Config:
         Parameters:
             connection : SQLAlchemy connectable, str, or sqlite3 connection
                 For more information, `see here <https://docs.sqlalchemy.org/en/13/core/connections.html>`__
+                SQLite databases (sqlite3 connections or SQLAlchemy engines with the sqlite dialect)
+                are queried with the SQLite query template
         """
-        self.set_executor_type("SQL")
+        import sqlite3
+
+        dialect = getattr(getattr(connection, "dialect", None), "name", None)
+        if isinstance(connection, sqlite3.Connection) or dialect == "sqlite":
+            self.set_executor_type("SQLite")
+        else:
+            self.set_executor_type("SQL")
         self.SQLconnection = connection
 
     def read_query_template(self, query_template):
@@ -436,7 +733,7 @@ class Config:
                 (key, val) = line.split(":")
                 query_dict[key] = val.strip()
         else:
-            with open(query_file) as f:
+            with open(query_template) as f:
                 for line in f:
                     (key, val) = line.split(":")
                     query_dict[key] = val.strip()
@@ -444,18 +741,37 @@ class Config:
         self.executor = SQLExecutor()
 
     def set_executor_type(self, exe):
+        """
+        Sets the executor processing the visualizations
+
+        Parameters:
+            exe : str
+                'Pandas' (default), 'SQL' for a Postgres database (see set_SQL_connection),
+                'SQLite' for a SQLite database,
+                or 'DuckDB' to process the visualizations of dataframes with an embedded DuckDB database
+        """
         if exe == "SQL":
             from lux.executor.SQLExecutor import SQLExecutor
 
             self.executor = SQLExecutor()
             self.read_query_template(postgres_template)
+        elif exe.lower() == "sqlite":
+            from lux.executor.SQLExecutor import SQLExecutor
+
+            self.executor = SQLExecutor()
+            self.read_query_template(sqlite_template)
         elif exe == "Pandas":
             from lux.executor.PandasExecutor import PandasExecutor
 
             self.SQLconnection = ""
             self.executor = PandasExecutor()
+        elif exe.lower() == "duckdb":
+            from lux.executor.DuckDBExecutor import DuckDBExecutor
+
+            self.SQLconnection = ""
+            self.executor = DuckDBExecutor()
         else:
-            raise ValueError("Executor type must be either 'Pandas' or 'SQL'")
+            raise ValueError("Executor type must be either 'Pandas', 'SQL', 'SQLite' or 'DuckDB'")
 
 
 def warning_format(message, category, filename, lineno, file=None, line=None):
@@ -37,3 +37,23 @@ min_max_query:SELECT MIN({attribute}) as min, MAX({attribute}) as max FROM {tabl
 cardinality_query:SELECT COUNT(Distinct({attribute})) as count FROM {table_name} WHERE {attribute} IS NOT NULL
 unique_query:SELECT Distinct({attribute}) FROM {table_name} WHERE {attribute} IS NOT NULL
 datatype_query:SELECT DATA_TYPE as data_type FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = '{table_name}' AND COLUMN_NAME = '{attribute}'"""
+
+sqlite_template = """preview_query:SELECT * from {table_name} LIMIT {num_rows}
+length_query:SELECT COUNT(1) as length FROM {table_name} {where_clause}
+sample_query:SELECT * FROM {table_name} {where_clause} ORDER BY random() LIMIT {num_rows}
+scatter_query:SELECT {columns} FROM {table_name} {where_clause}
+colored_barchart_counts:SELECT "{groupby_attr}", "{color_attr}", COUNT("{groupby_attr}") as count FROM {table_name} {where_clause} GROUP BY "{groupby_attr}", "{color_attr}"
+colored_barchart_average:SELECT "{groupby_attr}", "{color_attr}", AVG("{measure_attr}") as "{measure_attr}" FROM {table_name} {where_clause} GROUP BY "{groupby_attr}", "{color_attr}"
+colored_barchart_sum:SELECT "{groupby_attr}", "{color_attr}", SUM("{measure_attr}") as "{measure_attr}" FROM {table_name} {where_clause} GROUP BY "{groupby_attr}", "{color_attr}"
+colored_barchart_max:SELECT "{groupby_attr}", "{color_attr}", MAX("{measure_attr}") as "{measure_attr}" FROM {table_name} {where_clause} GROUP BY "{groupby_attr}", "{color_attr}"
+barchart_counts:SELECT "{groupby_attr}", COUNT("{groupby_attr}") as count FROM {table_name} {where_clause} GROUP BY "{groupby_attr}"
+barchart_average:SELECT "{groupby_attr}", AVG("{measure_attr}") as "{measure_attr}" FROM {table_name} {where_clause} GROUP BY "{groupby_attr}"
+barchart_sum:SELECT "{groupby_attr}", SUM("{measure_attr}") as "{measure_attr}" FROM {table_name} {where_clause} GROUP BY "{groupby_attr}"
+barchart_max:SELECT "{groupby_attr}", MAX("{measure_attr}") as "{measure_attr}" FROM {table_name} {where_clause} GROUP BY "{groupby_attr}"
+histogram_counts:SELECT width_bucket, COUNT(width_bucket) as count FROM (SELECT IFNULL(MIN(CAST((CAST("{bin_attribute}" AS REAL) - {attr_min}) / {bin_width} AS INT), {num_bins} - 1), {num_bins} - 1) as width_bucket FROM {table_name} {where_clause}) as buckets GROUP BY width_bucket ORDER BY width_bucket
+heatmap_counts:SELECT width_bucket1, width_bucket2, COUNT(*) as count FROM (SELECT IFNULL(MIN(CAST((CAST("{x_attribute}" AS REAL) - {x_attr_min}) / {x_bin_width} AS INT), {num_bins} - 1), {num_bins} - 1) + 1 as width_bucket1, IFNULL(MIN(CAST((CAST("{y_attribute}" AS REAL) - {y_attr_min}) / {y_bin_width} AS INT), {num_bins} - 1), {num_bins} - 1) + 1 as width_bucket2 FROM {table_name} {where_clause}) as labeled_data GROUP BY width_bucket1, width_bucket2
+table_attributes_query:SELECT name as column_name FROM pragma_table_info('{table_name}')
+min_max_query:SELECT MIN("{attribute}") as min, MAX("{attribute}") as max FROM {table_name}
+cardinality_query:SELECT COUNT(DISTINCT "{attribute}") as count FROM {table_name} WHERE "{attribute}" IS NOT NULL
+unique_query:SELECT DISTINCT "{attribute}" FROM {table_name} WHERE "{attribute}" IS NOT NULL
+datatype_query:SELECT CASE WHEN type LIKE '%DATE%' OR type LIKE '%TIME%' THEN 'timestamp' WHEN type LIKE '%BOOL%' THEN 'boolean' WHEN type LIKE '%INT%' THEN 'integer' WHEN type = '' OR type LIKE '%CHAR%' OR type LIKE '%CLOB%' OR type LIKE '%TEXT%' THEN 'text' WHEN type LIKE '%REAL%' OR type LIKE '%FLOA%' OR type LIKE '%DOUB%' THEN 'real' ELSE 'numeric' END as data_type FROM pragma_table_info('{table_name}') WHERE name = '{attribute}'"""
@@ -51,7 +51,7 @@ def add_filter(ldf):
                 "description": f"Changing the <p class='highlight-intent'>{fltr.attribute}</p> filter to an alternative value.",
                 "long_description": f"Swap out the filter value for {fltr.attribute} to other possible values, while keeping all else the same. Visualizations are ranked based on interestingness",
             }
-            unique_values = ldf.unique_values[fltr.attribute]
+            unique_values = utils.get_unique_values(ldf, fltr.attribute)
             filter_values.append(fltr.value)
             # creates vis with new filters
             for val in unique_values:
@@ -29,6 +29,18 @@ import traceback
 import lux
 
 
+class _iLocIndexer(pd.core.indexing._iLocIndexer):
+    """
+    Positional indexer of a LuxDataFrame. Values written with .loc and .iloc are all set through it,
+    so that the metadata of the written columns is expired.
+    """
+
+    def _setitem_with_indexer(self, indexer, value, name="iloc"):
+        super(_iLocIndexer, self)._setitem_with_indexer(indexer, value, name)
+        self.obj.expire_column_metadata(self.obj._written_columns(indexer))
+        self.obj.expire_recs()
+
+
 class LuxDataFrame(pd.DataFrame):
     """
     A subclass of pd.DataFrame that supports all dataframe operations while housing other variables and functions for generating visual recommendations.
@@ -57,39 +69,62 @@ class LuxDataFrame(pd.DataFrame):
         "_type_override",
     ]
 
+    # Default values of the attributes, created the first time they are read (see __getattr__),
+    # so that the many dataframes pandas creates internally do not allocate them upfront.
+    # Derived dataframes reference the metadata of their parent (see __finalize__ and _constructor_sliced),
+    # so shared metadata is replaced, not mutated in place (e.g., the history is copied before appending an event).
+    _default_metadata = {
+        "_history": History,
+        "_intent": list,
+        "_inferred_intent": list,
+        "_recommendation": dict,
+        "_saved_export": lambda: None,
+        "_current_vis": list,
+        "_prev": lambda: None,
+        "_widget": lambda: None,
+        "_rec_info": lambda: None,
+        "table_name": str,
+        "_sampled": lambda: None,
+        "_approx_sample": lambda: None,
+        "_reservoir": lambda: None,
+        "_sample_version": lambda: None,
+        "_toggle_pandas_display": lambda: True,
+        "_message": Message,
+        "_pandas_only": lambda: False,
+        # Metadata
+        "_data_type": dict,
+        "unique_values": lambda: None,
+        "cardinality": lambda: None,
+        "_min_max": lambda: None,
+        "_column_stats": lambda: None,
+        "_length": lambda: None,
+        "pre_aggregated": lambda: None,
+        "_type_override": dict,
+        "_column_versions": lambda: None,
+        # Token identifying the current contents of the dataframe, replaced whenever the data changes
+        "_data_version": object,
+        # Token identifying the rows of the dataframe, only replaced when rows are added, removed or reordered
+        "_rows_version": object,
+        "_stale_columns": lambda: None,
+        "_vis_cache": lambda: None,
+        "_bitmap_index": lambda: None,
+        "_dictionary_encoding": lambda: None,
+    }
+
     def __init__(self, *args, **kw):
-        self._history = History()
-        self._intent = []
-        self._inferred_intent = []
-        self._recommendation = {}
-        self._saved_export = None
-        self._current_vis = []
-        self._prev = None
-        self._widget = None
         super(LuxDataFrame, self).__init__(*args, **kw)
 
-        self.table_name = ""
         if lux.config.SQLconnection == "":
             from lux.executor.PandasExecutor import PandasExecutor
 
-            lux.config.executor = PandasExecutor()
+            # Keep the executor of dataframes set with lux.config.set_executor_type (e.g., DuckDBExecutor)
+            if not isinstance(lux.config.executor, PandasExecutor):
+                lux.config.executor = PandasExecutor()
         else:
             from lux.executor.SQLExecutor import SQLExecutor
 
             # lux.config.executor = SQLExecutor()
 
-        self._sampled = None
-        self._approx_sample = None
-        self._toggle_pandas_display = True
-        self._message = Message()
-        self._pandas_only = False
-        # Metadata
-        self._data_type = {}
-        self.unique_values = None
-        self.cardinality = None
-        self._min_max = None
-        self.pre_aggregated = None
-        self._type_override = {}
         warnings.formatwarning = lux.warning_format
 
     @property
@@ -106,13 +141,30 @@ class LuxDataFrame(pd.DataFrame):
 
         return f
 
+    def __finalize__(self, other, method=None, **kwargs):
+        super(LuxDataFrame, self).__finalize__(other, method=method, **kwargs)
+        if method == "concat" and getattr(other, "axis", None) == 0 and len(other.objs) > 0:
+            # Rows appended to a dataframe keep their positions, so its sample can be extended incrementally
+            first = other.objs[0]
+            if isinstance(first, LuxDataFrame) and first._reservoir is not None:
+                if first._reservoir.n_rows <= len(first):
+                    self._reservoir = first._reservoir.copy()
+        # Metadata with stale columns is only kept up to date on the frame it belongs to
+        if getattr(other, "_stale_columns", None) is not None:
+            self._data_type = None
+            self.unique_values = None
+            self.cardinality = None
+            self._min_max = None
+            self.pre_aggregated = None
+        return self
+
     @property
     def history(self):
         return self._history
 
     @property
     def data_type(self):
-        if not self._data_type:
+        if not self._data_type or getattr(self, "_stale_columns", None) is not None:
             self.maintain_metadata()
         return self._data_type
 
@@ -121,9 +173,22 @@ class LuxDataFrame(pd.DataFrame):
         Compute dataset metadata and statistics
         """
         if len(self) > 0:
-            if lux.config.executor.name != "SQLExecutor":
-                lux.config.executor.compute_stats(self)
-            lux.config.executor.compute_dataset_metadata(self)
+            stale_columns = getattr(self, "_stale_columns", None)
+            self._stale_columns = None
+            if stale_columns is not None and lux.utils.utils.is_dataframe_executor():
+                # Only some columns changed since the metadata was last computed
+                lux.config.executor.compute_stats(self, columns=stale_columns)
+                lux.config.executor.compute_dataset_metadata(self, columns=stale_columns)
+            else:
+                store = lux.config.metadata_store if lux.utils.utils.is_dataframe_executor() else None
+                fingerprint = store.fingerprint(self) if store is not None else None
+                # Rehydrate the metadata computed for the same data in an earlier session
+                if fingerprint is None or not store.load(self, fingerprint):
+                    if lux.config.executor.name != "SQLExecutor":
+                        lux.config.executor.compute_stats(self)
+                    lux.config.executor.compute_dataset_metadata(self)
+                    if fingerprint is not None:
+                        store.save(self, fingerprint)
             self._infer_structure()
             self._metadata_fresh = True
 
@@ -131,7 +196,7 @@ class LuxDataFrame(pd.DataFrame):
         """
         Maintain dataset metadata and statistics (Compute only if needed)
         """
-        is_sql_tbl = lux.config.executor.name != "PandasExecutor"
+        is_sql_tbl = not lux.utils.utils.is_dataframe_executor()
 
         if lux.config.SQLconnection != "" and is_sql_tbl:
             from lux.executor.SQLExecutor import SQLExecutor
@@ -156,28 +221,111 @@ class LuxDataFrame(pd.DataFrame):
             self._recommendation = {}
             self._widget = None
             self._rec_info = None
+
+    def _expire_stale_samples(self) -> None:
+        """
+        Expire the samples of the dataframe if its data or the sampling settings changed since they were drawn.
+        Samples are tied to the version of the data rather than to the recommendations,
+        so that changing the intent or the recommendations reuses them.
+        """
+        version = (
+            self._data_version,
+            lux.config.sampling,
+            lux.config.sampling_start,
+            lux.config.sampling_cap,
+            lux.config.sampling_strategy,
+            lux.config.sampling_min_category_count,
+            lux.config.early_pruning_sample_start,
+            lux.config.early_pruning_sample_cap,
+        )
+        if lux.config.sampling_strategy == "stratified":
+            # Stratified samples also depend on the data types
+            version += (dict(self._type_override or {}),)
+        if self._sample_version != version:
             self._sampled = None
+            self._approx_sample = None
+            self._sample_version = version
 
     def expire_metadata(self) -> None:
         """
         Expire all saved metadata to trigger a recomputation the next time the data is required.
         """
+        if lux.config._aggregate_cache is not None:
+            lux.config._aggregate_cache.expire_columns(self._rows_version)
+        self._data_version = object()
+        self._rows_version = object()
+        self._bitmap_index = None
+        self._dictionary_encoding = None
         if lux.config.lazy_maintain:
             self._metadata_fresh = False
             self._data_type = None
             self.unique_values = None
             self.cardinality = None
             self._min_max = None
+            self._column_stats = None
             self.pre_aggregated = None
+            self._stale_columns = None
+            self._vis_cache = None
+
+    def expire_column_metadata(self, columns: List) -> None:
+        """
+        Expire the saved metadata of the given columns only, so that the next time the data is required
+        only these columns are re-profiled and re-typed, and only the vis that touch them are re-executed.
+
+        Parameters
+        ----------
+        columns : List
+            Names of the columns that were added, modified or removed
+        """
+        self._data_version = object()
+        changed = set(columns)
+        if lux.config._aggregate_cache is not None:
+            lux.config._aggregate_cache.expire_columns(self._rows_version, changed)
+        if self._bitmap_index is not None:
+            self._bitmap_index.expire_columns(columns)
+        if self._dictionary_encoding is not None:
+            self._dictionary_encoding.expire_columns(columns)
+        if self._min_max and not changed.isdisjoint(self._min_max):
+            # Overwritten values may fall outside of their former range, which no longer fixes their bins
+            self._min_max = {attr: value for attr, value in self._min_max.items() if attr not in changed}
+        if lux.config.lazy_maintain:
+            if self.columns.nlevels > 1:
+                self.expire_metadata()
+                return
+            versions = getattr(self, "_column_versions", None) or {}
+            for column in changed:
+                versions[column] = versions.get(column, 0) + 1
+            self._column_versions = versions
+            # Only track stale columns if there is metadata left to update, otherwise everything gets recomputed
+            stale_columns = getattr(self, "_stale_columns", None)
+            metadata_fresh = hasattr(self, "_metadata_fresh") and self._metadata_fresh
+            if metadata_fresh or stale_columns is not None:
+                self._stale_columns = (stale_columns or set()) | changed
+            self._metadata_fresh = False
+            # Drop the cached vis data that depends on the changed columns
+            vis_cache = getattr(self, "_vis_cache", None)
+            if vis_cache:
+                self._vis_cache = {
+                    key: entry for key, entry in vis_cache.items() if not changed.intersection(entry[2])
+                }
 
     #####################
     ## Override Pandas ##
     #####################
     def __getattr__(self, name):
-        ret_value = super(LuxDataFrame, self).__getattr__(name)
-        self.expire_metadata()
+        default_metadata = type(self)._default_metadata
+        if name in default_metadata:
+            value = default_metadata[name]()
+            self.__dict__[name] = value
+            return value
+        # Attribute access (e.g., df.col) only reads the data, so it does not expire anything.
+        # In-place changes made through the returned Series are reported back via _maybe_cache_changed.
+        return super(LuxDataFrame, self).__getattr__(name)
+
+    def _maybe_cache_changed(self, item, value, inplace: bool) -> None:
+        super(LuxDataFrame, self)._maybe_cache_changed(item, value, inplace)
+        self.expire_column_metadata([item])
         self.expire_recs()
-        return ret_value
 
     def _set_axis(self, axis, labels):
         super(LuxDataFrame, self)._set_axis(axis, labels)
@@ -186,12 +334,49 @@ class LuxDataFrame(pd.DataFrame):
 
     def _update_inplace(self, *args, **kwargs):
         super(LuxDataFrame, self)._update_inplace(*args, **kwargs)
+        # Rows may have been reordered or removed, so the sample has to be rebuilt
+        self._reservoir = None
         self.expire_metadata()
         self.expire_recs()
 
+    def _maybe_update_cacher(self, *args, **kwargs) -> None:
+        super(LuxDataFrame, self)._maybe_update_cacher(*args, **kwargs)
+        # Rows appended in place (e.g., df.loc[new_label] = row) are only reported here
+        if lux.config.lazy_maintain and self._length is not None and len(self) != self._length:
+            self.expire_metadata()
+            self.expire_recs()
+
     def _set_item(self, key, value):
         super(LuxDataFrame, self)._set_item(key, value)
-        self.expire_metadata()
+        self.expire_column_metadata([key])
+        self.expire_recs()
+
+    @property
+    def iloc(self):
+        return _iLocIndexer("iloc", self)
+
+    def _written_columns(self, indexer) -> List:
+        """
+        Labels of the columns written through a positional indexer (see _iLocIndexer).
+        Rows written as a whole, and new rows or columns, write every column.
+        """
+        if isinstance(indexer, tuple) and len(indexer) == 2 and not isinstance(indexer[1], dict):
+            try:
+                columns = self.columns[indexer[1]]
+            except (IndexError, TypeError, ValueError):
+                return list(self.columns)
+            return list(columns) if isinstance(columns, pd.Index) else [columns]
+        return list(self.columns)
+
+    def _set_value(self, index, col, value, takeable: bool = False) -> None:
+        # Values written with .at and .iat
+        super(LuxDataFrame, self)._set_value(index, col, value, takeable=takeable)
+        self.expire_column_metadata([self.columns[col] if takeable else col])
+        self.expire_recs()
+
+    def __delitem__(self, key):
+        super(LuxDataFrame, self).__delitem__(key)
+        self.expire_column_metadata([key])
         self.expire_recs()
 
     def _infer_structure(self):
@@ -199,7 +384,7 @@ class LuxDataFrame(pd.DataFrame):
         is_multi_index_flag = self.index.nlevels != 1
         not_int_index_flag = not pd.api.types.is_integer_dtype(self.index)
 
-        is_sql_tbl = lux.config.executor.name != "PandasExecutor"
+        is_sql_tbl = not lux.utils.utils.is_dataframe_executor()
 
         small_df_flag = len(self) < 100 and is_sql_tbl
         if self.pre_aggregated == None:
@@ -849,12 +1034,14 @@ class LuxDataFrame(pd.DataFrame):
     def head(self, n: int = 5):
         ret_val = super(LuxDataFrame, self).head(n)
         ret_val._prev = self
+        ret_val._history = ret_val._history.copy()
         ret_val._history.append_event("head", n=5)
         return ret_val
 
     def tail(self, n: int = 5):
         ret_val = super(LuxDataFrame, self).tail(n)
         ret_val._prev = self
+        ret_val._history = ret_val._history.copy()
         ret_val._history.append_event("tail", n=5)
         return ret_val
 
@@ -19,6 +19,7 @@ import traceback
 import numpy as np
 from lux.history.history import History
 from lux.utils.message import Message
+from lux.utils.profile_utils import UniqueValues
 from lux.vis.VisList import VisList
 from typing import Dict, Union, List, Callable
 
@@ -65,13 +66,19 @@ class LuxSeries(pd.Series):
         "_message": Message,
     }
 
+    _metadata_names = frozenset(_metadata) - {"name"}
+
     def __init__(self, *args, **kw):
         super(LuxSeries, self).__init__(*args, **kw)
-        for attr in self._metadata:
-            if attr in self._default_metadata:
-                self.__dict__[attr] = self._default_metadata[attr]()
-            else:
-                self.__dict__[attr] = None
+
+    def __getattr__(self, name):
+        # Metadata is created the first time it is read, so that the many Series pandas creates internally
+        # do not allocate a History, a Message, ... upfront
+        if name in LuxSeries._metadata_names:
+            value = self._default_metadata[name]() if name in self._default_metadata else None
+            self.__dict__[name] = value
+            return value
+        return super(LuxSeries, self).__getattr__(name)
 
     @property
     def _constructor(self):
@@ -121,7 +128,11 @@ class LuxSeries(pd.Series):
         https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.Series.unique.html
         """
         if self.unique_values and self.name in self.unique_values.keys():
-            return np.array(self.unique_values[self.name])
+            unique_values = self.unique_values[self.name]
+            if isinstance(unique_values, UniqueValues):
+                # Cached as an array, so return it without re-materializing the values
+                return unique_values.values
+            return np.array(unique_values)
         else:
             return super(LuxSeries, self).unique()
 
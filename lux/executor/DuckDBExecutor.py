@@ -0,0 +1,418 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+import lux
+from lux.core.frame import LuxDataFrame
+from lux.executor.PandasExecutor import PandasExecutor
+from lux.utils import utils
+from lux.utils.message import Message
+from lux.utils.dictionary_encoding import DictionaryEncoding
+from lux.utils.sampling_utils import SAMPLE_WEIGHT, SampleView
+from lux.vis.Vis import Vis
+from lux.vis.VisList import VisList
+
+# Name of the sampled rows registered with DuckDB
+ROWS_VIEW = "lux_rows"
+
+# Aggregation functions computed by DuckDB, over the values and over the weights of a stratified sample
+AGGREGATES = {
+    "count": "COUNT({measure})",
+    "sum": "COALESCE(SUM({measure}), 0)",
+    "mean": "AVG({measure})",
+    "min": "MIN({measure})",
+    "max": "MAX({measure})",
+}
+WEIGHTED_AGGREGATES = {
+    "count": "SUM(CASE WHEN {measure} IS NULL THEN 0 ELSE {weight} END)",
+    "sum": "COALESCE(SUM({measure} * {weight}), 0)",
+    "mean": "SUM({measure} * {weight}) / SUM(CASE WHEN {measure} IS NULL THEN 0 ELSE {weight} END)",
+    "min": "MIN({measure})",
+    "max": "MAX({measure})",
+}
+
+
+class DuckDBExecutor(PandasExecutor):
+    """
+    Given a Vis objects with complete specifications, fetch and process data of a dataframe with an embedded
+    DuckDB database. The sampled rows of the dataframe are registered with DuckDB, which scans their columns
+    in place and aggregates and bins them with its vectorized engine, on all the cores of the machine.
+    Sampling, filters, the post-processing of the aggregates and the metadata are shared with the PandasExecutor,
+    so that both executors produce the same vis data, and the vis that DuckDB does not support are processed
+    by the PandasExecutor.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.name = "DuckDBExecutor"
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError(
+                "The DuckDB executor requires the duckdb package, which you can install with:\n"
+                "\tpip install duckdb"
+            )
+        self._error = duckdb.Error
+        self.connection = duckdb.connect()
+
+    def __repr__(self):
+        return f"<DuckDBExecutor>"
+
+    def execute(self, vislist: VisList, ldf: LuxDataFrame, approx=False):
+        """
+        Given a VisList, fetch the data required to render the vis.
+        Bar and line charts, histograms and heatmaps are processed with DuckDB (see execute_queries),
+        the other vis, as well as approximated vis and traced executions (code export), by the PandasExecutor.
+
+        Parameters
+        ----------
+        vislist: list[lux.Vis]
+            vis list that contains lux.Vis objects for visualization.
+        ldf : lux.core.frame
+            LuxDataFrame with specified intent.
+        approx : bool
+            Whether the vis are approximated on the early pruning sample
+
+        Returns
+        -------
+        None
+        """
+        if lux.config.tracer.tracing or approx:
+            return PandasExecutor.execute(vislist, ldf, approx)
+        PandasExecutor.execute_sampling(ldf)
+        PandasExecutor.execute(self.execute_queries(vislist, ldf), ldf)
+
+    def execute_queries(self, vislist: VisList, ldf: LuxDataFrame) -> List[Vis]:
+        """
+        Process the bar and line charts, histograms and heatmaps of a VisList with DuckDB.
+        The sampled rows of the vis sharing the same filters, selected with the bitmap index of the dataframe,
+        are registered once with DuckDB, without copying their numeric columns.
+        Vis over other types of columns (e.g., datetimes), and vis whose queries fail
+        (e.g., over columns of mixed types), are left to the PandasExecutor.
+
+        Returns
+        -------
+        List[Vis]
+            Vis that were not processed, and still need to be processed
+        """
+        if not ldf.columns.is_unique:
+            return vislist
+        dtypes = ldf.dtypes
+        kinds = {}
+
+        def kind(attribute):
+            # Kind of the NumPy dtype of a column, where object columns only qualify if they hold strings,
+            # since DuckDB converts the values of columns of mixed types to strings
+            if attribute not in kinds:
+                dtype = dtypes.get(attribute)
+                if not isinstance(attribute, str) or not isinstance(dtype, np.dtype):
+                    kinds[attribute] = None
+                elif dtype.kind == "O":
+                    is_string = pd.api.types.infer_dtype(ldf[attribute], skipna=True) == "string"
+                    kinds[attribute] = "O" if is_string else None
+                else:
+                    kinds[attribute] = dtype.kind
+            return kinds[attribute]
+
+        batches = {}
+        remaining = []
+        for vis in vislist:
+            cache_key = PandasExecutor._vis_cache_key(vis, ldf)
+            filters = tuple(
+                (clause.attribute, clause.filter_op, clause.value)
+                for clause in utils.get_filter_specs(vis._inferred_intent)
+            )
+            try:
+                hash(filters)
+            except TypeError:
+                filters = None
+            if (
+                (cache_key is not None and ldf._vis_cache and cache_key in ldf._vis_cache)
+                or filters is None
+                or not self._supported(vis, kind)
+            ):
+                remaining.append(vis)
+            else:
+                batches.setdefault(filters, []).append((vis, cache_key))
+        for filters, batch in batches.items():
+            columns = [clause.attribute for vis, _ in batch for clause in vis._inferred_intent]
+            sample = PandasExecutor._filter_sample(ldf, ldf._sampled, filters)
+            rows = sample.take(columns)
+            try:
+                self.connection.register(ROWS_VIEW, self._scanned_rows(ldf, sample, rows, kind))
+            except self._error:
+                remaining.extend(vis for vis, _ in batch)
+                continue
+            try:
+                for vis, cache_key in batch:
+                    try:
+                        if vis.mark == "histogram":
+                            result = self._bin(vis, ldf, rows)
+                        elif vis.mark == "heatmap":
+                            result = self._bin_2D(vis, ldf, rows)
+                        else:
+                            result = self._aggregate(vis, rows)
+                    except self._error:
+                        remaining.append(vis)
+                        continue
+                    vis._source = ldf
+                    if cache_key is not None:
+                        message, ldf._message = ldf._message, Message()
+                    if vis.mark == "histogram":
+                        vis._vis_data, missing = result
+                        if missing:
+                            bin_attr = vis._vis_data.columns[0]
+                            ldf._message.add_unique(
+                                f"The column <code>{bin_attr}</code> contains missing values, not shown in the displayed histogram.",
+                                priority=100,
+                            )
+                    elif vis.mark == "heatmap":
+                        vis._vis_data = result
+                    else:
+                        vis._vis_data = rows
+                        PandasExecutor.execute_aggregate(
+                            vis, isFiltered=len(filters) > 0, aggregated=result.__finalize__(rows)
+                        )
+                    vis.data._intent = []
+                    if cache_key is not None:
+                        PandasExecutor._cache_vis_data(vis, ldf, cache_key, message)
+            finally:
+                self.connection.unregister(ROWS_VIEW)
+        return remaining
+
+    @staticmethod
+    def _scanned_rows(ldf: LuxDataFrame, sample: SampleView, rows: LuxDataFrame, kind: Callable) -> LuxDataFrame:
+        """
+        Sampled rows registered with DuckDB, where string columns are replaced by categoricals over the
+        dictionary encoding of the dataframe (see DictionaryEncoding), encoded once per version of the data,
+        which DuckDB scans as enums instead of converting every string of the column in every query
+        """
+        encoding = ldf._dictionary_encoding
+        if encoding is None or encoding.n_rows != len(ldf):
+            encoding = ldf._dictionary_encoding = DictionaryEncoding(len(ldf))
+        pdf = lux.core.originalDF(rows, copy=False)
+        data = {}
+        for column in pdf.columns:
+            values = pdf[column]._values
+            encoded = encoding.encode(ldf, column) if kind(column) == "O" else None
+            if encoded is not None:
+                codes, categories = encoded
+                if sample.positions is not None:
+                    codes = codes.take(sample.positions)
+                if len(categories) > 0 and pd.isna(categories[-1]):
+                    # Missing values are coded as -1 in a categorical, instead of a missing category
+                    categories = categories[:-1]
+                    codes = np.where(codes == len(categories), -1, codes)
+                values = pd.Categorical.from_codes(codes, categories)
+            data[column] = values
+        return LuxDataFrame(data, columns=list(data))
+
+    @staticmethod
+    def _supported(vis: Vis, kind: Callable) -> bool:
+        """
+        Whether the vis is a bar or line chart aggregated by count, sum, mean, min or max,
+        a histogram or a heatmap, over columns that DuckDB scans like pandas (numbers, booleans and strings),
+        given the kind of the dtype of each column
+        """
+        if vis.mark == "histogram":
+            bin_attribute = [clause for clause in vis._inferred_intent if clause.bin_size != 0][0]
+            return kind(bin_attribute.attribute) in list("iuf")
+        if vis.mark == "heatmap":
+            x_attr = vis.get_attr_by_channel("x")[0].attribute
+            y_attr = vis.get_attr_by_channel("y")[0].attribute
+            if kind(x_attr) not in list("iuf") or kind(y_attr) not in list("iuf"):
+                return False
+            color_attr = vis.get_attr_by_channel("color")
+            if len(color_attr) == 0:
+                return True
+            color_kind = kind(color_attr[0].attribute)
+            if color_attr[0].data_type == "quantitative":
+                return color_kind in list("iuf")
+            return color_attr[0].data_type == "nominal" and color_kind in list("biufO")
+        spec = PandasExecutor._aggregate_spec(vis)
+        if spec is None or spec[2] not in AGGREGATES:
+            return False
+        (_, groupby_attrs), measure, _ = spec
+        if measure != "Record" and kind(measure) not in list("iuf"):
+            return False
+        return all(kind(attr) in list("biufO") for attr in groupby_attrs)
+
+    @staticmethod
+    def _quote(attribute: str) -> str:
+        return '"' + attribute.replace('"', '""') + '"'
+
+    def _aggregate(self, vis: Vis, rows: LuxDataFrame) -> LuxDataFrame:
+        """
+        Aggregate the measure of a bar or line chart per group of its group-by attributes,
+        with the groups sorted like a pandas group-by (see PandasExecutor.execute_aggregate)
+        """
+        (_, groupby_attrs), measure, agg_func = PandasExecutor._aggregate_spec(vis)
+        keys = ", ".join(self._quote(attr) for attr in groupby_attrs)
+        weight = self._quote(SAMPLE_WEIGHT) if SAMPLE_WEIGHT in rows.columns else None
+        if measure == "Record":
+            aggregate = "COUNT(*)" if weight is None else f"SUM({weight})"
+        elif weight is None:
+            aggregate = AGGREGATES[agg_func].format(measure=self._quote(measure))
+            if agg_func == "sum" and rows.dtypes[measure].kind in "iu":
+                aggregate = f"CAST({aggregate} AS BIGINT)"
+        else:
+            aggregate = WEIGHTED_AGGREGATES[agg_func].format(measure=self._quote(measure), weight=weight)
+        query = (
+            f"SELECT {keys}, {aggregate} AS {self._quote(measure)} FROM {ROWS_VIEW} "
+            f"GROUP BY {keys} ORDER BY {keys} NULLS LAST"
+        )
+        result = self.connection.execute(query).fetchdf()
+        for attr in groupby_attrs:
+            if isinstance(result[attr].dtype, pd.CategoricalDtype):
+                # Strings scanned as enums (see _scanned_rows), grouped under NaN when missing like pandas
+                result[attr] = result[attr].astype(object)
+        return LuxDataFrame(result._mgr)
+
+    @staticmethod
+    def _binned_rows(columns: dict, extra: List[str] = None, where: str = "TRUE") -> str:
+        """
+        Query of the sampled rows within the range of the bins of the given columns, with the index of the bin
+        of each column computed like PandasExecutor._bin_index, including its corrections for rounding errors
+
+        Parameters
+        ----------
+        columns : dict
+            Columns to bin, by their alias in the query (whose bins are the parameters
+            $<alias>_start, $<alias>_end, $<alias>_step and $<alias>_scale, see _bin_parameters)
+        extra : List[str], optional
+            Other expressions selected from the rows
+        where : str, optional
+            Condition selecting the rows, by default all rows
+        """
+        query = ", ".join(
+            [f"CAST({DuckDBExecutor._quote(column)} AS DOUBLE) AS {alias}" for alias, column in columns.items()]
+            + (extra or [])
+        )
+        query = f"SELECT {query} FROM {ROWS_VIEW} WHERE {where}"
+        in_range = " AND ".join(f"{alias} >= ${alias}_start AND {alias} <= ${alias}_end" for alias in columns)
+        indices = ", ".join(
+            f"LEAST(CAST(TRUNC(({alias} - ${alias}_start) * ${alias}_scale) AS BIGINT), $bins - 1) AS {alias}_bin"
+            for alias in columns
+        )
+        query = f"SELECT *, {indices} FROM ({query}) WHERE {in_range}"
+        # Rows rounded into the next bin are moved back, and rows rounded into the previous bin (except
+        # into the last bin, which includes its end) are moved forward, in a single projection
+        corrections = ", ".join(
+            f"CASE WHEN {alias} < ${alias}_start + {alias}_bin * ${alias}_step THEN {alias}_bin - 1 "
+            f"WHEN {alias} >= ${alias}_start + ({alias}_bin + 1) * ${alias}_step AND {alias}_bin <> $bins - 1 "
+            f"THEN {alias}_bin + 1 ELSE {alias}_bin END AS {alias}_bin"
+            for alias in columns
+        )
+        return f"SELECT * REPLACE ({corrections}) FROM ({query})"
+
+    @staticmethod
+    def _bin_parameters(alias: str, edges: np.ndarray) -> dict:
+        """
+        Parameters of the bins of a column in a query of _binned_rows
+        """
+        bin_size = len(edges) - 1
+        return {
+            f"{alias}_start": float(edges[0]),
+            f"{alias}_end": float(edges[-1]),
+            # Same step as np.linspace, so that the edges are computed exactly like _bin_edges
+            f"{alias}_step": float((edges[-1] - edges[0]) / bin_size),
+            f"{alias}_scale": float(bin_size / (edges[-1] - edges[0])),
+        }
+
+    def _bin(self, vis: Vis, ldf: LuxDataFrame, rows: LuxDataFrame):
+        """
+        Bin the data of a histogram, over the same bins as PandasExecutor.execute_batch_binning
+
+        Returns
+        -------
+        data : LuxDataFrame
+            Left edge and (weighted) number of records of each bin
+        missing : bool
+            Whether some values are missing, i.e., NaN, infinite or outside of the range of the bins
+        """
+        bin_attribute = [clause for clause in vis._inferred_intent if clause.bin_size != 0][0]
+        bin_attr = bin_attribute.attribute
+        bin_size = bin_attribute.bin_size
+        value_range = PandasExecutor._bin_range(ldf, bin_attr, rows[bin_attr].to_numpy())
+        edges = PandasExecutor._bin_edges(value_range, bin_size)
+        if SAMPLE_WEIGHT in rows.columns:
+            binned = self._binned_rows({"x": bin_attr}, [f"{self._quote(SAMPLE_WEIGHT)} AS w"])
+            count = "SUM(w)"
+        else:
+            binned = self._binned_rows({"x": bin_attr})
+            count = "COUNT(*)"
+        query = f"SELECT x_bin, COUNT(*) AS n, {count} AS count FROM ({binned}) GROUP BY x_bin"
+        parameters = {"bins": bin_size, **self._bin_parameters("x", edges)}
+        result = self.connection.execute(query, parameters).fetchnumpy()
+        counts = np.zeros(bin_size, dtype=np.int64 if count == "COUNT(*)" else np.float64)
+        counts[np.asarray(result["x_bin"], dtype=np.intp)] = np.asarray(result["count"])
+        missing = int(np.sum(result["n"])) < len(rows)
+        binned_result = np.array([edges[:-1], counts]).T
+        return pd.DataFrame(binned_result, columns=[bin_attr, "Number of Records"]), missing
+
+    def _bin_2D(self, vis: Vis, ldf: LuxDataFrame, rows: LuxDataFrame) -> LuxDataFrame:
+        """
+        Bin the data of a heatmap, over the same bins and with the same colors as PandasExecutor._bin_heatmap:
+        the average value of a quantitative color, or the most frequent category of a nominal color
+        (the smallest one in case of ties), in each non-empty cell
+        """
+        bin_size = lux.config.heatmap_bin_size
+        x_attr = vis.get_attr_by_channel("x")[0].attribute
+        y_attr = vis.get_attr_by_channel("y")[0].attribute
+        color_attr = vis.get_attr_by_channel("color")
+        color_attr = color_attr[0] if len(color_attr) > 0 else None
+        x_edges = PandasExecutor._bin_edges(
+            PandasExecutor._bin_range(ldf, x_attr, rows[x_attr].to_numpy()), bin_size
+        )
+        y_edges = PandasExecutor._bin_edges(
+            PandasExecutor._bin_range(ldf, y_attr, rows[y_attr].to_numpy()), bin_size
+        )
+        parameters = {
+            "bins": bin_size,
+            **self._bin_parameters("x", x_edges),
+            **self._bin_parameters("y", y_edges),
+        }
+        cell = "x_bin * $bins + y_bin"
+        if color_attr is None:
+            binned = self._binned_rows({"x": x_attr, "y": y_attr})
+            query = f"SELECT {cell} AS cell, COUNT(*) AS count FROM ({binned}) GROUP BY cell ORDER BY cell"
+        else:
+            color = self._quote(color_attr.attribute)
+            binned = self._binned_rows({"x": x_attr, "y": y_attr}, [f"{color} AS color"], f"{color} IS NOT NULL")
+            if color_attr.data_type == "quantitative":
+                query = (
+                    f"SELECT {cell} AS cell, COUNT(*) AS count, AVG(color) AS color FROM ({binned}) "
+                    f"GROUP BY cell ORDER BY cell"
+                )
+            else:
+                pairs = f"SELECT {cell} AS cell, color, COUNT(*) AS n FROM ({binned}) GROUP BY cell, color"
+                query = (
+                    "SELECT cell, count, color FROM ("
+                    "SELECT cell, color, CAST(SUM(n) OVER (PARTITION BY cell) AS BIGINT) AS count, "
+                    f"ROW_NUMBER() OVER (PARTITION BY cell ORDER BY n DESC, color) AS rank FROM ({pairs})"
+                    ") WHERE rank = 1 ORDER BY cell"
+                )
+        cells = self.connection.execute(query, parameters).fetchdf()
+        x_index, y_index = np.divmod(cells["cell"].to_numpy(), bin_size)
+        result = {"count": cells["count"].to_numpy()}
+        if color_attr is not None:
+            result[color_attr.attribute] = cells["color"].to_numpy()
+        result["xBinStart"] = x_edges[x_index]
+        result["xBinEnd"] = x_edges[x_index + 1]
+        result["yBinStart"] = y_edges[y_index]
+        result["yBinEnd"] = y_edges[y_index + 1]
+        return pd.DataFrame(result)
@@ -12,7 +12,9 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import numpy as np
 import pandas as pd
+from typing import List
 from lux.vis.VisList import VisList
 from lux.vis.Vis import Vis
 from lux.core.frame import LuxDataFrame
@@ -20,6 +22,23 @@ from lux.executor.Executor import Executor
 from lux.utils import utils
 from lux.utils.date_utils import is_datetime_series, is_timedelta64_series, timedelta64_to_float_seconds
 from lux.utils.utils import check_import_lux_widget, check_if_id_like, is_numeric_nan_column
+from lux.utils.profile_utils import FrameSnapshot, UniqueValues, parallel_map, profile_columns
+from lux.utils.bitmap_index import BitmapIndex
+from lux.utils.dictionary_encoding import DictionaryEncoding
+from lux.utils import parallel_utils
+from lux.utils.sampling_utils import (
+    SAMPLE_WEIGHT,
+    STRATA_MAX_CARDINALITY,
+    SampleView,
+    aggregate_error_bounds,
+    progressive_sizes,
+    top_k_stable,
+    reservoir_sample,
+    stratified_sample,
+    weighted_aggregate,
+)
+from functools import partial
+from lux.utils.message import Message
 import warnings
 import lux
 from lux.utils.tracing_utils import LuxTracer
@@ -43,8 +62,15 @@ class PandasExecutor(Executor):
         """
         Compute and cache a sample for the overall dataframe
 
+        - The sample is a SampleView holding the positions of the sampled rows, whose columns
+          are only gathered when a vis needs them
+        - Uniform samples are drawn from a reservoir sample attached to the dataframe,
+          which is extended incrementally when rows are appended (see sampling_utils.reservoir_sample)
         - When # of rows exceeds lux.config.sampling_start, take 75% df as sample
         - When # of rows exceeds lux.config.sampling_cap, cap the df at {lux.config.sampling_cap} rows
+        - When lux.config.sampling_strategy is "stratified", sample at the same rate but keep
+          at least lux.config.sampling_min_category_count rows of every category (see execute_stratified_sampling)
+        - Samples are reused until the data or the sampling settings change (see LuxDataFrame._expire_stale_samples)
 
         lux.config.sampling_start = 100k rows
         lux.config.sampling_cap = 1M rows
@@ -58,22 +84,60 @@ class PandasExecutor(Executor):
         SAMPLE_CAP = lux.config.sampling_cap
         SAMPLE_FRAC = 0.75
 
-        if SAMPLE_FLAG and len(ldf) > SAMPLE_CAP:
+        ldf._expire_stale_samples()
+        if SAMPLE_FLAG and len(ldf) > SAMPLE_START and lux.config.sampling_strategy == "stratified":
             if ldf._sampled is None:  # memoize unfiltered sample df
-                ldf._sampled = ldf.sample(n=SAMPLE_CAP, random_state=1)
+                frac = SAMPLE_CAP / len(ldf) if len(ldf) > SAMPLE_CAP else SAMPLE_FRAC
+                ldf._sampled = PandasExecutor.execute_stratified_sampling(ldf, frac)
+            ldf._message.add_unique(
+                f"Large dataframe detected: Lux is visualizing a stratified sample of {len(ldf._sampled)} rows, weighted to represent the full dataframe.",
+                priority=99,
+            )
+        elif SAMPLE_FLAG and len(ldf) > SAMPLE_CAP:
+            if ldf._sampled is None:  # memoize unfiltered sample df
+                ldf._sampled = reservoir_sample(ldf, SAMPLE_CAP)
             ldf._message.add_unique(
                 f"Large dataframe detected: Lux is only visualizing a sample capped at {SAMPLE_CAP} rows.",
                 priority=99,
             )
         elif SAMPLE_FLAG and len(ldf) > SAMPLE_START:
             if ldf._sampled is None:  # memoize unfiltered sample df
-                ldf._sampled = ldf.sample(frac=SAMPLE_FRAC, random_state=1)
+                ldf._sampled = reservoir_sample(ldf, round(SAMPLE_FRAC * len(ldf)))
             ldf._message.add_unique(
                 f"Large dataframe detected: Lux is visualizing a sample of {SAMPLE_FRAC}% of the dataframe ({len(ldf._sampled)} rows).",
                 priority=99,
             )
         else:
-            ldf._sampled = ldf
+            ldf._sampled = SampleView(ldf)
+
+    @staticmethod
+    def execute_stratified_sampling(ldf: LuxDataFrame, frac: float) -> SampleView:
+        """
+        Sample the dataframe while keeping every category of its low-cardinality nominal attributes,
+        which a uniform sample of skewed data may miss.
+        The weight of each sampled row is gathered in the SAMPLE_WEIGHT column,
+        so that counts and sums computed on the sample can be rescaled to the full dataframe.
+
+        Parameters
+        ----------
+        ldf : LuxDataFrame
+        frac : float
+            Sampling rate of the rows of common categories
+
+        Returns
+        -------
+        SampleView
+            Sampled rows, with their weights
+        """
+        data_type = ldf.data_type
+        cardinality = ldf.cardinality or {}
+        strata = [
+            attr
+            for attr in ldf.columns
+            if data_type.get(attr) == "nominal" and 1 < cardinality.get(attr, 0) <= STRATA_MAX_CARDINALITY
+        ]
+        positions, weights = stratified_sample(ldf, frac, strata, lux.config.sampling_min_category_count)
+        return SampleView(ldf, positions, weights)
 
     @staticmethod
     def execute_approx_sample(ldf: LuxDataFrame):
@@ -115,22 +179,56 @@ class PandasExecutor(Executor):
         """
 
         PandasExecutor.execute_sampling(ldf)
+        if approx and lux.config.progressive_aggregation:
+            vislist = PandasExecutor.execute_progressive(vislist, ldf)
+        if not lux.config.tracer.tracing and lux.config.execution_workers > 1:
+            # Execute and score the partitions of large VisLists on the process pool
+            vislist = PandasExecutor.execute_parallel(vislist, ldf, approx)
+        if not lux.config.tracer.tracing:
+            # Aggregate the charts sharing the same filters and group-by attributes in a single pass,
+            # reusing the aggregates cached by the executor
+            vislist = PandasExecutor.execute_batch_aggregate(vislist, ldf, approx)
+            # Bin the histograms sharing the same filters over a single gather of their sampled rows
+            vislist = PandasExecutor.execute_batch_binning(vislist, ldf, approx)
         for vis in vislist:
             # The vis data starts off being original or sampled dataframe
             vis._source = ldf
-            vis._vis_data = ldf._sampled
+            # Only gather the sampled rows of the columns the vis refers to
+            sample_columns = [clause.attribute for clause in vis._inferred_intent]
+            vis._vis_data = ldf._sampled.take(sample_columns)
             # Approximating vis for early pruning
             if approx:
                 vis._original_df = vis._vis_data
                 PandasExecutor.execute_approx_sample(ldf)
-                vis._vis_data = ldf._approx_sample
+                vis._vis_data = ldf._approx_sample.take(sample_columns)
                 vis.approx = True
-            filter_executed = PandasExecutor.execute_filter(vis)
+            cache_key = PandasExecutor._vis_cache_key(vis, ldf, approx)
+            if cache_key is not None and ldf._vis_cache and cache_key in ldf._vis_cache:
+                # Reuse the processed data, since none of the columns this vis depends on has changed
+                PandasExecutor._reuse_vis_data(vis, ldf, cache_key)
+                continue
+            if cache_key is not None:
+                # Record the messages raised while processing this vis, so that they can be replayed on reuse
+                message, ldf._message = ldf._message, Message()
+            if not lux.config.tracer.tracing and utils.get_filter_specs(vis._inferred_intent):
+                # Select the sampled rows with the bitmap index of the dataframe, instead of comparing them again
+                sample = ldf._approx_sample if approx else ldf._sampled
+                filters = [
+                    (clause.attribute, clause.filter_op, clause.value)
+                    for clause in utils.get_filter_specs(vis._inferred_intent)
+                ]
+                vis._vis_data = PandasExecutor._filter_sample(ldf, sample, filters).take(sample_columns)
+                filter_executed = True
+            else:
+                filter_executed = PandasExecutor.execute_filter(vis)
             # Select relevant data based on attribute information
             attributes = set([])
             for clause in vis._inferred_intent:
                 if clause.attribute != "Record":
                     attributes.add(clause.attribute)
+            if SAMPLE_WEIGHT in vis._vis_data.columns and vis.mark in ["bar", "line", "geographical", "histogram"]:
+                # Keep the weights of a stratified sample, to rescale the aggregated counts
+                attributes.add(SAMPLE_WEIGHT)
             # TODO: Add some type of cap size on Nrows ?
             vis._vis_data = vis._vis_data[list(attributes)]
 
@@ -145,11 +243,715 @@ class PandasExecutor(Executor):
                 else:
                     vis._mark = "heatmap"
                     PandasExecutor.execute_2D_binning(vis)
+            if SAMPLE_WEIGHT in vis._vis_data.columns:
+                vis._vis_data = vis._vis_data.drop(columns=[SAMPLE_WEIGHT])
             # Ensure that intent is not propogated to the vis data (bypass intent setter, since trigger vis.data metadata recompute)
             vis.data._intent = []
+            if cache_key is not None:
+                PandasExecutor._cache_vis_data(vis, ldf, cache_key, message)
+
+    @staticmethod
+    def execute_parallel(vislist: VisList, ldf: LuxDataFrame, approx=False) -> List[Vis]:
+        """
+        Execute and score the vis of a large VisList on a pool of lux.config.execution_workers processes.
+        The columns the vis refer to are shared with the workers through memory-mapped files (see SharedFrame),
+        so that only the vis are sent to the workers, which execute contiguous partitions of the VisList
+        and compute their interestingness (reused by the actions, see Vis._precomputed_score).
+        Results are collected in the order of the VisList, so that they do not depend on the number of workers.
+
+        Parameters
+        ----------
+        vislist: list[lux.Vis]
+            vis list that contains lux.Vis objects for visualization.
+        ldf : lux.core.frame
+            LuxDataFrame with specified intent.
+        approx : bool
+            Whether the vis are approximated on the early pruning sample
+
+        Returns
+        -------
+        List[Vis]
+            Vis that were not executed, and still need to be processed:
+            vis whose data is cached, or all of them if the workload is too small for the pool
+        """
+        workers = lux.config.execution_workers
+        remaining = []
+        pending = []
+        for vis in vislist:
+            cache_key = PandasExecutor._vis_cache_key(vis, ldf, approx)
+            if cache_key is not None and ldf._vis_cache and cache_key in ldf._vis_cache:
+                remaining.append(vis)
+            else:
+                pending.append(vis)
+        if (
+            len(pending) < 2 * workers
+            or len(pending) * len(ldf._sampled) < parallel_utils.MIN_PARALLEL_WORK
+            or not ldf.columns.is_unique
+            or isinstance(ldf.index, pd.MultiIndex)
+        ):
+            return vislist
+        columns = list(dict.fromkeys(clause.attribute for vis in pending for clause in vis._inferred_intent))
+        columns = [column for column in columns if column in ldf.columns]
+        shared = parallel_utils.share(ldf, columns)
+        header_path = shared.write_header(ldf, columns)
+        # A few partitions per worker balance the load
+        bounds = np.linspace(0, len(pending), min(len(pending), 4 * workers) + 1).astype(int)
+        partitions = [pending[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+        try:
+            pool = parallel_utils.get_pool(workers)
+            futures = [
+                pool.submit(
+                    parallel_utils.execute_partition,
+                    header_path,
+                    [parallel_utils.detach(vis) for vis in partition],
+                    approx,
+                )
+                for partition in partitions
+            ]
+            partition_results = [future.result() for future in futures]
+        except Exception as error:
+            warnings.warn(
+                f"\nLux could not execute the visualizations on {workers} processes ({error!r})."
+                + "\nThe visualizations are executed serially instead.",
+                stacklevel=2,
+            )
+            return vislist
+        finally:
+            shared.remove_header(header_path)
+        if ldf._vis_cache is None:
+            ldf._vis_cache = {}
+        for partition, (results, messages) in zip(partitions, partition_results):
+            for msg in messages:
+                ldf._message.add_unique(msg["text"], priority=msg["priority"])
+            for vis, (data, mark, vis_approx, score, vis_messages) in zip(partition, results):
+                vis._source = ldf
+                vis._mark = mark
+                vis.approx = vis_approx
+                if approx:
+                    # Exact recomputation, if needed, samples the dataframe again
+                    vis._original_df = ldf
+                vis._vis_data = None if data is None else LuxDataFrame(data).__finalize__(ldf)
+                vis._precomputed_score = (vis._vis_data, score)
+                cache_key = PandasExecutor._vis_cache_key(vis, ldf, approx)
+                if cache_key is not None and vis._vis_data is not None:
+                    attributes = [clause.attribute for clause in vis._inferred_intent]
+                    ldf._vis_cache[cache_key] = (vis._vis_data.copy(), vis_messages, attributes)
+        return remaining
+
+    @staticmethod
+    def _reuse_vis_data(vis: Vis, ldf: LuxDataFrame, cache_key):
+        """
+        Populate the vis with the processed data cached on the dataframe, and replay its messages.
+        """
+        vis_data, messages, _ = ldf._vis_cache[cache_key]
+        vis._vis_data = vis_data.copy()
+        for msg in messages:
+            ldf._message.add_unique(msg["text"], priority=msg["priority"])
+
+    @staticmethod
+    def _cache_vis_data(vis: Vis, ldf: LuxDataFrame, cache_key, message):
+        """
+        Cache the processed data of the vis on the dataframe, along with the messages recorded
+        while processing it, and restore the dataframe's original message.
+        """
+        messages = ldf._message.messages
+        ldf._message = message
+        for msg in messages:
+            message.add_unique(msg["text"], priority=msg["priority"])
+        if ldf._vis_cache is None:
+            ldf._vis_cache = {}
+        attributes = [clause.attribute for clause in vis._inferred_intent]
+        ldf._vis_cache[cache_key] = (vis._vis_data.copy(), messages, attributes)
+
+    @staticmethod
+    def _aggregate_spec(vis: Vis):
+        """
+        Group-by attributes, measure and aggregation function of an aggregated bar or line chart.
+
+        Returns
+        -------
+        tuple
+            (filters, group-by attributes) shared by the charts that can be aggregated together,
+            followed by the measure attribute and the aggregation function,
+            or None if the vis is not aggregated or its filters cannot be compared
+        """
+        if vis.mark not in ["bar", "line", "geographical"]:
+            return None
+        x_attr = vis.get_attr_by_channel("x")[0]
+        y_attr = vis.get_attr_by_channel("y")[0]
+        if x_attr.aggregation is None or y_attr.aggregation is None:
+            return None
+        if x_attr.aggregation != "":
+            groupby_attr, measure_attr = y_attr, x_attr
+        elif y_attr.aggregation != "":
+            groupby_attr, measure_attr = x_attr, y_attr
+        else:
+            return None
+        groupby_attrs = (groupby_attr.attribute,)
+        if len(vis.get_attr_by_channel("color")) == 1:
+            groupby_attrs += (vis.get_attr_by_channel("color")[0].attribute,)
+        filters = tuple(
+            (clause.attribute, clause.filter_op, clause.value)
+            for clause in utils.get_filter_specs(vis._inferred_intent)
+        )
+        try:
+            hash(filters)
+        except TypeError:
+            return None
+        return (filters, groupby_attrs), measure_attr.attribute, measure_attr.aggregation
+
+    @staticmethod
+    def _plan_batches(vislist: List[Vis]):
+        """
+        Group the aggregated bar and line charts of a list of vis by their filters and group-by attributes.
+
+        Returns
+        -------
+        batches : dict
+            (filters, group-by attributes) mapped to the batch of (vis, measure, aggregation function)
+            that can be aggregated together
+        remaining : List[Vis]
+            Vis that are not aggregated
+        """
+        batches = {}
+        remaining = []
+        for vis in vislist:
+            spec = PandasExecutor._aggregate_spec(vis)
+            if spec is None:
+                remaining.append(vis)
+            else:
+                batches.setdefault(spec[0], []).append((vis, spec[1], spec[2]))
+        return batches, remaining
+
+    @staticmethod
+    def _aggregate_batch(
+        batch: List, filtered: LuxDataFrame, groupby_attrs: tuple, ldf: LuxDataFrame = None, rows: SampleView = None
+    ) -> List[LuxDataFrame]:
+        """
+        Aggregate the measure of each vis of a batch sharing the same filters and group-by attributes
+        over a single grouping of their filtered rows, so that the group-by keys are only factorized once.
+        When the filtered rows are given as a sample of the dataframe, counts, sums and means are computed
+        with np.bincount over the dictionary-encoded group-by attributes (see _encoded_groups).
+
+        Returns
+        -------
+        List[LuxDataFrame]
+            Aggregated data of each vis of the batch, to be passed to execute_aggregate
+        """
+        groups = None
+        if ldf is not None:
+            groups = PandasExecutor._encoded_groups(ldf, groupby_attrs, rows.positions)
+        grouped = None
+        aggregated = []
+        for _, measure, agg_func in batch:
+            result = None
+            if groups is not None:
+                result = PandasExecutor._bincount_aggregate(groups, filtered, measure, agg_func)
+            if result is None:
+                if grouped is None:
+                    grouped = filtered.groupby(list(groupby_attrs), dropna=False, history=False)
+                if measure == "Record":
+                    result = grouped.size().rename("Record").reset_index()
+                else:
+                    result = grouped[measure].agg(agg_func).reset_index()
+            aggregated.append(result.__finalize__(filtered))
+        return aggregated
+
+    @staticmethod
+    def _encoded_groups(ldf: LuxDataFrame, groupby_attrs: tuple, positions: np.ndarray = None):
+        """
+        Groups of the rows of the dataframe at the given positions (all rows by default),
+        from the codes of their group-by attributes, dictionary-encoded once per version of the data.
+
+        Returns
+        -------
+        tuple
+            Group of each row, number of groups, the groups present among the rows (None if all of them are),
+            and the group-by attributes mapped to their value in each present group, in group-by order;
+            or None if a group-by attribute cannot be encoded
+        """
+        encoding = ldf._dictionary_encoding
+        if encoding is None or encoding.n_rows != len(ldf):
+            encoding = ldf._dictionary_encoding = DictionaryEncoding(len(ldf))
+        encoded = [encoding.encode(ldf, attr) for attr in groupby_attrs]
+        if any(attr_encoding is None for attr_encoding in encoded):
+            return None
+        codes = [attr_codes if positions is None else attr_codes.take(positions) for attr_codes, _ in encoded]
+        categories = [attr_categories for _, attr_categories in encoded]
+        combined = DictionaryEncoding.combine(codes, categories)
+        n_combinations = int(np.prod([len(attr_categories) for attr_categories in categories]))
+        if n_combinations <= max(len(combined), 1 << 20):
+            group_ids, n_groups = combined, n_combinations
+            present = np.flatnonzero(np.bincount(combined, minlength=n_combinations))
+            keys = present
+        else:
+            # Too many combinations of categories for dense counts, number the combinations present only
+            keys, group_ids = np.unique(combined, return_inverse=True)
+            n_groups, present = len(keys), None
+        keys = {
+            attr: attr_categories.take(attr_codes)
+            for attr, attr_categories, attr_codes in zip(
+                groupby_attrs, categories, DictionaryEncoding.split(keys, categories)
+            )
+        }
+        return group_ids, n_groups, present, keys
+
+    @staticmethod
+    def _bincount_aggregate(groups: tuple, filtered: LuxDataFrame, measure: str, agg_func):
+        """
+        Count, sum or average a numeric measure over encoded groups (see _encoded_groups) with np.bincount,
+        skipping missing values like a group-by
+
+        Returns
+        -------
+        LuxDataFrame
+            Group-by attributes followed by the aggregated measure,
+            or None if the measure is not numeric or the aggregation is not a count, sum or mean
+        """
+        group_ids, n_groups, present, keys = groups
+        if measure == "Record":
+            values = np.bincount(group_ids, minlength=n_groups)
+        else:
+            agg_name = getattr(agg_func, "__name__", agg_func)
+            dtype = filtered.dtypes[measure] if filtered.columns.is_unique else None
+            if agg_name not in ["count", "sum", "mean"] or not (
+                isinstance(dtype, np.dtype) and dtype.kind in "iuf"
+            ):
+                return None
+            values = filtered[measure].to_numpy()
+            if dtype.kind == "f" and agg_name != "count":
+                # A group-by sums floats with compensated summation, which np.bincount does not, so they are
+                # grouped by a categorical over the encoded groups instead, without hashing the group-by keys
+                grouper = pd.Categorical.from_codes(group_ids, categories=pd.RangeIndex(n_groups))
+                values = pd.Series(values).groupby(grouper, observed=False).agg(agg_name).to_numpy()
+            else:
+                if dtype.kind == "f":
+                    notna = ~np.isnan(values)
+                    if not notna.all():
+                        group_ids, values = group_ids[notna], values[notna]
+                counts = np.bincount(group_ids, minlength=n_groups)
+                if agg_name == "count":
+                    values = counts
+                else:
+                    values = np.bincount(group_ids, weights=values, minlength=n_groups)
+                    if agg_name == "mean":
+                        with np.errstate(invalid="ignore"):
+                            values = values / counts
+                    else:
+                        values = values.astype(np.int64)
+        if present is not None:
+            values = values[present]
+        return pd.DataFrame({**keys, measure: values})
+
+    @staticmethod
+    def execute_batch_aggregate(vislist: VisList, ldf: LuxDataFrame, approx=False) -> List[Vis]:
+        """
+        Aggregate the bar and line charts of a VisList that share the same filters and group-by attributes
+        in a single pass: the sampled rows are gathered and filtered once for the whole batch,
+        and the group-by keys are factorized once for all the measures aggregated over them.
+        Aggregates are looked up in, and added to, the aggregate cache of lux.config (see AggregateCache),
+        so that the rows are not scanned again until the data or the sample changes.
+
+        Parameters
+        ----------
+        vislist: list[lux.Vis]
+            vis list that contains lux.Vis objects for visualization.
+        ldf : lux.core.frame
+            LuxDataFrame with specified intent.
+        approx : bool
+            Whether the vis are approximated on the early pruning sample
+
+        Returns
+        -------
+        List[Vis]
+            Vis that were not aggregated, and still need to be processed
+        """
+        # Weighted aggregation of a stratified sample is computed per vis
+        if ldf._sampled.weights is not None:
+            return vislist
+        cache_keys = {}
+        candidates = []
+        remaining = []
+        for vis in vislist:
+            cache_key = PandasExecutor._vis_cache_key(vis, ldf, approx)
+            if cache_key is not None and ldf._vis_cache and cache_key in ldf._vis_cache:
+                remaining.append(vis)
+            else:
+                cache_keys[id(vis)] = cache_key
+                candidates.append(vis)
+        batches, unbatched = PandasExecutor._plan_batches(candidates)
+        if not batches:
+            return remaining + unbatched
+        if approx:
+            PandasExecutor.execute_approx_sample(ldf)
+        aggregate_cache = lux.config.aggregate_cache
+        sample = ldf._approx_sample if approx else ldf._sampled
+        # Aggregates are tied to the rows and the sample they were computed on,
+        # and each aggregate is only served while the versions of its own columns are unchanged
+        source = (ldf._rows_version, sample.key)
+        versions = ldf._column_versions
+        for (filters, groupby_attrs), batch in batches.items():
+            if aggregate_cache is not None:
+                aggregated = [
+                    aggregate_cache.get(source, filters, groupby_attrs, measure, agg_func, versions)
+                    for _, measure, agg_func in batch
+                ]
+            else:
+                aggregated = [None] * len(batch)
+            filtered = ldf
+            missing = [i for i, vis_aggregated in enumerate(aggregated) if vis_aggregated is None]
+            if missing:
+                columns = [clause.attribute for i in missing for clause in batch[i][0]._inferred_intent]
+                # Only gather the sampled rows satisfying the filters
+                rows = PandasExecutor._filter_sample(ldf, sample, filters)
+                filtered = rows.take(columns)
+                computed = PandasExecutor._aggregate_batch(
+                    [batch[i] for i in missing], filtered, groupby_attrs, ldf, rows
+                )
+                for i, vis_aggregated in zip(missing, computed):
+                    aggregated[i] = vis_aggregated
+                    if aggregate_cache is not None:
+                        _, measure, agg_func = batch[i]
+                        aggregate_cache.put(source, filters, groupby_attrs, measure, agg_func, vis_aggregated, versions)
+            for (vis, _, _), vis_aggregated in zip(batch, aggregated):
+                vis._source = ldf
+                # Aggregates served from the cache only need the metadata of the dataframe
+                vis._vis_data = filtered
+                if approx:
+                    # Exact recomputation, if needed, samples the dataframe again
+                    vis._original_df = ldf
+                    vis.approx = True
+                cache_key = cache_keys[id(vis)]
+                if cache_key is not None:
+                    message, ldf._message = ldf._message, Message()
+                PandasExecutor.execute_aggregate(
+                    vis, isFiltered=len(filters) > 0, aggregated=vis_aggregated.__finalize__(filtered)
+                )
+                vis.data._intent = []
+                if cache_key is not None:
+                    PandasExecutor._cache_vis_data(vis, ldf, cache_key, message)
+        return remaining + unbatched
+
+    @staticmethod
+    def _bin_edges(value_range: tuple, bin_size: int) -> np.ndarray:
+        """
+        Edges of bins of equal width spanning a range, widened to a unit range if it is empty (as np.histogram)
+        """
+        first, last = float(value_range[0]), float(value_range[1])
+        if first == last:
+            first, last = first - 0.5, last + 0.5
+        return np.linspace(first, last, bin_size + 1)
+
+    @staticmethod
+    def _bin_index(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+        """
+        Index of the bin of each value, for values within the edges.
+        Indices are computed arithmetically, following np.histogram: the last bin includes its right edge,
+        and the values falling on the wrong side of an edge due to rounding are moved to the right bin.
+        """
+        bin_size = len(edges) - 1
+        offsets = values - edges[0]
+        offsets *= bin_size / (edges[-1] - edges[0])
+        indices = offsets.astype(np.intp)
+        indices[indices == bin_size] -= 1
+        indices[values < edges[indices]] -= 1
+        indices[(values >= edges[indices + 1]) & (indices != bin_size - 1)] += 1
+        return indices
+
+    @staticmethod
+    def _histogram(
+        values: np.ndarray, bin_size: int, value_range: tuple, weights: np.ndarray = None, block_size=16384
+    ):
+        """
+        Histogram of the values within a range, split into bins of equal width (see _bin_index).
+        Bin indices are counted with np.bincount, so that the counts are identical to np.histogram
+        without sorting or copying the values.
+        Values are processed in blocks small enough for the intermediate arrays to stay in cache.
+
+        Returns
+        -------
+        counts : np.ndarray
+            (Weighted) number of values in each bin
+        bin_start : np.ndarray
+            Left edge of each bin
+        missing : bool
+            Whether some values are missing, i.e., NaN, infinite or outside of the range
+        """
+        edges = PandasExecutor._bin_edges(value_range, bin_size)
+        counts = np.zeros(bin_size, dtype=np.int64 if weights is None else np.float64)
+        missing = False
+        for start in range(0, len(values), block_size):
+            block = values[start : start + block_size]
+            block_weights = None if weights is None else weights[start : start + block_size]
+            # NaN compares False, so a single mask drops missing, infinite and out of range values
+            valid = (block >= edges[0]) & (block <= edges[-1])
+            if not valid.all():
+                missing = True
+                block = block[valid]
+                if block_weights is not None:
+                    block_weights = block_weights[valid]
+            indices = PandasExecutor._bin_index(block, edges)
+            counts += np.bincount(indices, weights=block_weights, minlength=bin_size)
+        return counts, edges[:-1], missing
+
+    @staticmethod
+    def _bin_range(ldf: LuxDataFrame, attribute, values: np.ndarray) -> tuple:
+        """
+        Range of the bins of an attribute, taken from the min/max metadata of the dataframe
+        so that the charts of an attribute share the same bins whatever the sample or filters,
+        or from the finite values themselves if the metadata is missing or not finite
+        """
+        min_max = (getattr(ldf, "_min_max", None) or {}).get(attribute)
+        if min_max is not None and np.isfinite(min_max).all():
+            return min_max
+        finite = values[np.isfinite(values)]
+        if len(finite) == 0:
+            return (0, 1)
+        return (finite.min(), finite.max())
+
+    @staticmethod
+    def execute_batch_binning(vislist: VisList, ldf: LuxDataFrame, approx=False) -> List[Vis]:
+        """
+        Bin the histograms of numeric columns in a VisList, e.g. those of the Distribution action.
+        The sampled rows of all the binned columns sharing the same filters are gathered once,
+        and each column is binned in a single vectorized pass (see _histogram), over bins fixed
+        by the min/max metadata of the dataframe instead of rescanning the data for its range.
+
+        Parameters
+        ----------
+        vislist: list[lux.Vis]
+            vis list that contains lux.Vis objects for visualization.
+        ldf : lux.core.frame
+            LuxDataFrame with specified intent.
+        approx : bool
+            Whether the vis are approximated on the early pruning sample
+
+        Returns
+        -------
+        List[Vis]
+            Vis that were not binned, and still need to be processed
+        """
+        batches = {}
+        remaining = []
+        for vis in vislist:
+            if vis.mark != "histogram":
+                remaining.append(vis)
+                continue
+            cache_key = PandasExecutor._vis_cache_key(vis, ldf, approx)
+            bin_attribute = [clause for clause in vis._inferred_intent if clause.bin_size != 0][0]
+            dtype = ldf.dtypes.get(bin_attribute.attribute) if ldf.columns.is_unique else None
+            filters = tuple(
+                (clause.attribute, clause.filter_op, clause.value)
+                for clause in utils.get_filter_specs(vis._inferred_intent)
+            )
+            try:
+                hash(filters)
+            except TypeError:
+                filters = None
+            # Object and timedelta columns are converted to floats by execute_binning
+            if (
+                (cache_key is not None and ldf._vis_cache and cache_key in ldf._vis_cache)
+                or filters is None
+                or not (isinstance(dtype, np.dtype) and dtype.kind in "iuf")
+            ):
+                remaining.append(vis)
+            else:
+                batches.setdefault(filters, []).append((vis, bin_attribute, cache_key))
+        if approx and batches:
+            PandasExecutor.execute_approx_sample(ldf)
+        sample = ldf._approx_sample if approx else ldf._sampled
+        for filters, batch in batches.items():
+            columns = [bin_attribute.attribute for _, bin_attribute, _ in batch]
+            rows = PandasExecutor._filter_sample(ldf, sample, filters).take(columns)
+            weights = rows[SAMPLE_WEIGHT].to_numpy() if SAMPLE_WEIGHT in rows.columns else None
+            for vis, bin_attribute, cache_key in batch:
+                bin_attr = bin_attribute.attribute
+                vis._source = ldf
+                if approx:
+                    # Exact recomputation, if needed, samples the dataframe again
+                    vis._original_df = ldf
+                    vis.approx = True
+                if cache_key is not None:
+                    message, ldf._message = ldf._message, Message()
+                values = rows[bin_attr].to_numpy()
+                counts, bin_start, missing = PandasExecutor._histogram(
+                    values,
+                    bin_attribute.bin_size,
+                    PandasExecutor._bin_range(ldf, bin_attr, values),
+                    weights,
+                )
+                if missing:
+                    ldf._message.add_unique(
+                        f"The column <code>{bin_attr}</code> contains missing values, not shown in the displayed histogram.",
+                        priority=100,
+                    )
+                binned_result = np.array([bin_start, counts]).T
+                vis._vis_data = pd.DataFrame(binned_result, columns=[bin_attr, "Number of Records"])
+                vis.data._intent = []
+                if cache_key is not None:
+                    PandasExecutor._cache_vis_data(vis, ldf, cache_key, message)
+        return remaining
+
+    @staticmethod
+    def execute_progressive(vislist: VisList, ldf: LuxDataFrame) -> List[Vis]:
+        """
+        Aggregate the bar and line charts of a VisList on geometrically growing samples of the sampled dataframe
+        (e.g., 10k, 100k, then 1M rows), attaching confidence intervals to the aggregated values (see Vis.error_bounds).
+        Counts and sums are rescaled to the size of the sampled dataframe, and the vis keep this approximate data
+        when they are displayed instead of being recomputed exactly.
+        Refinement stops as soon as the same charts (up to ties) rank in the top-k by interestingness
+        on two successive samples, so that large dataframes are not scanned in full to prune the search space.
+
+        Parameters
+        ----------
+        vislist: list[lux.Vis]
+            vis list that contains lux.Vis objects for visualization.
+        ldf : lux.core.frame
+            LuxDataFrame with specified intent.
+
+        Returns
+        -------
+        List[Vis]
+            Vis of the list that are not bar or line charts, and remain to be processed
+        """
+        from lux.interestingness.interestingness import interestingness
+
+        progressive = [vis for vis in vislist if vis.mark in ["bar", "line"]]
+        if len(progressive) == 0 or ldf._sampled is None:
+            return vislist
+        sampled = ldf._sampled
+        topk = lux.config.topk if lux.config.topk else len(progressive)
+        # Every sample is a prefix of the same random permutation, so that the samples are nested
+        order = np.random.default_rng(1).permutation(len(sampled))
+        # Charts sharing the same filters and group-by attributes are aggregated together at every stage
+        if sampled.weights is None:
+            batches, unbatched = PandasExecutor._plan_batches(progressive)
+        else:
+            batches, unbatched = {}, progressive
+        scores = None
+        for size in progressive_sizes(len(sampled)):
+            sample = sampled.subset(np.sort(order[:size]))
+            rows = {}
+            for (filters, groupby_attrs), batch in batches.items():
+                columns = [clause.attribute for vis, _, _ in batch for clause in vis._inferred_intent]
+                batch_rows = PandasExecutor._filter_sample(ldf, sample, filters)
+                filtered = batch_rows.take(columns)
+                aggregated = PandasExecutor._aggregate_batch(batch, filtered, groupby_attrs, ldf, batch_rows)
+                for (vis, _, _), vis_aggregated in zip(batch, aggregated):
+                    vis._source = ldf
+                    # Exact recomputation, if needed, samples the dataframe again
+                    vis._original_df = ldf
+                    vis._vis_data = filtered
+                    vis.approx = True
+                    rows[id(vis)] = filtered
+                    PandasExecutor.execute_aggregate(vis, isFiltered=len(filters) > 0, aggregated=vis_aggregated)
+            for vis in unbatched:
+                vis._source = ldf
+                vis._original_df = ldf
+                vis._vis_data = sample.take([clause.attribute for clause in vis._inferred_intent])
+                vis.approx = True
+                filter_executed = PandasExecutor.execute_filter(vis)
+                attributes = set(clause.attribute for clause in vis._inferred_intent if clause.attribute != "Record")
+                if SAMPLE_WEIGHT in vis._vis_data.columns:
+                    attributes.add(SAMPLE_WEIGHT)
+                vis._vis_data = vis._vis_data[list(attributes)]
+                rows[id(vis)] = vis._vis_data
+                PandasExecutor.execute_aggregate(vis, isFiltered=filter_executed)
+            for vis in progressive:
+                vis.score = interestingness(vis, ldf)
+            # Only the top-k vis are kept after pruning, so their order does not matter
+            previous_scores, scores = scores, [vis.score for vis in progressive]
+            if top_k_stable(previous_scores, scores, topk):
+                break
+        if size < len(sampled):
+            for vis in progressive:
+                PandasExecutor._attach_error_bounds(vis, rows[id(vis)], len(sampled) / size)
+        ldf._message.add_unique(
+            f"Large dataframe detected: Lux is approximating bar and line charts on samples of up to {size} rows.",
+            priority=98,
+        )
+        return [vis for vis in vislist if vis.mark not in ["bar", "line"]]
 
     @staticmethod
-    def execute_aggregate(vis: Vis, isFiltered=True):
+    def _attach_error_bounds(vis: Vis, rows: pd.DataFrame, scale: float) -> None:
+        """
+        Attach the half-widths of the confidence intervals of the aggregated data of a bar or line chart
+        computed on a uniform sample, and rescale its counts and sums (and their intervals) by `scale`.
+        Vis aggregated from a weighted sample are left as is.
+        """
+        import lux.core
+
+        x_attr = vis.get_attr_by_channel("x")[0]
+        y_attr = vis.get_attr_by_channel("y")[0]
+        if x_attr.aggregation is None or y_attr.aggregation is None or SAMPLE_WEIGHT in rows.columns:
+            return
+        if x_attr.aggregation != "":
+            groupby_attr, measure_attr = y_attr, x_attr
+        else:
+            groupby_attr, measure_attr = x_attr, y_attr
+        measure, agg_func = measure_attr.attribute, measure_attr._aggregation_name
+        by = [groupby_attr.attribute] + [clause.attribute for clause in vis.get_attr_by_channel("color")]
+        bounds = aggregate_error_bounds(rows, by, measure, agg_func)
+        try:
+            aligned = lux.core.originalDF(vis.data, copy=False)[by].merge(bounds, on=by, how="left")
+        except (TypeError, ValueError):
+            # The groups may have been converted to strings to sort mixed types
+            return
+        error_bounds = aligned[measure]
+        if measure == "Record" or agg_func in ["count", "sum"]:
+            vis._vis_data[measure] = vis.data[measure] * scale
+            error_bounds = error_bounds * scale
+        vis._error_bounds = error_bounds
+
+    @staticmethod
+    def _vis_cache_key(vis: Vis, ldf: LuxDataFrame, approx=False):
+        """
+        Key identifying the processed data of an aggregated or binned Vis.
+        The key includes the version of every column the vis depends on,
+        so that changing one column only invalidates the vis that touch it.
+
+        Returns
+        -------
+        Hashable key, or None if the vis data should not be reused
+        """
+        # Code export traces the executor as it runs, so the vis always needs to be processed from scratch
+        if lux.config.tracer.tracing:
+            return None
+        if vis.mark not in ["bar", "line", "geographical", "histogram", "heatmap"]:
+            return None
+        if vis.mark == "heatmap" and approx:
+            return None
+        versions = ldf._column_versions or {}
+        try:
+            clauses = tuple(
+                (
+                    clause.attribute,
+                    clause.channel,
+                    clause.data_type,
+                    clause.aggregation,
+                    clause.bin_size,
+                    clause.filter_op,
+                    clause.value,
+                    versions.get(clause.attribute, 0),
+                )
+                for clause in vis._inferred_intent
+            )
+            sampling = (
+                lux.config.sampling,
+                lux.config.sampling_start,
+                lux.config.sampling_cap,
+                lux.config.sampling_strategy,
+                lux.config.sampling_min_category_count,
+            )
+            key = (vis.mark, approx, lux.config.heatmap_bin_size, sampling, clauses)
+            hash(key)
+        except TypeError:
+            # Unhashable attributes or filter values, e.g. lists
+            return None
+        return key
+
+    @staticmethod
+    def execute_aggregate(vis: Vis, isFiltered=True, aggregated=None):
         """
         Aggregate data points on an axis for bar or line charts
 
@@ -159,13 +961,14 @@ class PandasExecutor(Executor):
             lux.Vis object that represents a visualization
         ldf : lux.core.frame
             LuxDataFrame with specified intent.
+        aggregated : lux.core.frame, optional
+            Data of the vis already aggregated by its group-by attributes (see execute_batch_aggregate),
+            by default None
 
         Returns
         -------
         None
         """
-        import numpy as np
-
         x_attr = vis.get_attr_by_channel("x")[0]
         y_attr = vis.get_attr_by_channel("y")[0]
         has_color = False
@@ -187,29 +990,26 @@ class PandasExecutor(Executor):
         # checks if color is specified in the Vis
         if len(vis.get_attr_by_channel("color")) == 1:
             color_attr = vis.get_attr_by_channel("color")[0]
-            color_attr_vals = vis.data.unique_values[color_attr.attribute]
+            color_attr_vals = utils.get_unique_values(vis.data, color_attr.attribute)
             color_cardinality = len(color_attr_vals)
             # NOTE: might want to have a check somewhere to not use categorical variables with greater than some number of categories as a Color variable----------------
             has_color = True
         else:
             color_cardinality = 1
         if measure_attr != "":
-            if measure_attr.attribute == "Record":
-                # need to get the index name so that we can rename the index column to "Record"
-                # if there is no index, default to "index"
-                index_name = vis.data.index.name
-                if index_name == None:
-                    index_name = "index"
-
-                vis._vis_data = vis.data.reset_index()
+            if aggregated is not None:
+                vis._vis_data = aggregated
+            elif SAMPLE_WEIGHT in vis.data.columns:
+                # Rescale the counts and sums of a stratified sample by its sampling weights
+                groupby_attrs = [groupby_attr.attribute, color_attr.attribute] if has_color else [groupby_attr.attribute]
+                vis._vis_data = pd.DataFrame(weighted_aggregate(vis.data, groupby_attrs, measure_attr.attribute, agg_func)).__finalize__(vis.data)
+            elif measure_attr.attribute == "Record":
+                # Count the rows of each group, instead of the values of every column
                 # if color is specified, need to group by groupby_attr and color_attr
-
                 if has_color:
-                    vis._vis_data = (vis.data.groupby([groupby_attr.attribute, color_attr.attribute], dropna=False, history=False).count().reset_index().rename(columns={index_name: "Record"}))
-                    vis._vis_data = vis.data[[groupby_attr.attribute, color_attr.attribute, "Record"]]
+                    vis._vis_data = (vis.data.groupby([groupby_attr.attribute, color_attr.attribute], dropna=False, history=False).size().reset_index(name="Record").__finalize__(vis.data))
                 else:
-                    vis._vis_data = (vis.data.groupby(groupby_attr.attribute, dropna=False, history=False).count().reset_index().rename(columns={index_name: "Record"}))
-                    vis._vis_data = vis.data[[groupby_attr.attribute, "Record"]]
+                    vis._vis_data = (vis.data.groupby(groupby_attr.attribute, dropna=False, history=False).size().reset_index(name="Record").__finalize__(vis.data))
             else:
                 # if color is specified, need to group by groupby_attr and color_attr
                 if has_color:
@@ -219,36 +1019,18 @@ class PandasExecutor(Executor):
                 groupby_result = groupby_result.agg(agg_func)
                 intermediate = groupby_result.reset_index()
                 vis._vis_data = intermediate.__finalize__(vis.data)
-            result_vals = list(vis.data[groupby_attr.attribute])
-            # create existing group by attribute combinations if color is specified
-            # this is needed to check what combinations of group_by_attr and color_attr values have a non-zero number of elements in them
-            if has_color:
-                res_color_combi_vals = []
-                result_color_vals = list(vis.data[color_attr.attribute])
-                for i in range(0, len(result_vals)):
-                    res_color_combi_vals.append([result_vals[i], result_color_vals[i]])
             # For filtered aggregation that have missing groupby-attribute values, set these aggregated value as 0, since no datapoints
             if isFiltered or has_color and attr_unique_vals:
                 N_unique_vals = len(attr_unique_vals)
-                if len(result_vals) != N_unique_vals * color_cardinality:
-                    columns = vis.data.columns
+                if len(vis.data) != N_unique_vals * color_cardinality:
                     if has_color:
-                        df = pd.DataFrame({columns[0]: attr_unique_vals * color_cardinality,columns[1]: pd.Series(color_attr_vals).repeat(N_unique_vals),})
-                        vis._vis_data = vis.data.merge(df,on=[columns[0], columns[1]],how="right",suffixes=["", "_right"],)
-                        for col in columns[2:]:
-                            # Triggers __setitem__
-                            vis.data[col] = vis.data[col].fillna(0)
-                        assert len(list(vis.data[groupby_attr.attribute])) == N_unique_vals * len(color_attr_vals), f"Aggregated data missing values compared to original range of values of `{groupby_attr.attribute, color_attr.attribute}`."
-                        # Keep only the three relevant columns not the *_right columns resulting from merge
-                        vis._vis_data = vis.data[[groupby_attr.attribute, color_attr.attribute, measure_attr.attribute]]
-
+                        groupby_attrs = [groupby_attr.attribute, color_attr.attribute]
+                        unique_values = [attr_unique_vals, color_attr_vals]
                     else:
-                        df = pd.DataFrame({columns[0]: attr_unique_vals})
-                        vis._vis_data = vis.data.merge(df, on=columns[0], how="right", suffixes=["", "_right"])
-
-                        for col in columns[1:]:
-                            vis.data[col] = vis.data[col].fillna(0)
-                        assert (len(list(vis.data[groupby_attr.attribute])) == N_unique_vals), f"Aggregated data missing values compared to original range of values of `{groupby_attr.attribute}`."
+                        groupby_attrs = [groupby_attr.attribute]
+                        unique_values = [attr_unique_vals]
+                    # Every combination of values in one pass, with 0 for the missing ones
+                    vis._vis_data = PandasExecutor._zero_fill(vis.data, unique_values, groupby_attrs, measure_attr.attribute)
 
             vis._vis_data = vis._vis_data.dropna(subset=[measure_attr.attribute])
             try:
@@ -261,8 +1043,57 @@ class PandasExecutor(Executor):
                 )
                 vis._vis_data[groupby_attr.attribute] = vis._vis_data[groupby_attr.attribute].astype(str)
                 vis._vis_data = vis._vis_data.sort_values(by=groupby_attr.attribute, ascending=True)
-            vis._vis_data = vis._vis_data.reset_index()
-            vis._vis_data = vis._vis_data.drop(columns="index")
+            vis._vis_data = vis._vis_data.reset_index(drop=True)
+
+    @staticmethod
+    def _zero_fill(data: LuxDataFrame, unique_values: List, names: List, measure: str) -> LuxDataFrame:
+        """
+        Aggregated data with a row for every combination of the unique values of the group-by attributes,
+        where the values of the first attribute vary fastest, and 0 for the combinations without data.
+        Groups are matched by their codes in the lookup tables cached with the unique values
+        (see UniqueValues.index) instead of hashing every combination, and missing values are matched
+        like any other value.
+
+        Parameters
+        ----------
+        data : LuxDataFrame
+            Aggregated data, with the group-by attributes and the measure as columns
+        unique_values : List
+            Unique values of each group-by attribute
+        names : List
+            Name of each group-by attribute
+        measure : str
+            Name of the aggregated measure
+
+        Returns
+        -------
+        LuxDataFrame
+            Aggregated data of every combination of the unique values
+        """
+        size = 1
+        positions = np.zeros(len(data), dtype=np.intp)
+        matched = np.ones(len(data), dtype=bool)
+        levels = {}
+        for values, name in zip(unique_values, names):
+            # The lookup table is built once and kept with the unique values of the dataframe
+            index = values.index if isinstance(values, UniqueValues) else UniqueValues(values).index
+            keys = data[name]._values
+            codes = index.get_indexer(keys)
+            # Lookup tables do not match missing values, so they are matched to the missing unique value
+            missing = np.flatnonzero(np.asarray(index.isna()))
+            if len(missing) > 0:
+                codes[np.asarray(pd.isna(keys))] = missing[0]
+            matched &= codes >= 0
+            positions += codes * size
+            levels[name] = (index, size)
+            size *= len(index)
+        grid = np.arange(size)
+        filled = {}
+        for name, (index, stride) in levels.items():
+            filled[name] = index.take(grid // stride % len(index))._values
+        filled[measure] = np.zeros(size)
+        filled[measure][positions[matched]] = data[measure]._values[matched]
+        return pd.DataFrame(filled).__finalize__(data)
 
     @staticmethod
     def execute_binning(ldf: LuxDataFrame, vis: Vis):
@@ -280,13 +1111,15 @@ class PandasExecutor(Executor):
         -------
         None
         """
-        import numpy as np
-
         vis._vis_data = vis._vis_data.replace([np.inf, -np.inf], np.nan)
 
         bin_attribute = [x for x in vis._inferred_intent if x.bin_size != 0][0]
         bin_attr = bin_attribute.attribute
         series = vis.data[bin_attr]
+        weights = None
+        if SAMPLE_WEIGHT in vis.data.columns:
+            # Rescale the counts of a stratified sample by its sampling weights
+            weights = vis.data[SAMPLE_WEIGHT].to_numpy()[series.notna().to_numpy()]
 
         if series.hasnans:
             ldf._message.add_unique(
@@ -300,7 +1133,7 @@ class PandasExecutor(Executor):
         if is_timedelta64_series(series):
             series = timedelta64_to_float_seconds(series)
 
-        counts, bin_edges = np.histogram(series, bins=bin_attribute.bin_size)
+        counts, bin_edges = np.histogram(series, bins=bin_attribute.bin_size, weights=weights)
         # bin_edges of size N+1, so need to compute bin_start as the bin location
         bin_start = bin_edges[0:-1]
         binned_result = np.array([bin_start, counts]).T
@@ -352,29 +1185,103 @@ class PandasExecutor(Executor):
         df: pandas.DataFrame
             Dataframe resulting from the filter operation
         """
+        mask = PandasExecutor.filter_mask(df, attribute, op, val)
+        if mask is None:
+            return df
+        return df[mask]
+
+    @staticmethod
+    def filter_mask(df: pd.DataFrame, attribute: str, op: str, val: object) -> np.ndarray:
+        """
+        Boolean mask of the rows of a dataframe satisfying a filter (see apply_filter)
+
+        Returns
+        -------
+        np.ndarray
+            Boolean mask, or None if the filter operation is not supported
+        """
         # Handling NaN filter values
         if utils.like_nan(val):
             if op != "=" and op != "!=":
                 warnings.warn("Filter on NaN must be used with equality operations (i.e., `=` or `!=`)")
             else:
                 if op == "=":
-                    return df[df[attribute].isna()]
+                    return df[attribute].isna().to_numpy()
                 elif op == "!=":
-                    return df[~df[attribute].isna()]
+                    return df[attribute].notna().to_numpy()
         # Applying filter in regular, non-NaN cases
         if op == "=":
-            return df[df[attribute] == val]
+            mask = df[attribute] == val
         elif op == "<":
-            return df[df[attribute] < val]
+            mask = df[attribute] < val
         elif op == ">":
-            return df[df[attribute] > val]
+            mask = df[attribute] > val
         elif op == "<=":
-            return df[df[attribute] <= val]
+            mask = df[attribute] <= val
         elif op == ">=":
-            return df[df[attribute] >= val]
+            mask = df[attribute] >= val
         elif op == "!=":
-            return df[df[attribute] != val]
-        return df
+            mask = df[attribute] != val
+        else:
+            return None
+        # Missing values of nullable dtypes do not satisfy the filter
+        return mask.to_numpy(dtype=bool, na_value=False)
+
+    @staticmethod
+    def filter_bitmap(ldf: LuxDataFrame, filters: List, how: str = "and") -> np.ndarray:
+        """
+        Bitmap of the rows of the dataframe satisfying all (how="and") or any (how="or") of the filters.
+        The bitmap of each filter is computed once and indexed on the dataframe (see BitmapIndex)
+        until the filtered column changes.
+
+        Parameters
+        ----------
+        ldf : LuxDataFrame
+            Dataframe to filter on
+        filters : List
+            (attribute, filter_op, value) of each filter
+        how : str
+            Whether the rows satisfy all ("and") or any ("or") of the filters
+
+        Returns
+        -------
+        np.ndarray
+            Bitmap of the rows, to be unpacked with ldf._bitmap_index.mask
+        """
+        index = ldf._bitmap_index
+        if index is None or index.n_rows != len(ldf):
+            index = ldf._bitmap_index = BitmapIndex(len(ldf))
+        bitmaps = []
+        for attribute, op, val in filters:
+            bitmap = index.get(attribute, op, val)
+            if bitmap is None:
+                mask = None
+                if op == "=" and not utils.like_nan(val):
+                    mask = index.equality_mask(ldf, attribute, val)
+                if mask is None:
+                    mask = PandasExecutor.filter_mask(ldf, attribute, op, val)
+                if mask is None:
+                    mask = np.ones(len(ldf), dtype=bool)
+                bitmap = index.add(attribute, op, val, mask)
+            bitmaps.append(bitmap)
+        return BitmapIndex.combine(bitmaps, how)
+
+    @staticmethod
+    def filtered_size(ldf: LuxDataFrame, filters: List, how: str = "and") -> int:
+        """
+        Number of rows of the dataframe satisfying the filters (see filter_bitmap)
+        """
+        return BitmapIndex.count(PandasExecutor.filter_bitmap(ldf, filters, how))
+
+    @staticmethod
+    def _filter_sample(ldf: LuxDataFrame, sample: SampleView, filters: List) -> SampleView:
+        """
+        Rows of a sample of the dataframe satisfying all the filters, selected with the bitmap index of the dataframe
+        """
+        if not filters:
+            return sample
+        bitmap = PandasExecutor.filter_bitmap(ldf, filters)
+        return sample.where(ldf._bitmap_index.mask(bitmap))
 
     @staticmethod
     def execute_2D_binning(vis: Vis) -> None:
@@ -385,8 +1292,9 @@ class PandasExecutor(Executor):
         ----------
         vis : Vis
         """
-        import numpy as np
-
+        if not lux.config.tracer.tracing and PandasExecutor._bin_heatmap(vis):
+            # Binned by the vectorized kernel, the pandas version below is only traced for code export
+            return
         vis._vis_data = vis._vis_data.replace([np.inf, -np.inf], np.nan)
 
         pd.reset_option("mode.chained_assignment")
@@ -440,83 +1348,120 @@ class PandasExecutor(Executor):
 
             vis._vis_data = result.drop(columns=["xBin", "yBin"])
 
+    @staticmethod
+    def _bin_heatmap(vis: Vis) -> bool:
+        """
+        Bin the data of a heatmap with vectorized NumPy, over bins fixed by the min/max metadata of its source.
+        The bins of each row are combined into a single cell index, counted with np.bincount,
+        and the color of each cell is computed by weighting the same counts with its values (mean)
+        or by counting each (cell, category) pair to take the most frequent category (mode).
+
+        Returns
+        -------
+        bool
+            Whether the vis was binned, False if the vis is not over numeric axes and a numeric or nominal color
+        """
+        data = vis._vis_data
+        x_attr = vis.get_attr_by_channel("x")[0].attribute
+        y_attr = vis.get_attr_by_channel("y")[0].attribute
+        color_attr = vis.get_attr_by_channel("color")
+        color_attr = color_attr[0] if len(color_attr) > 0 else None
+        if not data.columns.is_unique:
+            return False
+        for attr in [x_attr, y_attr]:
+            if not (isinstance(data.dtypes[attr], np.dtype) and data.dtypes[attr].kind in "iuf"):
+                return False
+        if color_attr is not None and not (
+            color_attr.data_type == "nominal"
+            or (
+                color_attr.data_type == "quantitative"
+                and isinstance(data.dtypes[color_attr.attribute], np.dtype)
+                and data.dtypes[color_attr.attribute].kind in "iuf"
+            )
+        ):
+            return False
+
+        bin_size = lux.config.heatmap_bin_size
+        x = data[x_attr].to_numpy()
+        y = data[y_attr].to_numpy()
+        x_edges = PandasExecutor._bin_edges(PandasExecutor._bin_range(vis._source, x_attr, x), bin_size)
+        y_edges = PandasExecutor._bin_edges(PandasExecutor._bin_range(vis._source, y_attr, y), bin_size)
+        # NaN compares False, so rows with missing, infinite or out of range coordinates are dropped
+        valid = (x >= x_edges[0]) & (x <= x_edges[-1]) & (y >= y_edges[0]) & (y <= y_edges[-1])
+        if color_attr is not None:
+            color = data[color_attr.attribute]
+            valid &= color.notna().to_numpy()
+            color = color.to_numpy()[valid]
+        cells = PandasExecutor._bin_index(x[valid], x_edges) * bin_size
+        cells += PandasExecutor._bin_index(y[valid], y_edges)
+        n_cells = bin_size * bin_size
+        counts = np.bincount(cells, minlength=n_cells)
+        nonempty = np.flatnonzero(counts)
+        result = {"count": counts[nonempty]}
+        if color_attr is not None and color_attr.data_type == "quantitative":
+            # Average of the values in each cell
+            sums = np.bincount(cells, weights=color, minlength=n_cells)
+            result[color_attr.attribute] = sums[nonempty] / counts[nonempty]
+        elif color_attr is not None:
+            # Most frequent category of each cell, breaking ties with the smallest category like pd.Series.mode
+            try:
+                codes, categories = pd.factorize(color, sort=True)
+            except TypeError:
+                codes, categories = pd.factorize(color)
+            pairs = cells * len(categories) + codes
+            if n_cells * len(categories) <= max(len(pairs), 1 << 20):
+                pair_counts = np.bincount(pairs, minlength=n_cells * len(categories))
+                modes = pair_counts.reshape(n_cells, len(categories))[nonempty].argmax(axis=1)
+            else:
+                # Too many categories for a dense (cell, category) table, count the observed pairs only
+                pairs, pair_counts = np.unique(pairs, return_counts=True)
+                pair_cells, pair_codes = np.divmod(pairs, len(categories))
+                order = np.lexsort((pair_codes, -pair_counts, pair_cells))
+                first = np.ones(len(order), dtype=bool)
+                first[1:] = pair_cells[order][1:] != pair_cells[order][:-1]
+                modes = pair_codes[order][first]
+            result[color_attr.attribute] = np.asarray(categories)[modes]
+        x_index, y_index = np.divmod(nonempty, bin_size)
+        result["xBinStart"] = x_edges[x_index]
+        result["xBinEnd"] = x_edges[x_index + 1]
+        result["yBinStart"] = y_edges[y_index]
+        result["yBinEnd"] = y_edges[y_index + 1]
+        vis._vis_data = pd.DataFrame(result)
+        return True
+
     #######################################################
     ############ Metadata: data type, model #############
     #######################################################
-    def compute_dataset_metadata(self, ldf: LuxDataFrame):
-        ldf._data_type = {}
-        self.compute_data_type(ldf)
+    def compute_dataset_metadata(self, ldf: LuxDataFrame, columns=None):
+        if columns is None:
+            ldf._data_type = {}
+        else:
+            ldf._data_type = {attr: ldf._data_type[attr] for attr in ldf._data_type if attr not in columns}
+        self.compute_data_type(ldf, columns)
 
-    def compute_data_type(self, ldf: LuxDataFrame):
+    def compute_data_type(self, ldf: LuxDataFrame, columns=None):
         from pandas.api.types import is_datetime64_any_dtype as is_datetime
 
-        for attr in list(ldf.columns):
-            if attr in ldf._type_override:
-                ldf._data_type[attr] = ldf._type_override[attr]
-            else:
-                temporal_var_list = ["month", "year", "day", "date", "time", "weekday"]
-
-                if is_timedelta64_series(ldf[attr]):
-                    ldf._data_type[attr] = "quantitative"
-                    ldf._min_max[attr] = (
-                        timedelta64_to_float_seconds(ldf[attr].min()),
-                        timedelta64_to_float_seconds(ldf[attr].max()),
-                    )
-                elif is_datetime(ldf[attr]):
-                    ldf._data_type[attr] = "temporal"
-                elif self._is_datetime_string(ldf[attr]):
-                    ldf._data_type[attr] = "temporal"
-                elif isinstance(attr, pd._libs.tslibs.timestamps.Timestamp):
-                    ldf._data_type[attr] = "temporal"
-                elif str(attr).lower() in temporal_var_list:
-                    ldf._data_type[attr] = "temporal"
-                elif self._is_datetime_number(ldf[attr]):
-                    ldf._data_type[attr] = "temporal"
-                elif self._is_geographical_attribute(ldf[attr]):
-                    ldf._data_type[attr] = "geographical"
-                elif pd.api.types.is_float_dtype(ldf.dtypes[attr]):
-
-                    if ldf.cardinality[attr] != len(ldf) and (ldf.cardinality[attr] < 20):
-                        ldf._data_type[attr] = "nominal"
-                    else:
-                        ldf._data_type[attr] = "quantitative"
-                elif pd.api.types.is_integer_dtype(ldf.dtypes[attr]):
-                    # See if integer value is quantitative or nominal by checking if the ratio of cardinality/data size is less than 0.4 and if there are less than 10 unique values
-                    if ldf.pre_aggregated:
-                        if ldf.cardinality[attr] == len(ldf):
-                            ldf._data_type[attr] = "nominal"
-                    if ldf.cardinality[attr] / len(ldf) < 0.4 and ldf.cardinality[attr] < 20:
-                        ldf._data_type[attr] = "nominal"
-                    else:
-                        ldf._data_type[attr] = "quantitative"
-                    if check_if_id_like(ldf, attr):
-                        ldf._data_type[attr] = "id"
-                # Eliminate this clause because a single NaN value can cause the dtype to be object
-                elif pd.api.types.is_string_dtype(ldf.dtypes[attr]):
-                    # Check first if it's castable to float after removing NaN
-                    is_numeric_nan, series = is_numeric_nan_column(ldf[attr])
-                    if is_numeric_nan:
-                        # int columns gets coerced into floats if contain NaN
-                        ldf._data_type[attr] = "quantitative"
-                        # min max was not computed since object type, so recompute here
-                        ldf._min_max[attr] = (
-                            series.min(),
-                            series.max(),
-                        )
-                    elif check_if_id_like(ldf, attr):
-                        ldf._data_type[attr] = "id"
-                    else:
-                        ldf._data_type[attr] = "nominal"
-                # check if attribute is any type of datetime dtype
-                elif is_datetime_series(ldf.dtypes[attr]):
-                    ldf._data_type[attr] = "temporal"
-                else:
-                    ldf._data_type[attr] = "nominal"
+        if columns is None:
+            attributes = list(ldf.columns)
+        else:
+            attributes = [attr for attr in ldf.columns if attr in columns]
+        # Attributes are typed independently, in parallel when there are several workers,
+        # and the results are assigned in column order so that they do not depend on the number of workers.
+        # Workers read the columns and metadata from a snapshot, not from the dataframe.
+        snapshot = FrameSnapshot(ldf, attributes)
+        inferred = parallel_map(
+            partial(self._infer_data_type, snapshot), attributes, workers=lux.config.metadata_workers
+        )
+        for attr, (data_type, min_max) in zip(attributes, inferred):
+            ldf._data_type[attr] = data_type
+            if min_max is not None:
+                ldf._min_max[attr] = min_max
         if not pd.api.types.is_integer_dtype(ldf.index) and ldf.index.name:
             ldf._data_type[ldf.index.name] = "nominal"
 
         non_datetime_attrs = []
-        for attr in ldf.columns:
+        for attr in attributes:
             if ldf._data_type[attr] == "temporal" and not is_datetime(ldf[attr]):
                 non_datetime_attrs.append(attr)
         warn_msg = ""
@@ -533,25 +1478,117 @@ class PandasExecutor(Executor):
             warn_msg += f"\n\tdf.set_data_type({{'{attr}':'quantitative'}})"
             warnings.warn(warn_msg, stacklevel=2)
 
+    def _infer_data_type(self, ldf: FrameSnapshot, attr):
+        """
+        Infer the data type of an attribute, from a snapshot of the columns and metadata of the dataframe
+
+        Returns
+        -------
+        data_type, min_max
+            Data type of the attribute, and its (min, max) if it had to be recomputed for the data type, else None
+        """
+        from pandas.api.types import is_datetime64_any_dtype as is_datetime
+
+        min_max = None
+        if attr in ldf._type_override:
+            data_type = ldf._type_override[attr]
+        else:
+            temporal_var_list = ["month", "year", "day", "date", "time", "weekday"]
+
+            if is_timedelta64_series(ldf[attr]):
+                data_type = "quantitative"
+                min_max = (
+                    timedelta64_to_float_seconds(ldf[attr].min()),
+                    timedelta64_to_float_seconds(ldf[attr].max()),
+                )
+            elif is_datetime(ldf[attr]):
+                data_type = "temporal"
+            elif self._is_datetime_string(ldf[attr]):
+                data_type = "temporal"
+            elif isinstance(attr, pd._libs.tslibs.timestamps.Timestamp):
+                data_type = "temporal"
+            elif str(attr).lower() in temporal_var_list:
+                data_type = "temporal"
+            elif self._is_datetime_number(ldf[attr]):
+                data_type = "temporal"
+            elif self._is_geographical_attribute(ldf[attr]):
+                data_type = "geographical"
+            elif pd.api.types.is_float_dtype(ldf.dtypes[attr]):
+
+                if ldf.cardinality[attr] != len(ldf) and (ldf.cardinality[attr] < 20):
+                    data_type = "nominal"
+                else:
+                    data_type = "quantitative"
+            elif pd.api.types.is_integer_dtype(ldf.dtypes[attr]):
+                # See if integer value is quantitative or nominal by checking if the ratio of cardinality/data size is less than 0.4 and if there are less than 10 unique values
+                if ldf.pre_aggregated:
+                    if ldf.cardinality[attr] == len(ldf):
+                        data_type = "nominal"
+                if ldf.cardinality[attr] / len(ldf) < 0.4 and ldf.cardinality[attr] < 20:
+                    data_type = "nominal"
+                else:
+                    data_type = "quantitative"
+                if check_if_id_like(ldf, attr):
+                    data_type = "id"
+            # Eliminate this clause because a single NaN value can cause the dtype to be object
+            elif pd.api.types.is_string_dtype(ldf.dtypes[attr]):
+                # Check first if it's castable to float after removing NaN
+                is_numeric_nan, series = is_numeric_nan_column(ldf[attr])
+                if is_numeric_nan:
+                    # int columns gets coerced into floats if contain NaN
+                    data_type = "quantitative"
+                    # min max was not computed since object type, so recompute here
+                    min_max = (
+                        series.min(),
+                        series.max(),
+                    )
+                elif check_if_id_like(ldf, attr):
+                    data_type = "id"
+                else:
+                    data_type = "nominal"
+            # check if attribute is any type of datetime dtype
+            elif is_datetime_series(ldf.dtypes[attr]):
+                data_type = "temporal"
+            else:
+                data_type = "nominal"
+        return data_type, min_max
+
     @staticmethod
     def _is_datetime_string(series):
         if series.dtype == object:
-            not_numeric = False
-            try:
-                pd.to_numeric(series)
-            except Exception as e:
-                not_numeric = True
-
-            datetime_col = None
-            if not_numeric:
-                try:
-                    datetime_col = pd.to_datetime(series)
-                except Exception as e:
+            sample = utils.type_inference_sample(series)
+            if sample is not None:
+                # A sample that does not parse rules out a temporal column without parsing all of it,
+                # while a sample that parses is confirmed on the full column
+                if not PandasExecutor._is_parsable_datetime(sample):
+                    return False
+                if not PandasExecutor._is_numeric_string(sample):
+                    # Non-numeric values in the sample rule out a numeric column
+                    return PandasExecutor._is_parsable_datetime(series)
+                # Numbers (as opposed to numeric strings) always parse as timestamps since epoch
+                if pd.api.types.infer_dtype(sample) != "string":
                     return False
-            if datetime_col is not None:
-                return True
+            if PandasExecutor._is_numeric_string(series):
+                return False
+            return PandasExecutor._is_parsable_datetime(series)
         return False
 
+    @staticmethod
+    def _is_numeric_string(series):
+        try:
+            pd.to_numeric(series)
+            return True
+        except Exception as e:
+            return False
+
+    @staticmethod
+    def _is_parsable_datetime(series):
+        try:
+            pd.to_datetime(series)
+            return True
+        except Exception as e:
+            return False
+
     @staticmethod
     def _is_geographical_attribute(series):
         # run detection algorithm
@@ -562,36 +1599,71 @@ class PandasExecutor(Executor):
     def _is_datetime_number(series):
         is_int_dtype = pd.api.types.is_integer_dtype(series.dtype)
         if is_int_dtype:
-            try:
-                temp = series.astype(str)
-                pd.to_datetime(temp)
-                return True
-            except Exception:
-                return False
+            sample = utils.type_inference_sample(series)
+            if sample is not None:
+                # Extreme values are the most likely to fall out of the range of valid dates. A sample
+                # that does not parse rules out a temporal column, one that parses is confirmed in full.
+                sample = np.append(sample.to_numpy(), [series.min(), series.max()])
+                if not PandasExecutor._is_parsable_datetime(sample.astype(str)):
+                    return False
+            return PandasExecutor._is_parsable_datetime(series.astype(str))
         return False
 
-    def compute_stats(self, ldf: LuxDataFrame):
+    def compute_stats(self, ldf: LuxDataFrame, columns=None):
         # precompute statistics
-        ldf.unique_values = {}
-        ldf._min_max = {}
-        ldf.cardinality = {}
+        if columns is None:
+            ldf.unique_values = {}
+            ldf._min_max = {}
+            ldf.cardinality = {}
+            ldf._column_stats = {}
+            positions = None
+        else:
+            # Only re-profile the given columns. The dictionaries may be shared with derived dataframes,
+            # so copy them before updating.
+            ldf.unique_values = dict(ldf.unique_values)
+            ldf._min_max = dict(ldf._min_max)
+            ldf.cardinality = dict(ldf.cardinality)
+            ldf._column_stats = dict(ldf._column_stats)
+            for attribute in columns:
+                attribute_repr = PandasExecutor._attribute_repr(attribute)
+                for stats in [ldf.unique_values, ldf._min_max, ldf.cardinality, ldf._column_stats]:
+                    stats.pop(attribute_repr, None)
+            positions = [i for i, attribute in enumerate(ldf.columns) if attribute in columns]
         ldf._length = len(ldf)
 
-        for attribute in ldf.columns:
-
-            if isinstance(attribute, pd._libs.tslibs.timestamps.Timestamp):
-                # If timestamp, make the dictionary keys the _repr_ (e.g., TimeStamp('2020-04-05 00.000')--> '2020-04-05')
-                attribute_repr = str(attribute._date_repr)
-            else:
-                attribute_repr = attribute
-
-            ldf.unique_values[attribute_repr] = list(ldf[attribute].unique())
-            ldf.cardinality[attribute_repr] = len(ldf.unique_values[attribute_repr])
-
-            if pd.api.types.is_float_dtype(ldf.dtypes[attribute]) or pd.api.types.is_integer_dtype(ldf.dtypes[attribute]):
-                ldf._min_max[attribute_repr] = (ldf[attribute].min(),ldf[attribute].max(),)
-
-        if not pd.api.types.is_integer_dtype(ldf.index):
+        profiles = profile_columns(
+            ldf,
+            positions,
+            sketch_threshold=lux.config.approx_cardinality_threshold,
+            workers=lux.config.metadata_workers,
+        )
+        for attribute, profile in profiles.items():
+            attribute_repr = PandasExecutor._attribute_repr(attribute)
+
+            # High-cardinality columns only keep a sketch of their distinct values
+            if profile["unique"] is not None:
+                ldf.unique_values[attribute_repr] = UniqueValues(profile["unique"])
+            ldf.cardinality[attribute_repr] = profile["cardinality"]
+
+            if profile["min_max"] is not None:
+                ldf._min_max[attribute_repr] = profile["min_max"]
+            ldf._column_stats[attribute_repr] = {
+                "null_count": profile["null_count"],
+                "count": profile["count"],
+                "dtype": profile["dtype"],
+                "sketch": profile["sketch"],
+            }
+
+        if columns is None and not pd.api.types.is_integer_dtype(ldf.index):
             index_column_name = ldf.index.name
-            ldf.unique_values[index_column_name] = list(ldf.index)
+            threshold = lux.config.approx_cardinality_threshold
+            if threshold is None or len(ldf.index) <= threshold:
+                ldf.unique_values[index_column_name] = UniqueValues(ldf.index)
             ldf.cardinality[index_column_name] = len(ldf.index)
+
+    @staticmethod
+    def _attribute_repr(attribute):
+        if isinstance(attribute, pd._libs.tslibs.timestamps.Timestamp):
+            # If timestamp, make the dictionary keys the _repr_ (e.g., TimeStamp('2020-04-05 00.000')--> '2020-04-05')
+            return str(attribute._date_repr)
+        return attribute
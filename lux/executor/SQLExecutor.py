@@ -328,7 +328,8 @@ class SQLExecutor(Executor):
             bin_count_query = lux.config.query_templates['histogram_counts'].format(bucket_cases = when_lines, table_name = tbl.table_name, where_clause = where_clause)
         # need to calculate the bin edges before querying for the relevant data
         else:
-            bin_count_query = lux.config.query_templates['histogram_counts'].format(bin_attribute = bin_attribute.attribute,upper_edges = "{" + upper_edges + "}",table_name = tbl.table_name,where_clause = where_clause,)
+            # Templates without width_bucket (e.g., SQLite) compute the buckets from the range and width of the bins
+            bin_count_query = lux.config.query_templates['histogram_counts'].format(bin_attribute = bin_attribute.attribute,upper_edges = "{" + upper_edges + "}",attr_min = attr_min,bin_width = bin_width,num_bins = num_bins,table_name = tbl.table_name,where_clause = where_clause,)
 
         bin_count_data = pandas.read_sql(bin_count_query, lux.config.SQLconnection)
         assert((len(bin_count_data.columns) ==2) & (set(['width_bucket', 'count']).issubset(bin_count_data.columns)))
@@ -348,11 +349,8 @@ class SQLExecutor(Executor):
             else:
                 bin_centers = np.append(bin_centers, (upper_edges[len(upper_edges) - 1] + attr_max) / 2)
 
-            if len(bin_centers) > len(bin_count_data):
-                bucket_lables = bin_count_data["width_bucket"].unique()
-                for i in range(0, len(bin_centers)):
-                    if i not in bucket_lables:
-                        bin_count_data = bin_count_data.append(pandas.DataFrame([[i, 0]], columns=bin_count_data.columns))
+            # Empty buckets are not returned by the query, and are counted as 0 in the order of the buckets
+            bin_count_data = bin_count_data.set_index("width_bucket").reindex(range(len(bin_centers)), fill_value=0).reset_index()
 
             view._vis_data = pandas.DataFrame(np.array([bin_centers, list(bin_count_data["count"])]).T,columns=[bin_attribute.attribute, "Number of Records"],)
             view._vis_data = utils.pandas_to_lux(view.data)
@@ -426,7 +424,7 @@ class SQLExecutor(Executor):
             bin_count_query = lux.config.query_templates['heatmap_counts'].format(bucket_cases1 = x_when_lines, bucket_cases2 = y_when_lines, table_name = tbl.table_name, where_clause = where_clause)
 
         else:
-            bin_count_query = lux.config.query_templates['heatmap_counts'].format(x_attribute = x_attribute.attribute,x_upper_edges_string = "{" + x_upper_edges_string + "}",y_attribute = y_attribute.attribute,y_upper_edges_string = "{" + y_upper_edges_string + "}",table_name = tbl.table_name,where_clause = where_clause,)
+            bin_count_query = lux.config.query_templates['heatmap_counts'].format(x_attribute = x_attribute.attribute,x_upper_edges_string = "{" + x_upper_edges_string + "}",x_attr_min = x_attr_min,x_bin_width = x_bin_width,y_attribute = y_attribute.attribute,y_upper_edges_string = "{" + y_upper_edges_string + "}",y_attr_min = y_attr_min,y_bin_width = y_bin_width,num_bins = num_bins,table_name = tbl.table_name,where_clause = where_clause,)
 
         # data = pandas.read_sql(bin_count_query, lux.config.SQLconnection)
 
@@ -46,6 +46,10 @@ def interestingness(vis: Vis, ldf: LuxDataFrame) -> int:
     if vis.data is None or len(vis.data) == 0:
         return -1
         # raise Exception("Vis.data needs to be populated before interestingness can be computed. Run Executor.execute(vis,ldf).")
+    # Reuse the score computed by the worker process that executed the vis, as long as its data is unchanged
+    precomputed = getattr(vis, "_precomputed_score", None)
+    if precomputed is not None and precomputed[0] is vis._vis_data and ldf is vis._source:
+        return precomputed[1]
     try:
         filter_specs = utils.get_filter_specs(vis._inferred_intent)
         vis_attrs_specs = utils.get_attrs_specs(vis._inferred_intent)
@@ -171,10 +175,10 @@ def interestingness(vis: Vis, ldf: LuxDataFrame) -> int:
 
 def get_filtered_size(filter_specs, ldf):
     filter_intents = filter_specs[0]
-    result = PandasExecutor.apply_filter(
-        ldf, filter_intents.attribute, filter_intents.filter_op, filter_intents.value
+    # Count the rows with the bitmap index of the dataframe, without materializing them
+    return PandasExecutor.filtered_size(
+        ldf, [(filter_intents.attribute, filter_intents.filter_op, filter_intents.value)]
     )
-    return len(result)
 
 
 def skewness(v):
@@ -223,7 +227,7 @@ def deviation_from_overall(
     int
             Score describing how different the vis is from the overall vis
     """
-    if lux.config.executor.name == "PandasExecutor":
+    if utils.is_dataframe_executor():
         if exclude_nan:
             vdata = vis.data.dropna()
         else:
@@ -490,7 +490,7 @@ class Compiler:
                 for attr in attr_lst:
                     options = []
                     if clause.value == "?":
-                        options = ldf.unique_values[attr]
+                        options = utils.get_unique_values(ldf, attr)
                         specInd = _inferred_intent.index(clause)
                         _inferred_intent[specInd] = Clause(
                             attribute=clause.attribute,
@@ -91,10 +91,15 @@ class Validator:
                                         vals = clause.value
                                     else:
                                         vals = [clause.value]
+                                    if lux.utils.utils.is_dataframe_executor():
+                                        # Hashed lookups into the unique values instead of scanning the column
+                                        unique_values = lux.utils.utils.get_unique_values(
+                                            ldf, clause.attribute
+                                        )
                                     for val in vals:
                                         if (
-                                            lux.config.executor.name == "PandasExecutor"
-                                            and val not in series.values
+                                            lux.utils.utils.is_dataframe_executor()
+                                            and val not in unique_values
                                         ):
                                             warn_msg = f"\n- The input value '{val}' does not exist for the attribute '{clause.attribute}' for the DataFrame."
             return warn_msg
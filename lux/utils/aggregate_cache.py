@@ -0,0 +1,204 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+import pandas as pd
+import lux
+
+
+class AggregateCache:
+    """
+    In-memory cache of the group-by aggregates computed by the executor, keyed by the version of the
+    aggregated data, the filters, the group-by attributes, the measure and the aggregation function.
+    Every aggregate also records the versions of the columns it was computed from, so that it is not served
+    once any of them is modified, and it is dropped when the dataframe expires them (see expire_columns).
+    Aggregates over fewer group-by attributes are rolled up from a cached aggregate over more of them.
+    Least recently used entries are evicted once the cache exceeds its size limit.
+    """
+
+    # Aggregation combining the partial aggregates of the groups of a finer aggregate
+    rollups = {"count": "sum", "sum": "sum", "min": "min", "max": "max"}
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # Cached group-by attributes of every (source, filters, measure, aggregation)
+        self._cubes = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Fraction of the lookups served from the cache, either directly or by rolling up a finer aggregate
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(
+        self, source, filters: Tuple, groupby_attrs: Tuple, measure: str, agg_func, versions: Dict = None
+    ):
+        """
+        Look up the aggregate of a measure grouped by the given attributes
+
+        Parameters
+        ----------
+        source : Tuple
+            Version of the rows of the aggregated data, followed by the key of the sample they were drawn from
+        filters : Tuple
+            (attribute, filter_op, value) of the filters applied before aggregating
+        groupby_attrs : Tuple
+            Group-by attributes
+        measure : str
+            Aggregated attribute, or "Record" for the number of rows
+        agg_func : str or callable
+            Aggregation function
+        versions : Dict, optional
+            Versions of the columns of the aggregated data (see LuxDataFrame._column_versions), by default None
+
+        Returns
+        -------
+        LuxDataFrame or None
+            Copy of the aggregate, with the group-by attributes followed by the measure as columns,
+            or None if it is not cached and cannot be rolled up
+        """
+        key = (source, filters, groupby_attrs, measure, agg_func)
+        try:
+            entry = self._entries.get(key)
+        except TypeError:
+            return None
+        column_versions = self._column_versions(filters, groupby_attrs, measure, versions)
+        if entry is not None and entry[2] != column_versions:
+            self._remove(key)
+            entry = None
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._to_lux(entry[0])
+        rollup = self.rollups.get(getattr(agg_func, "__name__", agg_func))
+        if rollup is not None:
+            for cube_attrs in list(self._cubes.get((source, filters, measure, agg_func), ())):
+                if cube_attrs != groupby_attrs and set(groupby_attrs) <= set(cube_attrs):
+                    cube_key = (source, filters, cube_attrs, measure, agg_func)
+                    cube_versions = self._column_versions(filters, cube_attrs, measure, versions)
+                    if self._entries[cube_key][2] != cube_versions:
+                        self._remove(cube_key)
+                        continue
+                    self._entries.move_to_end(cube_key)
+                    cube = self._entries[cube_key][0]
+                    aggregate = (
+                        cube.groupby(list(groupby_attrs), dropna=False)[measure]
+                        .agg(rollup)
+                        .reset_index()
+                    )
+                    self.hits += 1
+                    self.put(source, filters, groupby_attrs, measure, agg_func, aggregate, versions)
+                    return self._to_lux(aggregate)
+        self.misses += 1
+        return None
+
+    def put(
+        self,
+        source,
+        filters: Tuple,
+        groupby_attrs: Tuple,
+        measure: str,
+        agg_func,
+        aggregate,
+        versions: Dict = None,
+    ) -> None:
+        """
+        Cache the aggregate of a measure grouped by the given attributes (see get),
+        then evict the least recently used entries
+        """
+        import lux.core
+
+        key = (source, filters, groupby_attrs, measure, agg_func)
+        try:
+            hash(key)
+        except TypeError:
+            return
+        aggregate = lux.core.originalDF(aggregate, copy=True)
+        size = int(aggregate.memory_usage(index=True, deep=True).sum())
+        if size > self.max_size:
+            return
+        if key in self._entries:
+            self._remove(key)
+        column_versions = self._column_versions(filters, groupby_attrs, measure, versions)
+        self._entries[key] = (aggregate, size, column_versions)
+        self._cubes.setdefault((source, filters, measure, agg_func), set()).add(groupby_attrs)
+        self.size += size
+        self.evict()
+
+    def _remove(self, key) -> None:
+        source, filters, groupby_attrs, measure, agg_func = key
+        _, size, _ = self._entries.pop(key)
+        self.size -= size
+        cubes = self._cubes[(source, filters, measure, agg_func)]
+        cubes.discard(groupby_attrs)
+        if not cubes:
+            del self._cubes[(source, filters, measure, agg_func)]
+
+    @staticmethod
+    def _column_versions(filters: Tuple, groupby_attrs: Tuple, measure: str, versions: Dict) -> Dict:
+        """
+        Versions of the filter, group-by and measure attributes of an aggregate
+        """
+        versions = versions or {}
+        attributes = [filter_attr for filter_attr, _, _ in filters] + list(groupby_attrs) + [measure]
+        return {attr: versions.get(attr, 0) for attr in attributes}
+
+    def expire_columns(self, version, columns: List = None) -> None:
+        """
+        Drop the aggregates over any of the given columns, e.g. after they were modified,
+        among those computed from the rows with the given version (the first item of their source).
+        All the aggregates of these rows are dropped if no columns are given.
+        """
+        columns = None if columns is None else set(columns)
+        stale = [
+            key
+            for key, (_, _, column_versions) in self._entries.items()
+            if key[0][0] is version and (columns is None or not columns.isdisjoint(column_versions))
+        ]
+        for key in stale:
+            self._remove(key)
+
+    @staticmethod
+    def _to_lux(aggregate: pd.DataFrame):
+        from lux.core.frame import LuxDataFrame
+
+        return LuxDataFrame(aggregate._mgr.copy())
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the cache fits within its size limit
+        """
+        while self.size > self.max_size and self._entries:
+            self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache, and reset its hit and miss counters
+        """
+        self._entries.clear()
+        self._cubes.clear()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,148 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from collections import OrderedDict
+from typing import Iterable, List
+
+import numpy as np
+import pandas as pd
+
+# Number of set bits of every byte value
+POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+# Maximum size in bytes of the bitmaps kept for a dataframe
+BITMAP_INDEX_SIZE = 64 * 1024 * 1024
+
+
+class BitmapIndex:
+    """
+    Index of the rows of a dataframe satisfying filters, keyed by (attribute, filter_op, value).
+    Each filter is stored as a bitmap (a bit-packed boolean mask, one bit per row),
+    so that the rows of a filter are computed once, counted with a popcount, and combined with other filters.
+    Least recently used bitmaps are evicted once the index exceeds its size limit.
+    """
+
+    def __init__(self, n_rows: int, max_size: int = BITMAP_INDEX_SIZE):
+        self.n_rows = n_rows
+        self.max_size = max_size
+        self._bitmaps = OrderedDict()
+        # Codes of the factorized columns, and the code of each of their values
+        self._codes = {}
+
+    def __len__(self) -> int:
+        return len(self._bitmaps)
+
+    def get(self, attribute, op: str, value) -> np.ndarray:
+        """
+        Bitmap of the rows satisfying the filter, or None if it is not indexed
+        """
+        key = (attribute, op, value)
+        try:
+            bitmap = self._bitmaps.get(key)
+        except TypeError:
+            return None
+        if bitmap is not None:
+            self._bitmaps.move_to_end(key)
+        return bitmap
+
+    def add(self, attribute, op: str, value, mask: np.ndarray) -> np.ndarray:
+        """
+        Index the boolean mask of the rows satisfying the filter
+
+        Returns
+        -------
+        np.ndarray
+            Bitmap of the mask
+        """
+        bitmap = np.packbits(mask)
+        key = (attribute, op, value)
+        try:
+            self._bitmaps[key] = bitmap
+        except TypeError:
+            # Unhashable filter values (e.g., lists) are not indexed
+            return bitmap
+        while len(self._bitmaps) * bitmap.nbytes > self.max_size and self._bitmaps:
+            self._bitmaps.popitem(last=False)
+        return bitmap
+
+    def equality_mask(self, df: pd.DataFrame, attribute, value) -> np.ndarray:
+        """
+        Boolean mask of the rows whose attribute equals the value, compared on the codes of the column,
+        so that every equality filter on a column (e.g., one per category in the Filter action)
+        only hashes its values once.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean mask, or None if the column is not categorical, boolean, integer or of Python objects
+        """
+        if attribute not in self._codes:
+            column = df[attribute]
+            dtype = column.dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                dtype = dtype.categories.dtype
+            # Other dtypes (e.g., periods and datetimes) parse the values they are compared with
+            if not (isinstance(dtype, np.dtype) and dtype.kind in "Obiu"):
+                return None
+            codes, uniques = pd.factorize(column)
+            lookup = {}
+            for code, unique in enumerate(uniques):
+                lookup.setdefault(unique, code)
+            # Narrowest signed type holding the codes, including -1 for missing values
+            for dtype in [np.int8, np.int16, np.int32, np.int64]:
+                if len(uniques) <= np.iinfo(dtype).max:
+                    break
+            self._codes[attribute] = (codes.astype(dtype), lookup)
+        codes, lookup = self._codes[attribute]
+        try:
+            code = lookup.get(value)
+        except TypeError:
+            return None
+        if code is None:
+            return np.zeros(self.n_rows, dtype=bool)
+        return codes == code
+
+    def expire_columns(self, columns: Iterable) -> None:
+        """
+        Drop the bitmaps of the filters on the given columns, and their codes
+        """
+        columns = set(columns)
+        for key in [key for key in self._bitmaps if key[0] in columns]:
+            del self._bitmaps[key]
+        for column in columns:
+            self._codes.pop(column, None)
+
+    def mask(self, bitmap: np.ndarray) -> np.ndarray:
+        """
+        Boolean mask of the rows of a bitmap
+        """
+        return np.unpackbits(bitmap, count=self.n_rows).view(bool)
+
+    @staticmethod
+    def count(bitmap: np.ndarray) -> int:
+        """
+        Number of rows of a bitmap
+        """
+        return int(POPCOUNT[bitmap].sum(dtype=np.int64))
+
+    @staticmethod
+    def combine(bitmaps: List[np.ndarray], how: str = "and") -> np.ndarray:
+        """
+        Bitmap of the rows satisfying all (how="and") or any (how="or") of the bitmaps
+        """
+        if how == "and":
+            return np.bitwise_and.reduce(bitmaps)
+        elif how == "or":
+            return np.bitwise_or.reduce(bitmaps)
+        raise ValueError(f"Bitmaps are combined with 'and' or 'or', not '{how}'.")
@@ -0,0 +1,109 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from typing import Iterable, List
+
+import numpy as np
+import pandas as pd
+
+
+class DictionaryEncoding:
+    """
+    Dictionary encoding of the columns of a dataframe, each encoded once into integer codes indexing its categories.
+    Categories are sorted like the keys of a group-by, with missing values last (as with dropna=False),
+    so that the groups of the sampled rows are counted and aggregated with np.bincount over their codes.
+    """
+
+    def __init__(self, n_rows: int):
+        self.n_rows = n_rows
+        # Codes and categories of each encoded column, or None if the column cannot be encoded
+        self._encodings = {}
+
+    def __len__(self) -> int:
+        return len(self._encodings)
+
+    def encode(self, df: pd.DataFrame, attribute):
+        """
+        Encode a column of the dataframe, unless it is already encoded
+
+        Returns
+        -------
+        codes : np.ndarray
+            Code of each row, in the narrowest signed integer type holding the codes
+        categories : np.ndarray or ExtensionArray
+            Value of each code, in sorted order followed by the missing value, if any
+
+        or None if the column does not have a NumPy dtype (e.g., categorical columns, which keep
+        their unobserved categories when grouped) or its values cannot be sorted
+        """
+        if attribute not in self._encodings:
+            column = df[attribute]
+            encoding = None
+            if isinstance(column.dtype, np.dtype):
+                try:
+                    codes, uniques = pd.factorize(column, sort=True)
+                except TypeError:
+                    # Values of mixed types that cannot be compared
+                    codes = None
+                if codes is not None:
+                    categories = uniques._values
+                    missing = codes == -1
+                    if missing.any():
+                        codes[missing] = len(uniques)
+                        # Missing value of the dtype of the column (e.g., NaN or NaT)
+                        categories = pd.api.extensions.take(
+                            categories, np.append(np.arange(len(uniques)), -1), allow_fill=True
+                        )
+                    for dtype in [np.int8, np.int16, np.int32, np.int64]:
+                        if len(categories) <= np.iinfo(dtype).max:
+                            break
+                    encoding = (codes.astype(dtype), categories)
+            self._encodings[attribute] = encoding
+        return self._encodings[attribute]
+
+    def expire_columns(self, columns: Iterable) -> None:
+        """
+        Drop the encodings of the given columns
+        """
+        for column in columns:
+            self._encodings.pop(column, None)
+
+    @staticmethod
+    def combine(codes: List[np.ndarray], categories: List) -> np.ndarray:
+        """
+        Combine the codes of several columns into the code of each combination of their categories,
+        ordered like the keys of a group-by over the columns
+
+        Returns
+        -------
+        np.ndarray
+            Combined code of each row
+        """
+        combined = codes[0].astype(np.intp)
+        for column_codes, column_categories in zip(codes[1:], categories[1:]):
+            combined *= len(column_categories)
+            combined += column_codes
+        return combined
+
+    @staticmethod
+    def split(combined: np.ndarray, categories: List) -> List[np.ndarray]:
+        """
+        Codes of each column from combined codes (see combine)
+        """
+        codes = []
+        for column_categories in reversed(categories[1:]):
+            combined, column_codes = np.divmod(combined, len(column_categories))
+            codes.append(column_codes)
+        codes.append(combined)
+        return codes[::-1]
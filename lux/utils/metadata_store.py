@@ -0,0 +1,154 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Optional
+
+import pandas as pd
+import lux
+
+
+class MetadataStore:
+    """
+    On-disk cache of the metadata computed for a dataframe, keyed by a fingerprint of its data,
+    so that reopening the same data skips the metadata computation.
+    Least recently used entries are evicted once the cache exceeds its size limit.
+    """
+
+    # Attributes computed by compute_stats and compute_dataset_metadata
+    metadata_attrs = [
+        "_data_type",
+        "unique_values",
+        "cardinality",
+        "_min_max",
+        "_column_stats",
+        "_length",
+    ]
+
+    def __init__(self, directory: str, max_size: int):
+        self.directory = os.path.expanduser(directory)
+        self.max_size = max_size
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(df: pd.DataFrame) -> Optional[str]:
+        """
+        Fingerprint of a dataframe, computed from its schema, row count and the hash of every row,
+        so that dataframes differing in a single value have different fingerprints.
+
+        Returns
+        -------
+        str or None
+            Hex digest, or None if the dataframe contains unhashable values
+        """
+        import lux.core
+
+        pdf = lux.core.originalDF(df, copy=False)
+        key = hashlib.sha1()
+        schema = (
+            lux.__version__,
+            [str(column) for column in pdf.columns],
+            [str(dtype) for dtype in pdf.dtypes],
+            len(pdf),
+            type(pdf.index).__name__,
+            str(pdf.index.name),
+            # Settings that change the computed metadata
+            lux.config.approx_cardinality_threshold,
+            sorted((str(attr), str(data_type)) for attr, data_type in (df._type_override or {}).items()),
+        )
+        key.update(repr(schema).encode())
+        if len(pdf) > 0:
+            try:
+                hashes = pd.util.hash_pandas_object(pdf, index=True)
+            except TypeError:
+                return None
+            key.update(hashes.values.tobytes())
+        return key.hexdigest()
+
+    def _path(self, fingerprint: str) -> str:
+        return os.path.join(self.directory, f"{fingerprint}.pkl")
+
+    def load(self, df, fingerprint: str) -> bool:
+        """
+        Rehydrate the metadata of the dataframe from the cache
+
+        Returns
+        -------
+        bool
+            Whether the metadata was found in the cache
+        """
+        path = self._path(fingerprint)
+        try:
+            with open(path, "rb") as f:
+                metadata = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return False
+        for attr in self.metadata_attrs:
+            setattr(df, attr, metadata[attr])
+        # Mark the entry as recently used
+        os.utime(path)
+        return True
+
+    def save(self, df, fingerprint: str) -> None:
+        """
+        Persist the metadata of the dataframe to the cache, then evict the least recently used entries
+        """
+        metadata = {attr: getattr(df, attr, None) for attr in self.metadata_attrs}
+        try:
+            payload = pickle.dumps(metadata, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # Unique values of arbitrary Python objects may not be picklable
+            return
+        if len(payload) > self.max_size:
+            return
+        # Write to a temporary file first, so that concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, self._path(fingerprint))
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the cache fits within its size limit
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache
+        """
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,297 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import copy
+import os
+import pickle
+import shutil
+import tempfile
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List
+
+import numpy as np
+import pandas as pd
+import lux
+
+# Minimum amount of work, as the number of vis times the number of sampled rows, for a VisList to be executed
+# on the process pool; smaller workloads are executed serially, faster than starting the tasks of the pool
+MIN_PARALLEL_WORK = 10000000
+
+# Metadata of the dataframe passed on to the workers, so that they do not compute it again
+SHARED_METADATA = [
+    "_data_type",
+    "unique_values",
+    "cardinality",
+    "_min_max",
+    "_column_stats",
+    "_length",
+    "pre_aggregated",
+    "_type_override",
+    "_column_versions",
+]
+
+# Settings of lux.config read while executing and scoring vis, applied in the workers through their setters.
+# The sampling start comes before the sampling cap, as each setter checks the other setting.
+SHARED_CONFIG = [
+    "sampling",
+    "sampling_strategy",
+    "sampling_min_category_count",
+    "sampling_start",
+    "sampling_cap",
+    "early_pruning",
+    "early_pruning_sample_cap",
+    "early_pruning_sample_start",
+    "progressive_aggregation",
+    "approx_cardinality_threshold",
+    "heatmap_bin_size",
+    "lazy_maintain",
+    "topk",
+    "sort",
+    "pandas_fallback",
+    "interestingness_fallback",
+]
+
+
+class SharedFrame:
+    """
+    Columns of a dataframe saved as NumPy files in a temporary directory (in shared memory when /dev/shm exists),
+    which worker processes memory-map instead of receiving a pickled copy of the data.
+    Columns without a NumPy dtype (e.g., strings) are dictionary-encoded, so that only their codes are mapped
+    and their categories are pickled once per execution, along with the metadata and the sample of the dataframe,
+    in a header removed once the execution returns (see `remove_header`).
+    The directory is removed once the SharedFrame is garbage collected, or earlier by calling `remove`.
+    """
+
+    def __init__(self, ldf):
+        self.data_version = ldf._data_version
+        self.directory = tempfile.mkdtemp(
+            prefix="lux-", dir="/dev/shm" if os.path.isdir("/dev/shm") else None
+        )
+        self.remove = weakref.finalize(self, shutil.rmtree, self.directory, ignore_errors=True)
+        # Path and categories (None for NumPy columns) of each saved column
+        self.columns = {}
+        self._n_headers = 0
+        if isinstance(ldf.index, pd.RangeIndex):
+            self.index = (ldf.index.start, ldf.index.stop, ldf.index.step, ldf.index.name)
+        else:
+            self.index = (*self._save(ldf.index, "index"), ldf.index.name)
+
+    def add_columns(self, ldf, columns: Iterable) -> None:
+        """
+        Save the given columns of the dataframe, unless they are already saved
+        """
+        pdf = lux.core.originalDF(ldf, copy=False)
+        for column in columns:
+            if column not in self.columns:
+                self.columns[column] = self._save(pdf[column], str(len(self.columns)))
+
+    def _save(self, values, name: str):
+        if isinstance(values.dtype, np.dtype) and values.dtype.kind in "biufcmM":
+            array, categories = np.asarray(values), None
+        else:
+            array, categories = pd.factorize(values)
+            categories = categories._values
+        path = os.path.join(self.directory, name + ".npy")
+        np.save(path, array, allow_pickle=False)
+        return path, categories
+
+    def write_header(self, ldf, columns: List) -> str:
+        """
+        Write the categories of the given columns, the metadata and sample of the dataframe,
+        and the settings of lux.config in SHARED_CONFIG to a header read once by every worker
+
+        Returns
+        -------
+        str
+            Path of the header
+        """
+        header = {
+            "columns": [(column, *self.columns[column]) for column in columns],
+            "index": self.index,
+            "metadata": {attr: getattr(ldf, attr) for attr in SHARED_METADATA},
+            "sample": (ldf._sampled.positions, ldf._sampled.weights),
+            "config": {name: getattr(lux.config, name) for name in SHARED_CONFIG},
+        }
+        path = os.path.join(self.directory, f"header{self._n_headers}.pkl")
+        self._n_headers += 1
+        with open(path, "wb") as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return path
+
+    @staticmethod
+    def remove_header(path: str) -> None:
+        """
+        Remove a header once the workers are done with it, as every header holds a copy of the metadata
+        """
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def attach(header_path: str):
+        """
+        Memory-map the columns described by a header into a LuxDataFrame with the metadata and sample
+        of the original dataframe, and apply the settings of lux.config of the original process
+
+        Returns
+        -------
+        LuxDataFrame
+        """
+        from lux.core.frame import LuxDataFrame
+        from lux.utils.sampling_utils import SampleView
+
+        with open(header_path, "rb") as f:
+            header = pickle.load(f)
+        config = dict(header["config"])
+        if config["sampling_start"] > lux.config.sampling_cap:
+            # Raise the cap first, as the sampling start may not exceed it
+            lux.config.sampling_cap = config.pop("sampling_cap")
+        for name, value in config.items():
+            setattr(lux.config, name, value)
+        # Workers do not start pools of their own
+        lux.config.execution_workers = 1
+
+        def load(path, categories):
+            # Copy-on-write mapping, so that pandas may modify the arrays without touching the shared files
+            array = np.asarray(np.load(path, mmap_mode="c"))
+            if categories is None:
+                return array
+            return pd.api.extensions.take(categories, array, allow_fill=True)
+
+        if len(header["index"]) == 4:
+            start, stop, step, name = header["index"]
+            index = pd.RangeIndex(start, stop, step, name=name)
+        else:
+            path, categories, name = header["index"]
+            index = pd.Index(load(path, categories), name=name)
+        data = {column: load(path, categories) for column, path, categories in header["columns"]}
+        ldf = LuxDataFrame(data, index=index, columns=list(data), copy=False)
+        for attr, value in header["metadata"].items():
+            setattr(ldf, attr, value)
+        ldf._metadata_fresh = True
+        ldf._expire_stale_samples()
+        positions, weights = header["sample"]
+        ldf._sampled = SampleView(ldf, positions, weights)
+        return ldf
+
+
+# Dataframe shared by the calling process, kept until its data changes
+_shared = None
+
+
+def share(ldf, columns: Iterable) -> SharedFrame:
+    """
+    Shared copy of the given columns of the dataframe, reusing the columns already shared
+    as long as the data of the dataframe does not change
+    """
+    global _shared
+    if _shared is None or _shared.data_version is not ldf._data_version:
+        _shared = None
+        _shared = SharedFrame(ldf)
+    _shared.add_columns(ldf, columns)
+    return _shared
+
+
+# Dataframe attached by this worker process, with the path of its header
+_attached = (None, None)
+
+
+def execute_partition(header_path: str, vislist: List, approx: bool = False):
+    """
+    Execute and score a partition of a VisList in a worker process, on the dataframe shared by the calling process
+
+    Parameters
+    ----------
+    header_path : str
+        Path of the header of the shared dataframe (see SharedFrame.write_header)
+    vislist : List[Vis]
+        Vis detached from their data (see detach)
+    approx : bool
+        Whether the vis are approximated on the early pruning sample
+
+    Returns
+    -------
+    results : List[tuple]
+        Data (as a pandas BlockManager), mark, approximation flag, score and messages of each vis
+    messages : List[dict]
+        Messages added to the dataframe while executing the partition
+    """
+    global _attached
+    from lux.executor.PandasExecutor import PandasExecutor
+    from lux.interestingness.interestingness import interestingness
+    from lux.utils.message import Message
+
+    if _attached[0] != header_path:
+        # Release the previously attached dataframe before mapping the next one
+        _attached = (None, None)
+        _attached = (header_path, SharedFrame.attach(header_path))
+    ldf = _attached[1]
+    ldf._message = Message()
+    PandasExecutor.execute(vislist, ldf, approx)
+    results = []
+    for vis in vislist:
+        cache_key = PandasExecutor._vis_cache_key(vis, ldf, approx)
+        if cache_key is not None and ldf._vis_cache and cache_key in ldf._vis_cache:
+            vis_messages = ldf._vis_cache[cache_key][1]
+        else:
+            vis_messages = []
+        # Only the blocks of the data are returned, without the metadata of the shared dataframe
+        data = None if vis._vis_data is None else vis._vis_data._mgr
+        results.append((data, vis._mark, vis.approx, interestingness(vis, ldf), vis_messages))
+    return results, ldf._message.messages
+
+
+def detach(vis):
+    """
+    Copy of a vis without its source and data, to be sent to a worker process
+    """
+    detached = copy.copy(vis)
+    detached._source = None
+    detached._vis_data = None
+    detached._original_df = None
+    detached._precomputed_score = None
+    return detached
+
+
+# Process pool shared by the executions, with its number of workers
+_pool = (None, 0)
+
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Pool of worker processes, started the first time it is needed and kept for the following executions
+    """
+    global _pool
+    pool, pool_workers = _pool
+    if pool is None or pool_workers != workers:
+        if pool is not None:
+            pool.shutdown(wait=False)
+        _pool = (ProcessPoolExecutor(max_workers=workers), workers)
+    return _pool[0]
+
+
+def shutdown() -> None:
+    """
+    Stop the pool of worker processes, and remove the columns shared with them
+    """
+    global _pool, _shared
+    pool, shared = _pool[0], _shared
+    _pool = (None, 0)
+    _shared = None
+    if pool is not None:
+        pool.shutdown()
+    if shared is not None:
+        shared.remove()
@@ -0,0 +1,314 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from lux.utils.sketch_utils import HyperLogLog
+
+# Number of rows probed to guess whether a column has more distinct values than the sketch threshold
+PROBE_SIZE = 10000
+
+
+def profile_columns(
+    df: pd.DataFrame, columns: List[int] = None, sketch_threshold: int = None, workers: int = 1
+) -> Dict[Any, dict]:
+    """
+    Compute the per-column statistics used by Lux metadata (unique values, cardinality,
+    min/max, null counts and dtype facts) in a single batched pass.
+
+    Numeric columns are profiled directly on the dataframe's underlying 2D NumPy blocks,
+    so that null counts and min/max are computed with a single vectorized reduction per
+    block, instead of one Series construction and several scans per column.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe to profile
+    columns : List[int], optional
+        Positions of the columns to profile, by default all columns
+    sketch_threshold : int, optional
+        Columns with more distinct values than this threshold get an approximate cardinality
+        from a HyperLogLog sketch instead of a list of unique values, by default None (always exact)
+    workers : int, optional
+        Number of threads profiling the columns concurrently, by default 1
+
+    Returns
+    -------
+    profiles: Dict[Any, dict]
+        Mapping from column name to a dictionary with keys
+        `unique`, `cardinality`, `sketch`, `min_max`, `null_count`, `count` and `dtype`.
+        `unique` is None and `sketch` is a HyperLogLog for columns above the sketch threshold.
+    """
+    import lux.core
+
+    if columns is None:
+        columns = range(len(df.columns))
+    selected = set(columns)
+    # Operate on a plain pandas view to avoid propagating Lux metadata on every column access
+    pdf = lux.core.originalDF(df, copy=False)
+    n_rows = len(pdf)
+
+    # Profile of each column, as a function computing the per-column part of it
+    jobs = {}
+    for block in pdf._mgr.blocks:
+        values = block.values
+        locs = block.mgr_locs.as_array
+        if not (isinstance(values, np.ndarray) and values.ndim == 2 and values.dtype.kind in "iuf"):
+            for loc in locs:
+                if loc in selected:
+                    jobs[loc] = partial(_profile_series, pdf.iloc[:, loc], sketch_threshold)
+            continue
+        rows = [row for row, loc in enumerate(locs) if loc in selected]
+        if len(rows) == 0:
+            continue
+        if len(rows) != len(locs):
+            values = values[rows]
+        # Each row of a block holds one column, so reductions over axis=1 profile every column at once
+        if n_rows == 0:
+            null_counts = np.zeros(len(rows), dtype=np.int64)
+            mins = maxs = np.full(len(rows), np.nan)
+        elif values.dtype.kind == "f":
+            null_counts = np.isnan(values).sum(axis=1)
+            # fmin/fmax ignore NaN, and return NaN for all-NaN columns just like Series.min/max
+            mins = np.fmin.reduce(values, axis=1)
+            maxs = np.fmax.reduce(values, axis=1)
+        else:
+            null_counts = np.zeros(len(rows), dtype=np.int64)
+            mins = values.min(axis=1)
+            maxs = values.max(axis=1)
+        for j, row in enumerate(rows):
+            profile = {
+                "min_max": (mins[j], maxs[j]),
+                "null_count": int(null_counts[j]),
+                "count": n_rows - int(null_counts[j]),
+                "dtype": values.dtype,
+            }
+            jobs[locs[row]] = partial(_profile_array, values[j], profile, sketch_threshold)
+
+    # Unique values are computed per column, and in parallel when there are several workers.
+    # Profiles are reported in column order regardless of how the columns were grouped into blocks.
+    profiles = parallel_map(lambda loc: jobs[loc](), list(columns), workers)
+    return {pdf.columns[i]: profile for i, profile in zip(columns, profiles)}
+
+
+def _profile_array(values: np.ndarray, profile: dict, sketch_threshold: int = None) -> dict:
+    unique, cardinality, sketch = unique_or_sketch(values, sketch_threshold)
+    return {"unique": unique, "cardinality": cardinality, "sketch": sketch, **profile}
+
+
+def _profile_series(series: pd.Series, sketch_threshold: int = None) -> dict:
+    dtype = series.dtype
+    unique, cardinality, sketch = unique_or_sketch(series, sketch_threshold)
+    # Only scan the full column for nulls when a null value shows up among the uniques
+    if unique is None or pd.isna(unique).any():
+        null_count = int(series.isna().sum())
+    else:
+        null_count = 0
+    if pd.api.types.is_float_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        min_max = (series.min(), series.max())
+    else:
+        min_max = None
+    return {
+        "unique": unique,
+        "cardinality": cardinality,
+        "sketch": sketch,
+        "min_max": min_max,
+        "null_count": null_count,
+        "count": len(series) - null_count,
+        "dtype": dtype,
+    }
+
+
+def parallel_map(func: Callable, items: List, workers: int = 1) -> List:
+    """
+    Apply a function to every item, on a pool of threads if there is more than one worker.
+    Results are returned in the order of the items, so that they do not depend on the number of workers.
+
+    Parameters
+    ----------
+    func : Callable
+        Function to apply, mostly running NumPy/pandas code that releases the GIL
+    items : List
+        Items to apply the function to
+    workers : int, optional
+        Number of threads, by default 1 (run in the calling thread)
+
+    Returns
+    -------
+    List
+        Results of the function for every item
+    """
+    if workers is None or workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        return list(pool.map(func, items))
+
+
+class FrameSnapshot:
+    """
+    Read-only stand-in for a LuxDataFrame holding plain pandas columns and the metadata computed so far,
+    taken in the calling thread before columns are typed in parallel (see parallel_map).
+    Reading a column of a LuxDataFrame propagates, and may lazily create, its metadata, so workers
+    only read the snapshot and never touch the LuxDataFrame itself.
+    Supports the reads made by type inference: `len`, column access by name, `dtypes` and the metadata attributes.
+    """
+
+    def __init__(self, ldf, attributes: List):
+        import lux.core
+
+        pdf = lux.core.originalDF(ldf, copy=False)
+        self._columns = {attr: pdf[attr] for attr in attributes}
+        self._length = len(pdf)
+        self.dtypes = pdf.dtypes
+        self.cardinality = ldf.cardinality
+        self.unique_values = ldf.unique_values
+        self.pre_aggregated = ldf.pre_aggregated
+        self._min_max = ldf._min_max
+        self._column_stats = ldf._column_stats
+        self._type_override = ldf._type_override
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, attr) -> pd.Series:
+        return self._columns[attr]
+
+
+def unique_or_sketch(values, sketch_threshold: int = None) -> Tuple[Any, int, HyperLogLog]:
+    """
+    Compute the unique values of a column, or a HyperLogLog sketch of its distinct values
+    if it has more than `sketch_threshold` of them.
+
+    Parameters
+    ----------
+    values : np.ndarray or pd.Series
+        Values of the column
+    sketch_threshold : int, optional
+        Distinct-count threshold above which the column is sketched, by default None (always exact)
+
+    Returns
+    -------
+    unique, cardinality, sketch
+        Either the unique values, their number and None;
+        or None, the estimated number of distinct values and the sketch
+    """
+    if sketch_threshold is None or len(values) <= sketch_threshold:
+        unique = pd.unique(values)
+        return unique, len(unique), None
+    # Probe a strided sample first, so that columns with few distinct values are only hashed once
+    step = max(len(values) // PROBE_SIZE, 1)
+    probe = values[::step]
+    if len(pd.unique(probe)) < 0.5 * len(probe):
+        unique = pd.unique(values)
+        if len(unique) <= sketch_threshold:
+            return unique, len(unique), None
+        # Sketching the unique values yields the same sketch as sketching the full column
+        return None, len(unique), HyperLogLog().update(unique)
+    sketch = HyperLogLog().update(values)
+    cardinality = min(sketch.count(), len(values))
+    if cardinality <= sketch_threshold:
+        unique = pd.unique(values)
+        return unique, len(unique), None
+    return None, cardinality, sketch
+
+
+class UniqueValues(Sequence):
+    """
+    Read-only, list-like view of the unique values of a column.
+
+    The values are kept in the typed array returned by `pd.unique` instead of a list of Python objects,
+    and membership tests go through a hash table (a pandas Index) built on first use,
+    so that `value in unique_values` is O(1) instead of a linear scan.
+    Indexing, iteration, `len` and comparisons with lists behave like the list of values.
+    """
+
+    def __init__(self, values):
+        if isinstance(values, UniqueValues):
+            self._values, self._index = values._values, values._index
+        elif isinstance(values, pd.Index):
+            self._values, self._index = values._values, values
+        else:
+            self._values, self._index = values, None
+
+    @property
+    def values(self):
+        """
+        The unique values as a NumPy array (read-only) or an ExtensionArray, without copying them
+        """
+        values = self._values
+        if isinstance(values, np.ndarray):
+            values = values.view()
+            values.flags.writeable = False
+        return values
+
+    @property
+    def index(self) -> pd.Index:
+        """
+        Hashed lookup table of the unique values, built on first use
+        """
+        if self._index is None:
+            self._index = pd.Index(self._values, tupleize_cols=False)
+        return self._index
+
+    def __contains__(self, value) -> bool:
+        try:
+            return value in self.index
+        except TypeError:
+            # Unhashable values cannot be in the hash table
+            return False
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return list(self._values[key])
+        return self._values[key]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __array__(self, dtype=None):
+        return np.asarray(self._values, dtype=dtype)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (UniqueValues, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __add__(self, other) -> list:
+        return list(self) + list(other)
+
+    def __mul__(self, n: int) -> list:
+        return list(self) * n
+
+    __rmul__ = __mul__
+
+    def __getstate__(self):
+        # The lookup table is cheap to rebuild, so it is not persisted
+        return {"_values": self._values}
+
+    def __setstate__(self, state):
+        self._values, self._index = state["_values"], None
+
+    def __repr__(self) -> str:
+        return repr(list(self))
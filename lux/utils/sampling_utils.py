@@ -0,0 +1,441 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import copy
+import hashlib
+import weakref
+from statistics import NormalDist
+from typing import Callable, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import lux
+
+# Column of a stratified sample holding the weight (inverse inclusion probability) of each row
+SAMPLE_WEIGHT = "_lux_sample_weight"
+
+# Aggregations of a weighted sample estimated from its weights, by name of the aggregation or of the function
+WEIGHTED_AGGREGATIONS = {
+    "count": "count",
+    "sum": "sum",
+    "mean": "mean",
+    "size": "size",
+    "len": "size",
+    "nansum": "sum",
+    "nanmean": "mean",
+}
+
+# Nominal attributes with at most this many categories are used as strata
+STRATA_MAX_CARDINALITY = 100
+
+# Number of rows of the first sample of progressive aggregation, and growth factor of the next samples
+PROGRESSIVE_START = 10000
+PROGRESSIVE_GROWTH = 10
+# Difference to the k-th best interestingness score, relative to the best score, under which vis are tied
+PROGRESSIVE_TIE_TOLERANCE = 0.1
+
+
+class SampleView:
+    """
+    Sample of the rows of a dataframe, kept as a sorted array of row positions instead of a copy of the rows.
+    Only the columns needed by a vis are gathered from the dataframe (see `take`),
+    so that sampling a wide dataframe does not duplicate all of its columns in memory.
+    """
+
+    def __init__(self, df, positions: np.ndarray = None, weights: np.ndarray = None):
+        # The sample is stored on the dataframe itself, so it only keeps a weak reference to it
+        self._df = weakref.ref(df)
+        self.positions = positions
+        self.weights = weights
+        self._key = None
+
+    @property
+    def df(self):
+        """
+        Sampled dataframe
+        """
+        return self._df()
+
+    @property
+    def key(self):
+        """
+        Digest identifying the sampled rows and their weights, or None if all rows are sampled without weights
+        """
+        if self._key is None and (self.positions is not None or self.weights is not None):
+            digest = hashlib.blake2b(digest_size=16)
+            for array in (self.positions, self.weights):
+                digest.update(b"" if array is None else np.ascontiguousarray(array).view(np.uint8))
+                digest.update(b"|")
+            self._key = digest.digest()
+        return self._key
+
+    def __len__(self) -> int:
+        return len(self.df) if self.positions is None else len(self.positions)
+
+    def take(self, columns: List = None):
+        """
+        Gather the sampled rows of the given columns, along with the SAMPLE_WEIGHT column of a weighted sample
+
+        Parameters
+        ----------
+        columns : List, optional
+            Columns to gather, by default all columns. Names that are not columns of the dataframe are ignored.
+
+        Returns
+        -------
+        LuxDataFrame
+            Sampled rows, carrying the metadata of the dataframe, or the dataframe itself if all rows are sampled
+        """
+        import lux.core
+        from lux.core.frame import LuxDataFrame
+
+        df = self.df
+        if self.positions is None and self.weights is None:
+            return df
+        pdf = lux.core.originalDF(df, copy=False)
+        if columns is None:
+            columns = list(pdf.columns)
+        else:
+            columns = [column for column in dict.fromkeys(columns) if column in pdf.columns]
+        positions = self.positions if self.positions is not None else np.arange(len(pdf))
+        if pdf.columns.is_unique:
+            data = {column: pdf[column]._values.take(positions) for column in columns}
+            if self.weights is not None:
+                data[SAMPLE_WEIGHT] = self.weights
+                columns = columns + [SAMPLE_WEIGHT]
+            sample = LuxDataFrame(data, index=pdf.index.take(positions), columns=columns)
+        else:
+            sample = df.iloc[positions][columns]
+            if self.weights is not None:
+                sample[SAMPLE_WEIGHT] = self.weights
+        return sample.__finalize__(df)
+
+    def sample(self, n: int, random_state: int = 1) -> "SampleView":
+        """
+        Uniform sample of n rows of this sample
+        """
+        rng = np.random.default_rng(random_state)
+        return self.subset(np.sort(rng.choice(len(self), size=min(n, len(self)), replace=False)))
+
+    def subset(self, indices: np.ndarray) -> "SampleView":
+        """
+        Sample made of the rows at the given (sorted) positions within this sample
+        """
+        positions = indices if self.positions is None else self.positions[indices]
+        weights = None if self.weights is None else self.weights[indices]
+        return SampleView(self.df, positions, weights)
+
+    def where(self, mask: np.ndarray) -> "SampleView":
+        """
+        Sample made of the rows of this sample satisfying a boolean mask over all the rows of the dataframe
+        """
+        if self.positions is None:
+            return self.subset(np.flatnonzero(mask))
+        return self.subset(np.flatnonzero(mask[self.positions]))
+
+    def __getstate__(self):
+        # Weak references cannot be pickled, and a sample is redrawn for an unpickled dataframe anyway
+        return {"positions": self.positions, "weights": self.weights}
+
+    def __setstate__(self, state):
+        self._df = lambda: None
+        self.positions, self.weights = state["positions"], state["weights"]
+        self._key = None
+
+
+class ReservoirSample:
+    """
+    Priority (bottom-k) sample of the rows of a dataframe, maintained incrementally as rows are appended.
+
+    Every row is given a random priority, and samples are made of the rows with the smallest priorities.
+    Only the `capacity` rows with the smallest priorities are retained, so that appending rows costs time
+    proportional to the number of new rows, and a uniform sample without replacement of any size up to
+    `capacity` can be drawn at any time.
+    """
+
+    def __init__(self, capacity: int, random_state: int = 1):
+        self.capacity = capacity
+        self.n_rows = 0
+        self.positions = np.empty(0, dtype=np.int64)
+        self.priorities = np.empty(0)
+        self._rng = np.random.default_rng(random_state)
+
+    def append(self, n_new: int) -> "ReservoirSample":
+        """
+        Account for rows appended at the end of the dataframe
+
+        Parameters
+        ----------
+        n_new : int
+            Number of appended rows
+
+        Returns
+        -------
+        ReservoirSample
+            The updated sample
+        """
+        positions = np.concatenate([self.positions, np.arange(self.n_rows, self.n_rows + n_new)])
+        priorities = np.concatenate([self.priorities, self._rng.random(n_new)])
+        if len(priorities) > self.capacity:
+            keep = np.argpartition(priorities, self.capacity - 1)[: self.capacity]
+            positions, priorities = positions[keep], priorities[keep]
+        self.positions, self.priorities = positions, priorities
+        self.n_rows += n_new
+        return self
+
+    def sample(self, n: int) -> np.ndarray:
+        """
+        Positions of a uniform sample of n rows (at most `capacity`), in increasing order
+        """
+        positions = self.positions
+        if n < len(positions):
+            positions = positions[np.argpartition(self.priorities, n - 1)[:n]]
+        return np.sort(positions)
+
+    def copy(self) -> "ReservoirSample":
+        return copy.deepcopy(self)
+
+
+def reservoir_sample(df, n: int):
+    """
+    Uniform sample of n rows of the dataframe, drawn from the reservoir sample attached to it.
+    The reservoir is extended with the rows appended since it was last used,
+    and only rebuilt if it is missing (e.g., after rows were reordered or removed) or too small.
+
+    Parameters
+    ----------
+    df : LuxDataFrame
+        Dataframe to sample
+    n : int
+        Number of rows to sample
+
+    Returns
+    -------
+    SampleView
+        Sampled rows
+    """
+    reservoir = df._reservoir
+    if reservoir is None or reservoir.n_rows > len(df) or reservoir.capacity < n:
+        reservoir = ReservoirSample(max(n, lux.config.sampling_cap))
+    if reservoir.n_rows < len(df):
+        reservoir.append(len(df) - reservoir.n_rows)
+    df._reservoir = reservoir
+    return SampleView(df, reservoir.sample(n))
+
+
+def stratified_sample(
+    df: pd.DataFrame, frac: float, strata: List, min_count: int, random_state: int = 1
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sample rows so that every category of the strata attributes keeps at least `min_count` rows
+    (in expectation, and all rows of categories with fewer rows than that).
+
+    Each row is kept independently with probability `frac`, raised for the rows of rare categories
+    to `min_count / (number of rows of the category)`. Weighting each sampled row by the inverse of
+    its probability gives unbiased estimates of counts and sums over the whole dataframe.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe to sample
+    frac : float
+        Probability of sampling a row of a common category
+    strata : List
+        Attributes whose categories should all be represented in the sample
+    min_count : int
+        Minimum number of rows to sample for every category
+    random_state : int, optional
+        Seed of the random number generator, by default 1
+
+    Returns
+    -------
+    positions, weights
+        Positions of the sampled rows, and the weight of each sampled row
+    """
+    probability = np.full(len(df), min(frac, 1.0))
+    for attr in strata:
+        codes, uniques = pd.factorize(df[attr])
+        # Missing values form their own category
+        codes[codes < 0] = len(uniques)
+        category_sizes = np.bincount(codes, minlength=len(uniques) + 1)
+        with np.errstate(divide="ignore"):
+            category_probability = np.minimum(min_count / category_sizes, 1.0)
+        np.maximum(probability, category_probability[codes], out=probability)
+    rng = np.random.default_rng(random_state)
+    positions = np.flatnonzero(rng.random(len(df)) < probability)
+    return positions, 1.0 / probability[positions]
+
+
+def weighted_aggregate(
+    df: pd.DataFrame, by: List, measure: str, agg_func: Union[str, Callable]
+) -> pd.DataFrame:
+    """
+    Aggregate a measure per group of a weighted sample, rescaling counts and sums by the sample weights
+    so that they estimate the aggregates over the whole dataframe (see WEIGHTED_AGGREGATIONS).
+    Aggregations that do not depend on the number of rows (e.g., min and max) are computed as is.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Weighted sample, with a `SAMPLE_WEIGHT` column
+    by : List
+        Attributes to group by
+    measure : str
+        Attribute to aggregate, or "Record" to count the rows
+    agg_func : str or Callable
+        Aggregation function
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per group, with the `by` attributes followed by the aggregated measure
+    """
+    import lux.core
+
+    df = lux.core.originalDF(df, copy=False)
+    weights = df[SAMPLE_WEIGHT]
+    # Functions such as np.sum or len are weighted as the aggregation of the same name
+    agg_name = WEIGHTED_AGGREGATIONS.get(getattr(agg_func, "__name__", agg_func))
+    if measure == "Record":
+        result = weights.groupby([df[attr] for attr in by], dropna=False).sum()
+    elif agg_name is not None:
+        values = df[measure]
+        weighted = pd.DataFrame(
+            {
+                "size": weights,
+                "count": weights.where(values.notna(), 0),
+                "sum": (values * weights).fillna(0),
+            }
+        )
+        grouped = weighted.groupby([df[attr] for attr in by], dropna=False).sum()
+        if agg_name == "mean":
+            result = grouped["sum"] / grouped["count"]
+        else:
+            result = grouped[agg_name]
+    else:
+        result = df.groupby(by, dropna=False)[measure].agg(agg_func)
+    return result.rename(measure).reset_index()
+
+
+def progressive_sizes(
+    n_rows: int, start: int = PROGRESSIVE_START, growth: int = PROGRESSIVE_GROWTH
+) -> List[int]:
+    """
+    Geometrically growing sample sizes for progressive aggregation, ending with all rows
+
+    Examples
+    --------
+    >>> progressive_sizes(2500000)
+    [10000, 100000, 1000000, 2500000]
+    """
+    sizes = []
+    size = start
+    while size < n_rows:
+        sizes.append(size)
+        size *= growth
+    sizes.append(n_rows)
+    return sizes
+
+
+def top_k_stable(
+    previous_scores: List[float], scores: List[float], k: int, tolerance: float = None
+) -> bool:
+    """
+    Whether the same items rank in the top k by score on two successive samples.
+    Items whose score differs from the k-th best score by less than `tolerance` times the best score
+    are tied with it, so that items with scores at the level of the sampling noise
+    swapping in or out of the top k does not count as a change.
+
+    Parameters
+    ----------
+    previous_scores : List[float]
+        Scores of the items on the previous sample, or None for the first sample
+    scores : List[float]
+        Scores of the same items on the current sample
+    k : int
+        Number of top items
+    tolerance : float, optional
+        Tolerance of ties, relative to the best score, by default PROGRESSIVE_TIE_TOLERANCE
+
+    Returns
+    -------
+    bool
+        Whether the top k is stable
+    """
+    if previous_scores is None:
+        return False
+    if tolerance is None:
+        tolerance = PROGRESSIVE_TIE_TOLERANCE
+    scores = np.asarray(scores, dtype=float)
+    previous_scores = np.asarray(previous_scores, dtype=float)
+    k = min(k, len(scores))
+    top = set(np.argsort(-scores, kind="stable")[:k])
+    previous_top = set(np.argsort(-previous_scores, kind="stable")[:k])
+    ranked = np.sort(scores)[::-1]
+    threshold = ranked[k - 1]
+    return all(abs(scores[i] - threshold) <= tolerance * abs(ranked[0]) for i in top ^ previous_top)
+
+
+def aggregate_error_bounds(
+    df: pd.DataFrame, by: List, measure: str, agg_func: str, confidence: float = 0.95
+) -> pd.DataFrame:
+    """
+    Half-width of the confidence interval of a measure aggregated per group of a uniform sample,
+    i.e., how far the aggregate over the sample may be from the aggregate over the rows it was drawn from
+    (rescaled to the size of the sample).
+
+    Intervals follow the normal approximation: the number of rows of a group is binomial,
+    averages have a standard error of std / sqrt(count), and sums are sums of independent draws.
+    Aggregations other than counts, sums and averages (e.g., min and max) get no interval (NaN).
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Uniform sample
+    by : List
+        Attributes to group by
+    measure : str
+        Aggregated attribute, or "Record" for the number of rows
+    agg_func : str
+        Name of the aggregation function
+    confidence : float, optional
+        Confidence level of the intervals, by default 0.95
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per group, with the `by` attributes followed by the half-width of the interval of the measure
+    """
+    import lux.core
+
+    df = lux.core.originalDF(df, copy=False)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    n = len(df)
+    keys = [df[attr] for attr in by]
+    if measure == "Record" or agg_func == "count":
+        present = pd.Series(1, index=df.index) if measure == "Record" else df[measure].notna()
+        counts = present.groupby(keys, dropna=False).sum()
+        half_width = z * np.sqrt(counts * (1 - counts / n))
+    elif agg_func in ["mean", "sum"]:
+        values = df[measure]
+        grouped = values.groupby(keys, dropna=False)
+        if agg_func == "mean":
+            half_width = z * grouped.std() / np.sqrt(grouped.count())
+        else:
+            # Variance of the contribution of a random row to the sum of the group (zero outside of the group)
+            variance = (values**2).groupby(keys, dropna=False).sum() / n - (grouped.sum() / n) ** 2
+            half_width = z * np.sqrt(n * variance.clip(lower=0))
+    else:
+        half_width = df[by[0]].groupby(keys, dropna=False).size() * np.nan
+    return half_width.rename(measure).reset_index()
@@ -0,0 +1,127 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import numpy as np
+import pandas as pd
+from pandas.core.generic import NDFrame
+
+
+class HyperLogLog:
+    """
+    HyperLogLog sketch for estimating the number of distinct values of a column
+    in a fixed amount of memory (2^precision bytes).
+
+    Sketches built with the same precision are mergeable: the sketch of several chunks
+    of a column, merged together, is identical to the sketch of the whole column.
+    """
+
+    def __init__(self, precision: int = 16):
+        if not 4 <= precision <= 18:
+            raise ValueError("The precision of a HyperLogLog sketch must be between 4 and 18.")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @staticmethod
+    def hash_values(values) -> np.ndarray:
+        """
+        Hash an array-like of values into 64-bit integers.
+        Values that compare equal (including all NaN-like values) get the same hash.
+        """
+        # pd.Series may be overridden by Lux, so check against NDFrame to also catch plain pandas Series
+        if isinstance(values, (NDFrame, pd.Index)):
+            values = values._values
+        return pd.util.hash_array(values, categorize=False)
+
+    def update(self, values) -> "HyperLogLog":
+        """
+        Add an array-like of values to the sketch
+
+        Parameters
+        ----------
+        values : array-like
+            Values to add, e.g., a NumPy array or a pandas Series
+
+        Returns
+        -------
+        HyperLogLog
+            The updated sketch
+        """
+        if len(values) == 0:
+            return self
+        return self.update_hashes(HyperLogLog.hash_values(values))
+
+    def update_hashes(self, hashes: np.ndarray) -> "HyperLogLog":
+        """
+        Add values that were already hashed with `HyperLogLog.hash_values` to the sketch
+        """
+        p = self.precision
+        q = 64 - p
+        # The first p bits select the register, the rank is the position of the first 1-bit in the rest
+        index = (hashes >> np.uint64(q)).astype(np.intp)
+        rest = hashes & np.uint64((1 << q) - 1)
+        # Position of the highest set bit, float log2 can round up for values just below a power of two
+        bit_length = np.zeros(len(rest), dtype=np.int64)
+        nonzero = rest > 0
+        exponent = np.floor(np.log2(rest[nonzero].astype(np.float64))).astype(np.int64)
+        exponent -= (rest[nonzero] >> exponent.astype(np.uint64)) == 0
+        bit_length[nonzero] = exponent + 1
+        rank = (q - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        Merge another sketch into this one, so that it counts the distinct values of both
+
+        Parameters
+        ----------
+        other : HyperLogLog
+            Sketch built with the same precision
+
+        Returns
+        -------
+        HyperLogLog
+            The merged sketch
+        """
+        if other.precision != self.precision:
+            raise ValueError("Only HyperLogLog sketches with the same precision can be merged.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def copy(self) -> "HyperLogLog":
+        sketch = HyperLogLog(self.precision)
+        sketch.registers = self.registers.copy()
+        return sketch
+
+    def count(self) -> int:
+        """
+        Estimate the number of distinct values added to the sketch
+        """
+        m = len(self.registers)
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros > 0:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __repr__(self) -> str:
+        return f"<HyperLogLog precision={self.precision}, count~{self.count()}>"
@@ -8,6 +8,8 @@ import os
 
 
 class LuxTracer:
+    tracing = False
+
     def profile_func(self, frame, event, arg):
         # Profile functions should have three arguments: frame, event, and arg.
         # frame is the current stack frame.
@@ -58,11 +60,13 @@ class LuxTracer:
         # print ("-----------start_tracing-----------")
         # Implement python source debugger: https://docs.python.org/3/library/sys.html#sys.settrace
         # setprofile faster than settrace (only go through I/O)
+        self.tracing = True
         sys.settrace(self.profile_func)
 
     def stop_tracing(self):
         # print ("-----------stop_tracing-----------")
         sys.settrace(None)
+        self.tracing = False
 
     def process_executor_code(self, executor_lines):
         selected = {}
@@ -106,6 +110,8 @@ class LuxTracer:
                     "execute_aggregate",
                     "execute_binning",
                     "execute_2D_binning",
+                    "_vis_cache_key",
+                    "_expire_stale_samples",
                 ]  # Lux-specific keywords to ignore
                 whitelist = ['if clause.attribute != "Record":', "bin_attribute ="]
                 ignore = ignore_construct + ignore_lux_keyword
@@ -130,12 +136,12 @@ class LuxTracer:
                                 selected[clean_code_line.lstrip()] = index
                         index += 1
 
-        curr_executor = lux.config.executor.name
-        if curr_executor != "PandasExecutor":
+        dataframe_executor = lux.utils.utils.is_dataframe_executor()
+        if not dataframe_executor:
             import_code = "from lux.utils import utils\nfrom lux.executor.SQLExecutor import SQLExecutor\nimport pandas\nimport math\n"
             var_init_code = "tbl = 'insert your LuxSQLTable variable here'\nview = 'insert the name of your Vis object here'\n"
         else:
-            import_code = "from lux.utils import utils\nfrom lux.executor.PandasExecutor import PandasExecutor\nimport pandas\nimport math\n"
+            import_code = "from lux.utils import utils\nfrom lux.utils.sampling_utils import SampleView, reservoir_sample\nfrom lux.executor.PandasExecutor import PandasExecutor\nimport pandas\nimport numpy as np\nimport math\n"
             var_init_code = "ldf = 'insert your LuxDataFrame variable here'\nvis = 'insert the name of your Vis object here'\nvis._vis_data = ldf\n"
         function_code += "\t" + import_code
 
@@ -167,7 +173,7 @@ class LuxTracer:
             function_code += line
             prev_line = line
 
-        if curr_executor != "PandasExecutor":
+        if not dataframe_executor:
             output += "def create_chart_data(tbl, view):\n"
             function_code += "\nreturn view._vis_data"
         else:
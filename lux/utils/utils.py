@@ -11,6 +11,7 @@
 #  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import lux
@@ -58,6 +59,16 @@ def check_import_lux_widget():
         )
 
 
+def is_dataframe_executor():
+    """
+    Whether the executor of lux.config processes dataframes, with pandas or DuckDB,
+    rather than the tables of a SQL database
+    """
+    from lux.executor.PandasExecutor import PandasExecutor
+
+    return isinstance(lux.config.executor, PandasExecutor)
+
+
 def get_agg_title(clause):
     attr = str(clause.attribute)
     if clause.aggregation is None:
@@ -78,36 +89,74 @@ def check_if_id_like(df, attribute):
     # Strong signals
     # so that aggregated reset_index fields don't get misclassified
     high_cardinality = df.cardinality[attribute] > 500
+    if not high_cardinality:
+        # ID-like attributes always have a high cardinality, so skip the checks that scan the data
+        return False
     attribute_contain_id = re.search(r"id|ID|iD|Id", str(attribute)) is not None
     almost_all_vals_unique = df.cardinality[attribute] >= 0.98 * len(df)
-    is_string = pd.api.types.is_string_dtype(df[attribute])
+    is_string = pd.api.types.is_string_dtype(df.dtypes[attribute])
     if is_string:
+        if not (attribute_contain_id or almost_all_vals_unique):
+            return False
         # For string IDs, usually serial numbers or codes with alphanumerics have a consistent length (eg., CG-39405) with little deviation. For a high cardinality string field but not ID field (like Name or Brand), there is less uniformity across the string lengths.
         if len(df) > 50:
-            if lux.config.executor.name == "PandasExecutor":
+            if is_dataframe_executor():
                 sampled = df[attribute].sample(50, random_state=99)
             else:
                 from lux.executor.SQLExecutor import SQLExecutor
 
                 sampled = SQLExecutor.execute_preview(df, preview_size=50)
+                if isinstance(sampled, pd.DataFrame) and attribute in sampled.columns:
+                    sampled = sampled[attribute]
         else:
             sampled = df[attribute]
-        str_length_uniformity = sampled.apply(lambda x: type(x) == str and len(x)).std() < 3
-        return (
-            high_cardinality
-            and (attribute_contain_id or almost_all_vals_unique)
-            and str_length_uniformity
-        )
+        str_lengths = np.array([len(x) if type(x) == str else 0 for x in np.asarray(sampled).ravel()])
+        with np.errstate(all="ignore"):
+            return len(str_lengths) > 1 and str_lengths.std(ddof=1) < 3
     else:
-        if len(df) >= 2:
-            series = df[attribute]
-            diff = series.diff()
-            evenly_spaced = all(diff.iloc[1:] == diff.iloc[1])
-        else:
-            evenly_spaced = True
         if attribute_contain_id:
             almost_all_vals_unique = df.cardinality[attribute] >= 0.75 * len(df)
-        return high_cardinality and (almost_all_vals_unique or evenly_spaced)
+        return almost_all_vals_unique or is_evenly_spaced(df, attribute)
+
+
+def is_evenly_spaced(df, attribute) -> bool:
+    """
+    Check whether the values of a numeric attribute are evenly spaced (e.g., 1, 2, 3, ...),
+    using the metadata to rule out most attributes without scanning the data.
+    """
+    if len(df) < 2:
+        return True
+    column_stats = getattr(df, "_column_stats", None) or {}
+    if is_dataframe_executor() and attribute in column_stats:
+        # Evenly spaced values with a non-zero step are all distinct, so an exact cardinality
+        # below the number of rows rules the attribute out
+        if column_stats[attribute]["sketch"] is None and df.cardinality[attribute] < len(df):
+            return False
+    values = np.asarray(df[attribute])
+    if len(values) < 2:
+        return True
+    if values.dtype.kind not in "iuf":
+        diff = pd.Series(values).diff()
+        return bool((diff.iloc[1:] == diff.iloc[1]).all())
+    step = values[1] - values[0]
+    min_max = (getattr(df, "_min_max", None) or {}).get(attribute)
+    if values.dtype.kind in "iu" and min_max is not None:
+        # The range of evenly spaced integers is determined by their first step
+        if min_max[1] - min_max[0] != abs(step) * (len(values) - 1):
+            return False
+    return bool(np.all(np.diff(values) == step))
+
+
+def get_unique_values(df, attribute):
+    """
+    Unique values of an attribute. They are read from the metadata when available, and computed
+    from the data for high-cardinality attributes whose unique values are only sketched.
+    """
+    from lux.utils.profile_utils import UniqueValues
+
+    if df.unique_values and attribute in df.unique_values:
+        return df.unique_values[attribute]
+    return UniqueValues(pd.unique(df[attribute]))
 
 
 def check_if_id_like_for_sql(df, attribute):
@@ -137,8 +186,35 @@ def matplotlib_setup(w, h):
     return fig, ax
 
 
+def type_inference_sample(series, size=1000):
+    """
+    Deterministic sample of the non-null values of a series, evenly spaced across its rows,
+    so that type inference checks can be run on a bounded number of values first.
+
+    Returns
+    -------
+    pd.Series or None
+        The sample, or None if the series has no more than `size` rows or the sample is all null,
+        in which case the series should be checked in full
+    """
+    if len(series) <= size:
+        return None
+    positions = np.linspace(0, len(series) - 1, size).astype(np.int64)
+    sample = series.iloc[positions].dropna()
+    if len(sample) == 0:
+        return None
+    return sample
+
+
 def is_numeric_nan_column(series):
     if series.dtype == object:
+        sample = type_inference_sample(series)
+        if sample is not None:
+            # Values of the sample that cannot be cast rule out a numeric column without casting all of it
+            try:
+                sample.astype("float")
+            except Exception as e:
+                return False, series
         if series.hasnans:
             series = series.dropna()
         try:
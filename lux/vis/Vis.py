@@ -37,6 +37,9 @@ class Vis:
         self.score = score
         self._all_column = False
         self.approx = False
+        self._error_bounds = None
+        # Data of the vis and its score, when scored along with its execution (see PandasExecutor.execute_parallel)
+        self._precomputed_score = None
         self.refresh_source(self._source)
 
     def __repr__(self):
@@ -81,6 +84,15 @@ class Vis:
     def data(self):
         return self._vis_data
 
+    @property
+    def error_bounds(self):
+        """
+        Half-widths of the 95% confidence intervals of the aggregated values of a vis computed progressively
+        on a sample (see lux.config.progressive_aggregation), aligned with the rows of its data,
+        or None if its data is exact.
+        """
+        return self._error_bounds
+
     @property
     def code(self):
         return self._code
@@ -239,7 +251,7 @@ class Vis:
         renderer = AltairRenderer(output_type="Altair")
         self._code = renderer.create_vis(self, standalone)
 
-        if lux.config.executor.name == "PandasExecutor":
+        if lux.utils.utils.is_dataframe_executor():
             function_code = "def plot_data(source_df, vis):\n"
             function_code += "\timport altair as alt\n"
             function_code += "\tvisData = create_chart_data(source_df, vis)\n"
@@ -395,6 +407,7 @@ class Vis:
             Validator.validate_intent(self._inferred_intent, ldf)
 
             Compiler.compile_vis(ldf, self)
+            self._error_bounds = None
             lux.config.executor.execute([self], ldf)
 
     def check_not_vislist_intent(self):
@@ -54,8 +54,9 @@ class AltairRenderer:
             if vis.mark == "scatter" and vis._postbin:
                 vis._mark = "heatmap"
                 lux.config.executor.execute_2D_binning(vis)
-            else:
-                # Exactly recompute the selected vis (e.g., top k) to display
+            elif vis.error_bounds is None:
+                # Exactly recompute the selected vis (e.g., top k) to display,
+                # unless it was aggregated progressively and comes with confidence intervals
                 lux.config.executor.execute([vis], vis._original_df, approx=False)
         # If a column has a Period dtype, or contains Period objects, convert it back to Datetime
         if vis.data is not None:
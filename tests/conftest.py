@@ -2,6 +2,25 @@ import pytest
 import pandas as pd
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-benchmarks", action="store_true", default=False, help="run the tests marked as benchmarks"
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: timing benchmark, only run with --run-benchmarks")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmarks"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmark, run with --run-benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
 @pytest.fixture(scope="session")
 def global_var():
     url = "https://github.com/lux-org/lux-datasets/blob/master/data/olympic.csv?raw=true"
@@ -32,3 +51,48 @@ def global_var():
         "_type_override",
         "name",
     ]
+
+
+@pytest.fixture
+def restore_config():
+    """
+    Restore the sampling, execution and profiling settings of lux.config after the test, whatever it changed them to
+    """
+    from .context import lux
+
+    names = [
+        "sampling",
+        "sampling_cap",
+        "sampling_start",
+        "sampling_strategy",
+        "sampling_min_category_count",
+        "early_pruning",
+        "progressive_aggregation",
+        "aggregate_cache_size",
+        "execution_workers",
+        "metadata_workers",
+        "approx_cardinality_threshold",
+    ]
+    saved = {name: getattr(lux.config, name) for name in names}
+    yield lux.config
+    # The sampling start may not exceed the cap, so the bound that is lowered is restored first
+    if saved["sampling_cap"] < lux.config.sampling_start:
+        lux.config.sampling_start = saved.pop("sampling_start")
+    for name, value in saved.items():
+        setattr(lux.config, name, value)
+
+
+@pytest.fixture
+def process_pool(monkeypatch):
+    """
+    Execute even small VisLists on the process pool, then shut the pool down, remove the columns shared with it
+    and restore the number of execution workers
+    """
+    from .context import lux
+    from lux.utils import parallel_utils
+
+    monkeypatch.setattr(parallel_utils, "MIN_PARALLEL_WORK", 0)
+    workers = lux.config.execution_workers
+    yield parallel_utils
+    lux.config.execution_workers = workers
+    parallel_utils.shutdown()
@@ -248,6 +248,82 @@ def test_sampling_parameters_config():
     lux.config.sampling_start = 10000
 
 
+def test_sampling_strategy_config(restore_config):
+    from lux.vis.Vis import Vis
+
+    lux.config.sampling_start = 50
+    lux.config.sampling_cap = 100
+    lux.config.sampling_strategy = "stratified"
+    df = pd.read_csv("lux/data/car.csv")
+    counts = df["Cylinders"].value_counts()
+    vis = Vis(["Cylinders"], df)
+    # Rare categories are fully kept, and the counts of common ones are rescaled to the full dataframe
+    assert len(vis.data) == len(counts)
+    weighted_counts = dict(zip(vis.data["Cylinders"], vis.data["Record"]))
+    for cylinders in [3, 5]:
+        assert weighted_counts[cylinders] == counts[cylinders]
+    assert abs(sum(weighted_counts.values()) - len(df)) < 0.2 * len(df)
+    assert "_lux_sample_weight" not in vis.data.columns
+    assert len(df._sampled) < len(df)
+    with pytest.warns(UserWarning, match="must be either 'uniform' or 'stratified'"):
+        lux.config.sampling_strategy = "systematic"
+    assert lux.config.sampling_strategy == "stratified"
+
+
+def test_approx_cardinality_threshold_config(restore_config):
+    assert lux.config.approx_cardinality_threshold is None
+    lux.config.approx_cardinality_threshold = 100
+    df = pd.read_csv("lux/data/car.csv")
+    df.maintain_metadata()
+    assert "Name" not in df.unique_values
+    assert "Origin" in df.unique_values
+    assert df.cardinality["Name"] > 100
+    with pytest.warns(UserWarning, match="must be a positive integer or None"):
+        lux.config.approx_cardinality_threshold = "100"
+    assert lux.config.approx_cardinality_threshold == 100
+    lux.config.approx_cardinality_threshold = None
+    df = pd.read_csv("lux/data/car.csv")
+    df.maintain_metadata()
+    assert "Name" in df.unique_values
+
+
+def test_metadata_workers_config():
+    df = pd.read_csv("lux/data/car.csv")
+    df.maintain_metadata()
+    lux.config.metadata_workers = 4
+    parallel_df = pd.read_csv("lux/data/car.csv")
+    parallel_df.maintain_metadata()
+    assert parallel_df.data_type == df.data_type
+    assert parallel_df.cardinality == df.cardinality
+    assert list(parallel_df.unique_values) == list(df.unique_values)
+    with pytest.warns(UserWarning, match="must be a positive integer"):
+        lux.config.metadata_workers = 0
+    assert lux.config.metadata_workers == 4
+    lux.config.metadata_workers = 1
+
+
+def test_execution_workers_config(process_pool):
+    df = pd.read_csv("lux/data/car.csv")
+    df.maintain_recs()
+    serial_recs = {
+        action: [(str(vis), vis.score) for vis in df.recommendation[action]]
+        for action in df.recommendation
+    }
+    # Execute even the small VisLists of this dataframe on the pool
+    lux.config.execution_workers = 2
+    parallel_df = pd.read_csv("lux/data/car.csv")
+    parallel_df.maintain_recs()
+    parallel_recs = {
+        action: [(str(vis), vis.score) for vis in parallel_df.recommendation[action]]
+        for action in parallel_df.recommendation
+    }
+    assert process_pool._pool[0] is not None
+    assert parallel_recs == serial_recs
+    with pytest.warns(UserWarning, match="must be a positive integer"):
+        lux.config.execution_workers = 0
+    assert lux.config.execution_workers == 2
+
+
 def test_heatmap_flag_config():
     lux.config.heatmap = True
     df = pd.read_csv("https://raw.githubusercontent.com/lux-org/lux-datasets/master/data/airbnb_nyc.csv")
@@ -311,3 +387,25 @@ def test_sort(global_var):
 # 	vis_code = df.recommendation["Correlation"][0].to_altair()
 # 	print (vis_code)
 # 	assert 'chart = chart.configure_mark(color="green")' in vis_code, "Exported chart does not have additional plot style setting."
+
+
+def test_progressive_aggregation_config():
+    assert lux.config.progressive_aggregation == False
+    with pytest.warns(UserWarning, match="must be a boolean"):
+        lux.config.progressive_aggregation = "yes"
+    assert lux.config.progressive_aggregation == False
+    lux.config.progressive_aggregation = True
+    assert lux.config.progressive_aggregation == True
+    lux.config.progressive_aggregation = False
+
+
+def test_aggregate_cache_config():
+    assert lux.config.aggregate_cache_size == 64 * 1024 * 1024
+    with pytest.warns(UserWarning, match="must be a non-negative integer"):
+        lux.config.aggregate_cache_size = -1
+    assert lux.config.aggregate_cache_size == 64 * 1024 * 1024
+    assert lux.config.aggregate_cache is not None
+    lux.config.aggregate_cache_size = 0
+    assert lux.config.aggregate_cache is None
+    lux.config.aggregate_cache_size = 64 * 1024 * 1024
+    assert lux.config.aggregate_cache.max_size == 64 * 1024 * 1024
@@ -15,6 +15,7 @@
 from .context import lux
 import pytest
 import pandas as pd
+import numpy as np
 from lux.executor.PandasExecutor import PandasExecutor
 from lux.vis.Vis import Vis
 from lux.vis.VisList import VisList
@@ -187,6 +188,302 @@ def test_filter_aggregation_fillzero_aligned(global_var):
     assert result[result["Cylinders"] == 6]["MilesPerGal"].values[0] == externalValidation[6]
 
 
+def test_zero_filled_aggregate(global_var):
+    df = pd.DataFrame(
+        {
+            "a": ["x", "y", "z", None, "x", "y"] * 50,
+            "c": ["p", "q", "p", "q", None, "p"] * 50,
+            "f": ["u", "v", "u", "u", "v", "u"] * 50,
+            "m": np.arange(300.0),
+        }
+    )
+    filtered = df[df["f"] == "v"]
+
+    def key(*values):
+        return tuple(None if pd.isna(value) else value for value in values)
+
+    # Filtered aggregates have a row for every category, including missing values, with 0 for empty groups
+    for intent, by in [(["a", "m", "c", "f=v"], ["a", "c"]), (["a", "m", "f=v"], ["a"])]:
+        vis = Vis(intent, df)
+        expected = filtered.groupby(by, dropna=False)["m"].mean()
+        expected = {
+            key(*(group if len(by) > 1 else [group])): value for group, value in expected.items()
+        }
+        assert len(vis.data) == np.prod([df[attr].nunique(dropna=False) for attr in by])
+        for row in vis.data[by + ["m"]].itertuples(index=False):
+            assert row[-1] == expected.get(key(*row[:-1]), 0)
+    # The lookup tables of the categories are built once, and kept with the unique values of the dataframe
+    index = df.unique_values["c"]._index
+    assert index is not None
+    Vis(["a", "m", "c", "f=v"], df)
+    assert df.unique_values["c"]._index is index
+
+
+def test_stratified_sampling(restore_config):
+    rng = np.random.default_rng(0)
+    n = 20000
+    df = pd.DataFrame(
+        {
+            "event": rng.choice(
+                ["view", "click", "purchase", "refund"], size=n, p=[0.9, 0.09, 0.009, 0.001]
+            ),
+            "amount": rng.exponential(50, size=n),
+        }
+    )
+    counts = df["event"].value_counts()
+    sums = df.groupby("event")["amount"].sum()
+    lux.config.sampling_start = 1000
+    lux.config.sampling_cap = 1000
+
+    # A uniform sample of 1000 rows misses the rare category
+    vis = Vis(["event"], df)
+    assert "refund" not in set(vis.data["event"])
+
+    lux.config.sampling_strategy = "stratified"
+    vis = Vis(["event"], df)
+    weighted_counts = dict(zip(vis.data["event"], vis.data["Record"]))
+    assert set(weighted_counts) == set(counts.index)
+    vis = Vis([lux.Clause("event"), lux.Clause("amount", aggregation="sum")], df)
+    weighted_sums = dict(zip(vis.data["event"], vis.data["amount"]))
+    # Categories below sampling_min_category_count are kept whole, the others are reweighted
+    assert counts["refund"] < lux.config.sampling_min_category_count
+    assert weighted_counts["refund"] == counts["refund"]
+    assert weighted_sums["refund"] == pytest.approx(sums["refund"])
+    for event in counts.index:
+        assert weighted_counts[event] == pytest.approx(counts[event], rel=0.5)
+        assert weighted_sums[event] == pytest.approx(sums[event], rel=0.5)
+
+    # Functions are weighted as the aggregations of the same name
+    for agg_func, agg_name in [(np.sum, "sum"), (np.mean, "mean"), (len, "count")]:
+        vis = Vis([lux.Clause("event"), lux.Clause("amount", aggregation=agg_func)], df)
+        expected = Vis([lux.Clause("event"), lux.Clause("amount", aggregation=agg_name)], df)
+        assert list(vis.data["event"]) == list(expected.data["event"])
+        assert np.allclose(vis.data["amount"], expected.data["amount"])
+
+
+def test_progressive_aggregation(restore_config):
+    rng = np.random.default_rng(0)
+    n = 200000
+    df = pd.DataFrame(
+        {
+            "c": rng.choice(list("abcde"), size=n, p=[0.4, 0.3, 0.15, 0.1, 0.05]),
+            "x": rng.exponential(10, size=n),
+        }
+    )
+    df.maintain_metadata()
+    lux.config.sampling_cap = n
+    lux.config.sampling_start = n
+    lux.config.progressive_aggregation = True
+    intents = [["c"], [lux.Clause("c"), lux.Clause("x", aggregation="sum")], ["c", "x"]]
+    vislist = VisList([Vis(intent) for intent in intents], df)
+    df._vis_cache = None
+    PandasExecutor.execute(vislist._collection, df, approx=True)
+    grouped = df.groupby("c")["x"]
+    expected = [grouped.size(), grouped.sum(), grouped.mean()]
+    # Aggregates computed on a sample of the rows, rescaled to all rows, are covered by their confidence intervals
+    for vis, exact in zip(vislist, expected):
+        assert vis.approx and vis.error_bounds is not None
+        measure = vis.data.columns[-1]
+        approx = pd.Series(vis.data[measure].values, index=vis.data["c"].values)
+        bounds = pd.Series(vis.error_bounds.values, index=vis.data["c"].values)
+        assert ((approx - exact).abs() <= bounds).all()
+
+    # Charts aggregated on all the sampled rows are not approximated any further
+    lux.config.sampling_start = 5000
+    lux.config.sampling_cap = 5000
+    vislist = VisList([Vis(intent) for intent in intents[:2]], df)
+    df._vis_cache = None
+    PandasExecutor.execute(vislist._collection, df, approx=True)
+    assert len(df._sampled) == 5000
+    assert all(vis.error_bounds is None for vis in vislist)
+
+
+def test_sample_view_histogram(restore_config):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.random((5000, 10)), columns=[f"x{i}" for i in range(10)])
+    lux.config.sampling_start = 1000
+    lux.config.sampling_cap = 1000
+    vis = Vis(["x0"], df)
+    # The sample is kept as row positions, and only the columns of a vis are gathered from it
+    sampled = df._sampled
+    assert len(sampled) == 1000 and sampled.positions is not None
+    assert list(sampled.take(["x0"]).columns) == ["x0"]
+    bin_size = vis.get_attr_by_attr_name("x0")[0].bin_size
+    counts, edges = np.histogram(
+        df["x0"].values[sampled.positions], bins=bin_size, range=(df["x0"].min(), df["x0"].max())
+    )
+    assert np.array_equal(vis.data["Number of Records"], counts)
+    assert np.array_equal(vis.data["x0"], edges[:-1])
+
+
+def test_batch_aggregate(global_var):
+    df = pd.read_csv("lux/data/car.csv")
+    intents = [
+        [lux.Clause("Origin"), lux.Clause("Record"), lux.Clause("Year>1975")],
+        [lux.Clause("Origin"), lux.Clause("Horsepower", aggregation="mean"), lux.Clause("Year>1975")],
+        [lux.Clause("Origin"), lux.Clause("Weight", aggregation="sum"), lux.Clause("Year>1975")],
+        [lux.Clause("Origin"), lux.Clause("Acceleration", aggregation="max"), lux.Clause("Year>1975")],
+        [lux.Clause("Cylinders"), lux.Clause("MilesPerGal")],
+        [lux.Clause("Cylinders"), lux.Clause("Horsepower")],
+    ]
+    vislist = VisList([Vis(intent) for intent in intents], df)
+    # Recompute the vis in batches, without reusing their cached data
+    df._vis_cache = None
+    remaining = PandasExecutor.execute_batch_aggregate(vislist, df)
+    assert remaining == []
+    for vis, intent in zip(vislist, intents):
+        expected = Vis(intent, df).data
+        pd.testing.assert_frame_equal(
+            pd.DataFrame(vis.data).reset_index(drop=True), pd.DataFrame(expected).reset_index(drop=True)
+        )
+    # Charts sharing the group-by attribute and filters match a group-by of the filtered rows
+    grouped = df[df["Year"] > 1975].groupby("Origin")
+    expected = grouped.agg({"Horsepower": "mean", "Weight": "sum", "Acceleration": "max"})
+    expected["Record"] = grouped.size()
+    for vis in vislist[:4]:
+        measure = vis.data.columns[-1]
+        assert np.allclose(vis.data[measure], expected.loc[vis.data["Origin"], measure])
+
+
+def test_batch_binning(global_var):
+    df = pd.read_csv("lux/data/car.csv")
+    df.loc[0, "Acceleration"] = np.inf
+    df.maintain_metadata()
+    intents = [
+        [lux.Clause("Horsepower")],
+        [lux.Clause("Weight")],
+        [lux.Clause("Acceleration")],
+        [lux.Clause("Weight"), lux.Clause("Origin=USA")],
+    ]
+    vislist = VisList([Vis(intent) for intent in intents], df)
+    df._vis_cache = None
+    remaining = PandasExecutor.execute_batch_binning(vislist, df)
+    assert remaining == []
+    for vis, filtered in zip(vislist, [df, df, df, df[df["Origin"] == "USA"]]):
+        bin_attribute = [clause for clause in vis._inferred_intent if clause.bin_size != 0][0]
+        series = filtered[bin_attribute.attribute]
+        series = series[np.isfinite(series)]
+        # Histograms of a column share the bins spanning its range over the whole dataframe
+        value_range = (df[bin_attribute.attribute].min(), df[bin_attribute.attribute].max())
+        if not np.isfinite(value_range).all():
+            value_range = (series.min(), series.max())
+        counts, edges = np.histogram(series, bins=bin_attribute.bin_size, range=value_range)
+        assert list(vis.data.columns) == [bin_attribute.attribute, "Number of Records"]
+        assert np.array_equal(vis.data["Number of Records"], counts)
+        assert np.array_equal(vis.data[bin_attribute.attribute], edges[:-1])
+    assert any("Acceleration" in msg["text"] for msg in df._message.messages)
+
+
+def test_binning_after_inplace_write(global_var):
+    df = pd.DataFrame({"b": np.arange(100.0), "c": list("pqrs") * 25})
+    assert Vis(["b"], df).data["b"].min() == 0
+
+    # Values written in place outside of the former range of the column extend its bins
+    values = np.linspace(-500, 1500, 100)
+    df.loc[:, "b"] = values
+    vis = Vis(["b"], df)
+    bin_size = vis.get_attr_by_attr_name("b")[0].bin_size
+    counts, edges = np.histogram(values, bins=bin_size, range=(values.min(), values.max()))
+    assert np.array_equal(vis.data["Number of Records"], counts)
+    assert np.array_equal(vis.data["b"], edges[:-1])
+    assert vis.data["Number of Records"].sum() == 100
+
+
+def test_aggregate_cache(global_var, restore_config):
+    df = pd.DataFrame(
+        {
+            "state": ["CA", "NY", "TX", "WA"] * 50,
+            "kind": ["a", "a", "b", "b", "c"] * 40,
+            "price": [i * 0.5 for i in range(200)],
+        }
+    )
+    cache = lux.config.aggregate_cache
+    cache.clear()
+    colored = Vis(
+        [
+            lux.Clause("state"),
+            lux.Clause("price", aggregation="sum"),
+            lux.Clause("kind", channel="color"),
+        ],
+        df,
+    )
+    assert cache.misses == 1 and cache.hits == 0 and len(colored.data) == 12
+
+    # Rolled up from the aggregate by state and kind
+    vis = Vis([lux.Clause("state"), lux.Clause("price", aggregation="sum")], df)
+    expected = df.groupby("state")["price"].sum()
+    assert cache.hits == 1 and cache.misses == 1
+    assert list(vis.data["price"]) == list(expected)
+
+    # Served from the cache, even once the vis data cached on the dataframe is dropped
+    df._vis_cache = None
+    vis = Vis([lux.Clause("state"), lux.Clause("price", aggregation="sum")], df)
+    assert cache.hits == 2 and cache.misses == 1 and cache.hit_rate == 2 / 3
+    assert list(vis.data["price"]) == list(expected)
+
+    # Changing the data drops the cached aggregates over the changed columns
+    Vis([lux.Clause("kind"), lux.Clause("Record")], df)
+    df["price"] = df["price"] * 2
+    assert len(cache) == 1
+    vis = Vis([lux.Clause("state"), lux.Clause("price", aggregation="sum")], df)
+    assert cache.misses == 3
+    assert list(vis.data["price"]) == list(expected * 2)
+    df.loc[:, "price"] = df["price"] + 1
+    vis = Vis([lux.Clause("state"), lux.Clause("price", aggregation="sum")], df)
+    assert list(vis.data["price"]) == list(df.groupby("state")["price"].sum())
+
+    # Writing another column keeps serving the aggregates that do not use it
+    hits, misses = cache.hits, cache.misses
+    df["discount"] = df["price"] * 0.1
+    df._vis_cache = None
+    vis = Vis([lux.Clause("state"), lux.Clause("price", aggregation="sum")], df)
+    assert cache.hits == hits + 1 and cache.misses == misses
+    assert list(vis.data["price"]) == list(df.groupby("state")["price"].sum())
+
+    # Least recently used aggregates are evicted beyond the size limit
+    Vis([lux.Clause("kind"), lux.Clause("price", aggregation="sum")], df)
+    lux.config.aggregate_cache_size = cache.size // 2
+    assert 0 < len(cache) < 3 and cache.size <= lux.config.aggregate_cache_size
+
+
+def test_filter_bitmap(global_var):
+    df = pd.read_csv("lux/data/car.csv")
+    usa = [("Origin", "=", "USA")]
+    fast = [("Acceleration", ">", 16)]
+    assert PandasExecutor.filtered_size(df, usa) == len(df[df["Origin"] == "USA"])
+    assert PandasExecutor.filtered_size(df, usa + fast) == len(
+        df[(df["Origin"] == "USA") & (df["Acceleration"] > 16)]
+    )
+    assert PandasExecutor.filtered_size(df, usa + fast, how="or") == len(
+        df[(df["Origin"] == "USA") | (df["Acceleration"] > 16)]
+    )
+    assert len(df._bitmap_index) == 2
+    mask = df._bitmap_index.mask(PandasExecutor.filter_bitmap(df, usa))
+    assert list(df[mask].index) == list(df[df["Origin"] == "USA"].index)
+
+    # Changing a column only drops the bitmaps of the filters on it
+    df["Acceleration"] = df["Acceleration"] * 2
+    assert len(df._bitmap_index) == 1
+    assert PandasExecutor.filtered_size(df, fast) == len(df[df["Acceleration"] > 16])
+
+
+def test_filter_bitmap_after_inplace_write(global_var):
+    df = pd.DataFrame({"a": list("xy") * 50, "b": np.arange(100.0), "c": list("pqrs") * 25})
+    x, y = [("a", "=", "x")], [("a", "=", "y")]
+    assert PandasExecutor.filtered_size(df, x) == 50 and PandasExecutor.filtered_size(df, y) == 50
+
+    # Values written in place drop the bitmaps of the written columns
+    df.iloc[:, 0] = "x"
+    assert PandasExecutor.filtered_size(df, x) == len(df[df["a"] == "x"]) == 100
+    vis = Vis([lux.Clause("b"), lux.Clause("a=x")], df)
+    assert vis.data["Number of Records"].sum() == 100
+    df.loc[:, "a"] = "y"
+    assert PandasExecutor.filtered_size(df, x) == 0
+    vis = Vis([lux.Clause("c"), lux.Clause("Record"), lux.Clause("a=y")], df)
+    expected = df[df["a"] == "y"].groupby("c").size()
+    assert list(vis.data["Record"]) == list(expected) == [25, 25, 25, 25]
+
+
 def test_exclude_attribute(global_var):
     df = pytest.car_df
     intent = [lux.Clause("?", exclude=["Name", "Year"]), lux.Clause("Horsepower")]
@@ -196,3 +493,233 @@ def test_exclude_attribute(global_var):
         assert vis.get_attr_by_channel("x")[0].attribute != "Name"
         assert vis.get_attr_by_channel("y")[0].attribute != "Year"
         assert vis.get_attr_by_channel("y")[0].attribute != "Year"
+
+
+def test_heatmap_binning(global_var):
+    rng = np.random.default_rng(0)
+    n = 2000
+    df = pd.DataFrame(
+        {
+            "x": rng.normal(size=n),
+            "y": rng.random(n),
+            "price": rng.random(n),
+            "kind": rng.choice(list("abc"), n),
+            "name": [f"name{i}" for i in rng.integers(0, 1500, n)],
+        }
+    )
+    df.loc[0, "x"] = np.nan
+    df.loc[1, "y"] = np.inf
+    df.maintain_metadata()
+    bin_size = lux.config.heatmap_bin_size
+    finite = df[np.isfinite(df["x"]) & np.isfinite(df["y"])]
+    edges = {
+        attr: np.linspace(finite[attr].min(), finite[attr].max(), bin_size + 1) for attr in ["x", "y"]
+    }
+    # Reference binning, where the last bin includes its right edge
+    cells = finite.assign(
+        **{
+            f"{attr}Bin": np.minimum(
+                np.searchsorted(edges[attr], finite[attr], side="right") - 1, bin_size - 1
+            )
+            for attr in ["x", "y"]
+        }
+    ).groupby(["xBin", "yBin"])
+    # "kind" aggregates modes with a dense (cell, category) table, "name" has too many categories for it
+    for color, expected in [
+        (None, cells.size()),
+        ("price", cells["price"].mean()),
+        ("kind", cells["kind"].agg(lambda x: pd.Series.mode(x).iat[0])),
+        ("name", cells["name"].agg(lambda x: pd.Series.mode(x).iat[0])),
+    ]:
+        intent = ["x", "y"] if color is None else ["x", "y", lux.Clause(color, channel="color")]
+        vis = Vis(intent, df)
+        vis._vis_data = df[["x", "y"] if color is None else ["x", "y", color]]
+        PandasExecutor.execute_2D_binning(vis)
+        result = vis.data
+        assert np.array_equal(result["count"], cells.size())
+        assert np.array_equal(result["xBinStart"], edges["x"][cells.size().index.get_level_values(0)])
+        assert np.array_equal(result["yBinEnd"], edges["y"][cells.size().index.get_level_values(1) + 1])
+        if color == "price":
+            assert np.allclose(result[color], expected)
+        elif color is not None:
+            assert list(result[color]) == list(expected)
+
+
+def test_heatmap_binning_after_inplace_write(global_var):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"x": rng.random(1000), "y": rng.random(1000)})
+    df.maintain_metadata()
+    bin_size = lux.config.heatmap_bin_size
+
+    # Values written in place outside of the former range of the column extend its bins
+    x = rng.normal(scale=10, size=1000)
+    df.loc[:, "x"] = x
+    vis = Vis(["x", "y"], df)
+    vis._vis_data = df[["x", "y"]]
+    PandasExecutor.execute_2D_binning(vis)
+    counts, x_edges, y_edges = np.histogram2d(
+        x, df["y"], bins=bin_size, range=[(x.min(), x.max()), (df["y"].min(), df["y"].max())]
+    )
+    cells = np.nonzero(counts)
+    assert vis.data["count"].sum() == 1000
+    assert np.array_equal(vis.data["count"], counts[cells])
+    assert np.allclose(vis.data["xBinStart"], x_edges[cells[0]])
+    assert np.allclose(vis.data["yBinEnd"], y_edges[cells[1] + 1])
+
+
+def test_dictionary_encoded_aggregate(global_var):
+    from lux.utils.sampling_utils import SampleView
+
+    rng = np.random.default_rng(0)
+    n = 1000
+    df = pd.DataFrame(
+        {
+            "state": rng.choice(["CA", "NY", "TX", None], n),
+            "year": pd.to_datetime(rng.choice(["2019-01-01", "2020-01-01", None], n)),
+            "size": rng.integers(0, 5, n),
+            "flag": rng.random(n) > 0.5,
+            "score": rng.choice([0.5, 1.5, np.nan], n),
+            "id": rng.integers(0, 2000, n),
+            "price": np.where(rng.random(n) > 0.1, rng.random(n), np.nan),
+            "units": rng.integers(0, 100, n),
+        }
+    )
+    batch = [(None, "Record", "count")] + [
+        (None, measure, agg_func)
+        for measure in ["price", "units"]
+        for agg_func in ["count", "sum", "mean"]
+    ]
+    # Sampled and filtered rows are given by their positions, "id" has too many combinations for dense counts
+    rows = SampleView(df, np.sort(rng.choice(n, 600, replace=False)))
+    filtered = rows.take(list(df.columns))
+    for groupby_attrs in [("state",), ("year",), ("size", "flag"), ("state", "score"), ("id", "size")]:
+        encoded = PandasExecutor._aggregate_batch(batch, filtered, groupby_attrs, df, rows)
+        grouped = PandasExecutor._aggregate_batch(batch, filtered, groupby_attrs)
+        for encoded_result, grouped_result in zip(encoded, grouped):
+            pd.testing.assert_frame_equal(
+                pd.DataFrame(encoded_result), pd.DataFrame(grouped_result), check_exact=True
+            )
+    assert len(df._dictionary_encoding) == 6
+    df["size"] = df["size"] + 1
+    assert len(df._dictionary_encoding) == 5
+
+
+def test_parallel_execution(global_var, process_pool):
+    import os
+
+    df = pd.read_csv("lux/data/car.csv")
+    intents = [
+        [lux.Clause("Origin"), lux.Clause("Horsepower", aggregation="mean")],
+        [lux.Clause("Cylinders"), lux.Clause("Record")],
+        [lux.Clause("Weight")],
+        [lux.Clause("Horsepower"), lux.Clause("Weight")],
+    ]
+    lux.config.execution_workers = 2
+    vislist = VisList([Vis(intent) for intent in intents])
+    vislist.refresh_source(df)
+    # The vis were executed and scored by the worker processes
+    assert all(vis._precomputed_score is not None for vis in vislist)
+    mean, count, weights, scatter = vislist
+    expected = df.groupby("Origin")["Horsepower"].mean()
+    assert np.allclose(mean.data["Horsepower"], expected[mean.data["Origin"]])
+    expected = df.groupby("Cylinders").size()
+    assert list(count.data["Record"]) == list(expected[count.data["Cylinders"]])
+    bin_size = weights.get_attr_by_attr_name("Weight")[0].bin_size
+    counts, _ = np.histogram(df["Weight"], bins=bin_size, range=(df["Weight"].min(), df["Weight"].max()))
+    assert np.array_equal(weights.data["Number of Records"], counts)
+    assert len(scatter.data) == len(df)
+
+    # Headers are removed once the workers return, only the shared columns are kept
+    directory = process_pool._shared.directory
+    vislist.refresh_source(df)
+    assert os.path.isdir(directory)
+    assert all(name.endswith(".npy") for name in os.listdir(directory))
+
+    # Shutting the pool down removes the columns shared with the workers
+    process_pool.shutdown()
+    assert process_pool._pool == (None, 0) and process_pool._shared is None
+    assert not os.path.exists(directory)
+
+
+def test_duckdb_executor(global_var):
+    pytest.importorskip("duckdb")
+    rng = np.random.default_rng(0)
+    # Above lux.config._heatmap_start, so that scatterplots are binned into heatmaps
+    n = 6000
+    data = pd.DataFrame(
+        {
+            "x": rng.normal(size=n),
+            "y": rng.exponential(2, n),
+            "units": rng.integers(0, 100, n),
+            "price": rng.random(n),
+            "kind": rng.choice(["a", "b", "c", None], n),
+            "size": rng.choice([4, 6, 8], n),
+        }
+    )
+    data.loc[rng.random(n) < 0.05, "x"] = np.nan
+    intents = [
+        ["x"],
+        ["units"],
+        ["x", "y"],
+        ["x", "y", lux.Clause("kind", channel="color")],
+        ["x", "y", lux.Clause("price", channel="color")],
+        ["kind"],
+        ["kind", "size"],
+        ["x", "kind=a"],
+        [lux.Clause("kind"), lux.Clause("units", aggregation="sum")],
+        [lux.Clause("size"), lux.Clause("price", aggregation="max")],
+    ]
+
+    def execute(executor_type):
+        lux.config.set_executor_type(executor_type)
+        df = data.copy()
+        return [Vis(intent, df) for intent in intents]
+
+    try:
+        expected = execute("Pandas")
+        results = execute("DuckDB")
+        assert type(lux.config.executor).__name__ == "DuckDBExecutor"
+        assert [vis.mark for vis in results[:5]] == ["histogram"] * 2 + ["heatmap"] * 3
+    finally:
+        lux.config.set_executor_type("Pandas")
+    for result, expected_result in zip(results, expected):
+        pd.testing.assert_frame_equal(pd.DataFrame(result.data), pd.DataFrame(expected_result.data))
+    maxima = results[-1].data
+    assert np.allclose(maxima["price"], data.groupby("size")["price"].max()[maxima["size"]])
+    sums = results[-2].data.dropna()
+    assert list(sums["units"]) == list(data.groupby("kind")["units"].sum()[sums["kind"]])
+
+
+def test_sqlite_executor(global_var):
+    import sqlite3
+    from lux.core.sqltable import LuxSQLTable
+
+    car = pd.read_csv("lux/data/car.csv")
+    connection = sqlite3.connect(":memory:")
+    car.to_sql("car", connection, index=False)
+    try:
+        lux.config.set_SQL_connection(connection)
+        assert "pragma_table_info" in lux.config.query_templates["table_attributes_query"]
+        tbl = LuxSQLTable(table_name="car")
+        tbl.maintain_metadata()
+        assert list(tbl.columns) == list(car.columns)
+        assert tbl.data_type["Horsepower"] == "quantitative"
+        assert tbl.data_type["Origin"] == "nominal"
+        assert tbl.data_type["Year"] == "temporal"
+
+        # Buckets computed arithmetically from the range and width of the bins, with empty buckets filled in
+        for attr, origin in [("Horsepower", None), ("Acceleration", "Europe")]:
+            intent = [attr] if origin is None else [attr, f"Origin={origin}"]
+            vis = Vis(intent, tbl)
+            values = car[attr] if origin is None else car.loc[car["Origin"] == origin, attr]
+            expected, _ = np.histogram(values, 10, range=(car[attr].min(), car[attr].max()))
+            assert list(vis.data["Number of Records"]) == list(expected)
+
+        vis = Vis(["Origin"], tbl)
+        assert list(vis.data["Record"]) == list(car["Origin"].value_counts().sort_index())
+        vis = Vis(["Horsepower", "Weight"], tbl)
+        assert vis.mark == "heatmap"
+        assert vis.data["count"].sum() == len(car)
+    finally:
+        lux.config.set_SQL_connection("")
+        lux.config.set_executor_type("Pandas")
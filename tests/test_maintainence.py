@@ -102,3 +102,200 @@ def test_intent_cleared_after_vis_data():
     all_column_vis = vis.data.current_vis[0]
     assert all_column_vis.get_attr_by_channel("x")[0].attribute == "Year"
     assert all_column_vis.get_attr_by_channel("y")[0].attribute == "PctForeclosured"
+
+
+def test_metadata_attribute_access():
+    df = pd.read_csv("lux/data/car.csv")
+    df._ipython_display_()
+    horsepower = df.Horsepower
+    assert df._metadata_fresh == True, "Attribute access should not expire metadata"
+    assert df._recs_fresh == True, "Attribute access should not expire recommendations"
+    df.Horsepower.fillna(0, inplace=True)
+    assert df._metadata_fresh == False, "Failed to expire metadata after in-place change on a column"
+    assert df._recs_fresh == False, "Failed to expire recommendations after in-place change on a column"
+    assert df._stale_columns == {"Horsepower"}
+    df._ipython_display_()
+    df.Weight[0] = 0
+    assert df._metadata_fresh == False, "Failed to expire metadata after setting a value on a column"
+    df._ipython_display_()
+    assert df._min_max["Weight"][0] == 0
+
+
+def test_column_metadata_partial_recompute():
+    df = pd.read_csv("lux/data/car.csv")
+    df._ipython_display_()
+    data_type = df.data_type
+    cardinality = df.cardinality
+    df["Power-to-weight"] = df["Horsepower"] / df["Weight"]
+    assert df._metadata_fresh == False, "Failed to expire metadata after adding a column"
+    assert df._recs_fresh == False, "Failed to expire recommendations after adding a column"
+    assert df._stale_columns == {"Power-to-weight"}
+    df._ipython_display_()
+    assert df._metadata_fresh == True, "Failed to maintain metadata after display df"
+    assert df.data_type["Power-to-weight"] == "quantitative"
+    assert df._min_max["Power-to-weight"] == (
+        df["Power-to-weight"].min(),
+        df["Power-to-weight"].max(),
+    )
+    # Metadata of the untouched columns is carried over, not recomputed
+    for attr in data_type:
+        assert df.data_type[attr] == data_type[attr]
+        assert df.cardinality[attr] == cardinality[attr]
+    df["Power-to-weight"] = df["Power-to-weight"].round(2)
+    df._ipython_display_()
+    assert df.cardinality["Power-to-weight"] == len(df["Power-to-weight"].unique())
+    del df["Power-to-weight"]
+    df._ipython_display_()
+    assert "Power-to-weight" not in df.data_type
+    assert "Power-to-weight" not in df.cardinality
+
+
+def test_vis_data_reused_after_column_change():
+    df = pd.read_csv("lux/data/car.csv")
+    df._ipython_display_()
+    occurrence = {str(vis): vis.data for vis in df.recommendation["Occurrence"]}
+    df["Power-to-weight"] = df["Horsepower"] / df["Weight"]
+    # Cached data of vis that do not touch the new column survives the change
+    assert len(df._vis_cache) > 0
+    df["Origin"] = df["Origin"].str.upper()
+    assert all("Origin" not in entry[2] for entry in df._vis_cache.values())
+    df._ipython_display_()
+    for vis in df.recommendation["Occurrence"]:
+        if vis.get_attr_by_attr_name("Origin"):
+            assert set(vis.data["Origin"]) == {"USA", "JAPAN", "EUROPE"}
+        elif str(vis) in occurrence:
+            assert vis.data.equals(occurrence[str(vis)])
+
+
+def test_vis_data_after_inplace_write():
+    import numpy as np
+
+    df = pd.DataFrame({"b": np.arange(100, dtype=float), "c": list("pqrs") * 25})
+    bar = [lux.Clause("c"), lux.Clause("b", aggregation="sum")]
+    assert Vis(bar, df).data["b"].tolist() == [1200, 1225, 1250, 1275]
+
+    # Values written with .loc, .iloc, .at and .iat expire the vis data of the written columns
+    df.loc[:, "b"] = np.arange(100, dtype=float) * 2
+    assert Vis(bar, df).data["b"].tolist() == df.groupby("c")["b"].sum().tolist()
+    df.iloc[:50, 0] = -1.0
+    assert Vis(bar, df).data["b"].tolist() == df.groupby("c")["b"].sum().tolist()
+    df.at[3, "b"] = 1000.0
+    assert Vis(bar, df).data["b"].tolist() == df.groupby("c")["b"].sum().tolist()
+    df.iat[4, 0] = 2000.0
+    assert Vis(bar, df).data["b"].tolist() == df.groupby("c")["b"].sum().tolist()
+    assert df._column_versions["b"] == 4
+
+
+def test_metadata_cache(tmp_path, monkeypatch):
+    from lux.executor.PandasExecutor import PandasExecutor
+
+    lux.config.metadata_cache_dir = str(tmp_path)
+    df = pd.read_csv("lux/data/car.csv")
+    df.maintain_metadata()
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+
+    # Reopening the same data rehydrates the metadata instead of recomputing it
+    def fail_compute_stats(self, ldf, columns=None):
+        assert False, "Metadata should be read from the cache"
+
+    with monkeypatch.context() as m:
+        m.setattr(PandasExecutor, "compute_stats", fail_compute_stats)
+        reopened = pd.read_csv("lux/data/car.csv")
+        reopened.maintain_metadata()
+    assert reopened._metadata_fresh == True
+    assert reopened.data_type == df.data_type
+    assert reopened.cardinality == df.cardinality
+    assert reopened._min_max == df._min_max
+
+    # Changed data gets a different fingerprint
+    changed = pd.read_csv("lux/data/car.csv")
+    changed.loc[100, "Weight"] = 1
+    changed.maintain_metadata()
+    assert changed._min_max["Weight"][0] == 1
+    assert len(list(tmp_path.glob("*.pkl"))) == 2
+    strings = pd.DataFrame({"a": ["x"] * 5000})
+    strings.maintain_metadata()
+    edited = pd.DataFrame({"a": ["x"] * 5000})
+    edited.loc[2500, "a"] = "zzz"
+    edited.maintain_metadata()
+    assert edited.cardinality["a"] == 2 and "zzz" in edited.unique_values["a"]
+
+    # Least recently used entries are evicted beyond the size limit
+    entry_size = max(path.stat().st_size for path in tmp_path.glob("*.pkl"))
+    lux.config.metadata_cache_size = entry_size
+    reopened = pd.read_csv("lux/data/car.csv")
+    reopened.maintain_metadata()
+    other = pd.read_csv("lux/data/car.csv").head(50)
+    other.maintain_metadata()
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+    assert lux.config.metadata_store.fingerprint(other) + ".pkl" == list(tmp_path.glob("*.pkl"))[0].name
+
+    lux.config.metadata_cache_dir = None
+    lux.config.metadata_cache_size = 512 * 1024 * 1024
+
+
+def test_sample_extended_after_append(restore_config):
+    import numpy as np
+
+    lux.config.sampling_start = 1000
+    lux.config.sampling_cap = 1000
+    df = pd.DataFrame({"id": np.arange(5000), "value": np.random.rand(5000)})
+    df.maintain_metadata()
+    lux.config.executor.execute_sampling(df)
+    reservoir = df._reservoir
+    assert reservoir.n_rows == len(df) and len(df._sampled) == 1000
+
+    # Concatenated rows extend a copy of the sample, instead of resampling the whole dataframe
+    appended = pd.concat([df, pd.DataFrame({"id": np.arange(5000, 6000), "value": 0.0})])
+    assert appended._reservoir is not None and appended._reservoir is not reservoir
+    appended.maintain_metadata()
+    lux.config.executor.execute_sampling(appended)
+    assert appended._reservoir.n_rows == 6000 and reservoir.n_rows == 5000
+    assert len(appended._sampled) == 1000
+    sampled_ids = appended._sampled.take()["id"].to_numpy()
+    assert set(sampled_ids) <= set(range(6000)) and len(np.unique(sampled_ids)) == 1000
+
+    # Rows appended in place expire the sample, which is then extended
+    df.loc[5000] = [5000, 0.0]
+    assert df._metadata_fresh == False
+    df.maintain_metadata()
+    lux.config.executor.execute_sampling(df)
+    assert df._reservoir is reservoir and reservoir.n_rows == 5001
+
+    # Other in-place operations rebuild the sample
+    df.dropna(inplace=True)
+    assert df._reservoir is None
+
+
+def test_sample_kept_until_data_changes(restore_config):
+    import numpy as np
+
+    lux.config.sampling_start = 1000
+    lux.config.sampling_cap = 1000
+    df = pd.DataFrame({"a": np.arange(5000), "b": np.random.rand(5000)})
+    df.intent = ["a"]
+    df._ipython_display_()
+    sampled = df._sampled
+    assert len(sampled) == 1000
+
+    # Operations that do not modify the data reuse the sample
+    df.intent = ["b"]
+    df._ipython_display_()
+    df.clear_intent()
+    df.set_data_type({"a": "quantitative"})
+    df._ipython_display_()
+    assert df._sampled is sampled
+
+    # Dataframes derived from it get their own sample
+    filtered = df[df["a"] >= 2500]
+    filtered._ipython_display_()
+    assert filtered._sampled is not sampled and filtered._sampled.take()["a"].min() >= 2500
+
+    # Modifying the data or the sampling settings draws a new sample
+    df["b"] = df["b"] * 2
+    df._ipython_display_()
+    assert df._sampled is not sampled
+    sampled = df._sampled
+    lux.config.sampling_cap = 2000
+    lux.config.executor.execute_sampling(df)
+    assert df._sampled is not sampled and len(df._sampled) == 2000
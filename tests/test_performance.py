@@ -20,6 +20,7 @@ import time
 
 # To run the script and see the printed result, run:
 # python -m pytest -s tests/test_performance.py
+# Tests marked as benchmarks are skipped unless --run-benchmarks is given
 def test_lazy_maintain_performance_census(global_var):
     lux.config.lazy_maintain = True
     df = pd.read_csv("https://github.com/lux-org/lux-datasets/blob/master/data/census.csv?raw=true")
@@ -98,3 +99,300 @@ def test_early_prune_performance_spotify():
     assert (
         without_prune_time > with_prune_time
     ), "Early pruning should speed up Spotify dataset recommendations"
+
+
+def test_compute_stats_performance():
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    n = 200000
+    data = {}
+    for i in range(30):
+        data[f"float_{i}"] = rng.normal(size=n).round(1)
+    for i in range(40):
+        data[f"int_{i}"] = rng.integers(0, 50, size=n)
+    for i in range(10):
+        data[f"str_{i}"] = rng.choice(["a", "b", "c", "d"], size=n)
+    df = pd.DataFrame(data)
+
+    # Reference: the previous column-by-column loop
+    tic = time.perf_counter()
+    unique_values = {}
+    cardinality = {}
+    min_max = {}
+    for attribute in df.columns:
+        unique_values[attribute] = list(df[attribute].unique())
+        cardinality[attribute] = len(unique_values[attribute])
+        if pd.api.types.is_float_dtype(df.dtypes[attribute]) or pd.api.types.is_integer_dtype(
+            df.dtypes[attribute]
+        ):
+            min_max[attribute] = (df[attribute].min(), df[attribute].max())
+    toc = time.perf_counter()
+    loop_time = toc - tic
+
+    tic = time.perf_counter()
+    lux.config.executor.compute_stats(df)
+    toc = time.perf_counter()
+    batched_time = toc - tic
+    print(f"Column-by-column loop: {loop_time:0.4f} seconds")
+    print(f"Batched profiler: {batched_time:0.4f} seconds")
+
+    assert df.cardinality == cardinality
+    assert df._min_max == min_max
+    assert df.unique_values == unique_values
+    assert df._column_stats["float_0"]["null_count"] == 0
+    assert (
+        batched_time < 2 * loop_time
+    ), f"Batched profiling took {batched_time:0.4f} seconds, longer than the column-by-column loop."
+
+
+def test_attribute_access_display_performance():
+    lux.config.lazy_maintain = True
+    df = pd.read_csv("lux/data/car.csv")
+    tic = time.perf_counter()
+    df.maintain_recs()
+    toc = time.perf_counter()
+    delta = toc - tic
+    # Reading a column through attribute access should not trigger a recompute
+    horsepower = df.Horsepower
+    tic = time.perf_counter()
+    df.maintain_recs()
+    toc = time.perf_counter()
+    delta2 = toc - tic
+    print(f"1st display Performance: {delta:0.4f} seconds")
+    print(f"Display after attribute access Performance: {delta2:0.4f} seconds")
+    assert df._metadata_fresh == True
+    assert (
+        delta2 < 0.1 < delta
+    ), f"Display after attribute access took a total of {delta2:0.4f} seconds, longer than expected."
+
+
+def test_sample_type_inference_performance():
+    import numpy as np
+    from lux.executor.PandasExecutor import PandasExecutor
+
+    def is_datetime_string_full(series):
+        if series.dtype == object:
+            try:
+                pd.to_numeric(series)
+                return False
+            except Exception:
+                pass
+            try:
+                pd.to_datetime(series)
+                return True
+            except Exception:
+                return False
+        return False
+
+    def is_datetime_number_full(series):
+        if pd.api.types.is_integer_dtype(series.dtype):
+            try:
+                pd.to_datetime(series.astype(str))
+                return True
+            except Exception:
+                return False
+        return False
+
+    def is_numeric_nan_full(series):
+        if series.dtype == object:
+            try:
+                series.dropna().astype("float")
+                return True
+            except Exception:
+                return False
+        return False
+
+    rng = np.random.default_rng(0)
+    n = 200000
+    dates = pd.date_range("2000-01-01", periods=n, freq="min")
+    corpus = {
+        "category": pd.Series(rng.choice(["alpha", "beta", "gamma"], n), dtype=object),
+        "name": pd.Series([f"user{i}" for i in rng.integers(0, n, n)], dtype=object),
+        "iso_date": pd.Series(dates.strftime("%Y-%m-%d %H:%M"), dtype=object),
+        "us_date": pd.Series(dates.strftime("%m/%d/%Y"), dtype=object),
+        "numeric_string": pd.Series(rng.normal(size=n).round(3).astype(str), dtype=object),
+        "numeric_nan": pd.Series(np.where(rng.random(n) < 0.1, None, rng.normal(size=n)), dtype=object),
+        "year_string": pd.Series(rng.integers(1950, 2020, n).astype(str), dtype=object),
+        "year": pd.Series(rng.integers(1950, 2020, n)),
+        "count": pd.Series(rng.integers(0, 1000, n)),
+        "yyyymmdd": pd.Series(rng.integers(20000101, 20000128, n)),
+    }
+    checks = [
+        (is_datetime_string_full, PandasExecutor._is_datetime_string),
+        (is_datetime_number_full, PandasExecutor._is_datetime_number),
+        (is_numeric_nan_full, lambda series: lux.utils.utils.is_numeric_nan_column(series)[0]),
+    ]
+    full_time = sampled_time = 0
+    agree = 0
+    for name, series in corpus.items():
+        for full_check, sampled_check in checks:
+            tic = time.perf_counter()
+            expected = full_check(series)
+            toc = time.perf_counter()
+            result = sampled_check(series)
+            toc2 = time.perf_counter()
+            full_time += toc - tic
+            sampled_time += toc2 - toc
+            agree += result == expected
+    accuracy = agree / (len(corpus) * len(checks))
+    print(f"Full-column type inference: {full_time:0.4f} seconds")
+    print(f"Sample-based type inference: {sampled_time:0.4f} seconds")
+    print(f"Agreement with full-column type inference: {accuracy:.0%}")
+    assert accuracy == 1
+    assert (
+        sampled_time < full_time
+    ), f"Sample-based type inference took {sampled_time:0.4f} seconds, longer than the full-column checks."
+
+
+def test_parallel_metadata_scaling(restore_config):
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    n = 50000
+    data = {}
+    for i in range(80):
+        data[f"float_{i}"] = rng.normal(size=n).round(2)
+    for i in range(80):
+        data[f"int_{i}"] = rng.integers(0, 100, size=n)
+    for i in range(40):
+        data[f"str_{i}"] = rng.choice(["a", "b", "c", "d", "e"], size=n)
+    for i in range(20):
+        data[f"num_str_{i}"] = rng.integers(0, 1000, size=n).astype(str)
+
+    results = {}
+    for workers in [1, 2, 4, 8]:
+        lux.config.metadata_workers = workers
+        df = pd.DataFrame(data)
+        tic = time.perf_counter()
+        df.maintain_metadata()
+        toc = time.perf_counter()
+        print(f"{len(df.columns)} columns, {workers} metadata workers: {toc - tic:0.4f} seconds")
+        results[workers] = (df.data_type, df.cardinality, df._min_max, df.unique_values)
+
+    # Metadata does not depend on the number of workers
+    for workers in [2, 4, 8]:
+        assert results[workers][0] == results[1][0]
+        assert results[workers][1] == results[1][1]
+        assert results[workers][2] == results[1][2]
+        assert list(results[workers][0]) == list(results[1][0])
+        for attr in results[1][3]:
+            assert results[workers][3][attr] == results[1][3][attr]
+
+
+def test_validate_filter_value_performance():
+    import warnings
+    import numpy as np
+    from lux.processor.Validator import Validator
+
+    n = 1000000
+    df = pd.DataFrame({"category": np.arange(n) % 50, "value": np.arange(n, dtype=float)})
+    df["category"] = df["category"].astype(str)
+    df.maintain_metadata()
+    intent = [lux.Clause(attribute="category", filter_op="=", value=str(v)) for v in range(50)]
+
+    tic = time.perf_counter()
+    for clause in intent:
+        assert clause.value in df["category"].values
+    toc = time.perf_counter()
+    print(f"Scanning the column: {toc - tic:0.4f} seconds")
+
+    tic = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        Validator.validate_intent(intent, df)
+    toc = time.perf_counter()
+    print(f"Hashed lookups into the unique values: {toc - tic:0.4f} seconds")
+    assert toc - tic < 1
+
+    with pytest.warns(UserWarning, match="The input value '50' does not exist"):
+        Validator.validate_intent([lux.Clause(attribute="category", filter_op="=", value="50")], df)
+
+
+def test_check_if_id_like_performance():
+    import re
+    import numpy as np
+    from lux.utils.utils import check_if_id_like
+
+    def check_if_id_like_scan(df, attribute):
+        # Previous implementation, computing a full diff of every integer column
+        high_cardinality = df.cardinality[attribute] > 500
+        attribute_contain_id = re.search(r"id|ID|iD|Id", str(attribute)) is not None
+        almost_all_vals_unique = df.cardinality[attribute] >= 0.98 * len(df)
+        diff = df[attribute].diff()
+        evenly_spaced = all(diff.iloc[1:] == diff.iloc[1])
+        if attribute_contain_id:
+            almost_all_vals_unique = df.cardinality[attribute] >= 0.75 * len(df)
+        return high_cardinality and (almost_all_vals_unique or evenly_spaced)
+
+    rng = np.random.default_rng(0)
+    n = 200000
+    data = {}
+    for i in range(50):
+        data[f"count_{i}"] = rng.integers(0, 1000, size=n)
+        data[f"row_id_{i}"] = np.arange(n) + i
+        data[f"amount_{i}"] = rng.integers(0, 50000, size=n)
+        data[f"flag_{i}"] = rng.integers(0, 2, size=n)
+    df = pd.DataFrame(data)
+    df.maintain_metadata()
+
+    tic = time.perf_counter()
+    expected = {attr: check_if_id_like_scan(df, attr) for attr in df.columns}
+    toc = time.perf_counter()
+    print(f"Full diff per column: {toc - tic:0.4f} seconds")
+
+    tic = time.perf_counter()
+    result = {attr: check_if_id_like(df, attr) for attr in df.columns}
+    toc = time.perf_counter()
+    print(f"Early-exit checks on the metadata: {toc - tic:0.4f} seconds")
+
+    assert result == expected
+    assert sum(result.values()) == 50
+
+
+def test_series_construction_overhead():
+    import timeit
+    import numpy as np
+    import lux.core
+
+    values = np.arange(3)
+    pandas_time = min(timeit.repeat(lambda: lux.core.originalSeries(values), number=10000, repeat=3))
+    lux_time = min(timeit.repeat(lambda: pd.Series(values), number=10000, repeat=3))
+    print(f"pandas Series: {pandas_time:0.4f} seconds, LuxSeries: {lux_time:0.4f} seconds")
+    # Metadata is created lazily, so constructing a LuxSeries costs about as much as a pandas Series
+    assert lux_time < 1.5 * pandas_time
+
+
+@pytest.mark.benchmark
+def test_dictionary_encoded_aggregate():
+    import numpy as np
+    from lux.executor.PandasExecutor import PandasExecutor
+    from lux.utils.sampling_utils import SampleView
+
+    rng = np.random.default_rng(0)
+    n = 1000000
+    data = {f"c{i}": rng.choice([f"category{j}" for j in range(50)], n) for i in range(10)}
+    data["price"] = rng.random(n)
+    df = pd.DataFrame(data)
+    rows = SampleView(df)
+    # Count and mean bar charts of every nominal column, as in the Occurrence action
+    batch = [(None, "Record", "count"), (None, "price", "mean")]
+
+    tic = time.perf_counter()
+    grouped = [PandasExecutor._aggregate_batch(batch, df, (f"c{i}",)) for i in range(10)]
+    groupby_time = time.perf_counter() - tic
+    tic = time.perf_counter()
+    encoded = [PandasExecutor._aggregate_batch(batch, df, (f"c{i}",), df, rows) for i in range(10)]
+    first_time = time.perf_counter() - tic
+    # Columns are only encoded once per version of the data
+    tic = time.perf_counter()
+    encoded = [PandasExecutor._aggregate_batch(batch, df, (f"c{i}",), df, rows) for i in range(10)]
+    encoded_time = time.perf_counter() - tic
+    print(
+        f"Aggregating 20 bar charts of 10 nominal columns over 1M rows -- group-by: {groupby_time:0.3f}s, "
+        f"dictionary-encoded: {first_time:0.3f}s (encoding included), {encoded_time:0.3f}s (encoded)"
+    )
+    for encoded_results, grouped_results in zip(encoded, grouped):
+        for encoded_result, grouped_result in zip(encoded_results, grouped_results):
+            pd.testing.assert_frame_equal(pd.DataFrame(encoded_result), pd.DataFrame(grouped_result))
+    assert encoded_time < 0.25 * groupby_time
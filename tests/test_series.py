@@ -102,3 +102,44 @@ def test_unnamed_column():
     series.__repr__()
     exported_code_str = series.recommendation["Distribution"][0].to_altair()
     assert axis_title in exported_code_str, "Unnamed column should have 'Series' as placeholder"
+
+
+def test_cached_unique():
+    from lux.utils.profile_utils import UniqueValues
+
+    df = pd.read_csv("lux/data/car.csv")
+    df.maintain_metadata()
+    unique_values = df.unique_values["Origin"]
+    assert isinstance(unique_values, UniqueValues)
+    assert unique_values == ["USA", "Japan", "Europe"]
+    assert "Japan" in unique_values and "Mars" not in unique_values
+    assert [] not in unique_values
+
+    # Cached uniques are returned as an array, without copying them
+    uniques = df["Origin"].unique()
+    assert list(uniques) == list(pd.unique(df["Origin"]))
+    assert uniques.base is unique_values.values.base
+    with pytest.raises(ValueError):
+        uniques[0] = "Mars"
+
+
+def test_lazy_metadata():
+    from lux.history.history import History
+
+    series = pd.Series([1, 2, 3])
+    assert "_history" not in series.__dict__ and "_message" not in series.__dict__
+    assert isinstance(series._history, History)
+    assert series._history is series._history
+    assert series._intent == [] and series.unique_values is None
+
+    df = pd.read_csv("lux/data/car.csv")
+    df.maintain_metadata()
+    # Derived objects reference the metadata of their parent
+    series = df["Weight"]
+    assert series.cardinality is df.cardinality
+    assert series._history is df._history
+
+    # Shared metadata is copied before it is changed
+    head = df.head()
+    assert head._history[-1].name == "head"
+    assert len(df.history) == 0
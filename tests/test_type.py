@@ -224,6 +224,82 @@ def test_float_categorical():
         assert x == "float64", "Source dataframe preserved as float dtype"
 
 
+def test_sample_type_inference():
+    """Tests that type inference on a sample falls back to the full column when the sample is ambiguous."""
+    n = 5000
+    years = [str(1950 + i % 70) for i in range(n)]
+    # Non-numeric values outside of the evenly spaced sample
+    years_with_date = years.copy()
+    years_with_date[1] = "1998-03-01"
+    years_with_label = years.copy()
+    years_with_label[1] = "unknown"
+    df = pd.DataFrame(
+        {
+            "date": pd.date_range("2000-01-01", periods=n, freq="H").strftime("%Y-%m-%d %H:%M"),
+            "years_with_date": years_with_date,
+            "years_with_label": years_with_label,
+            "label": ["a", "b", "c", "d"] * (n // 4),
+            "amount": [str(i / 10) for i in range(n)],
+            "period": [20000101 + i % 28 for i in range(n)],
+        }
+    )
+    df.maintain_metadata()
+    assert df.data_type["date"] == "temporal"
+    assert df.data_type["years_with_date"] == "temporal"
+    assert df.data_type["years_with_label"] == "nominal"
+    assert df.data_type["label"] == "nominal"
+    assert df.data_type["amount"] == "quantitative"
+    assert df.data_type["period"] == "temporal"
+    assert df._min_max["amount"] == (0.0, (n - 1) / 10)
+
+
+def test_sample_type_inference_confirmed():
+    """Tests that a sample parsing as dates is confirmed on the full column before typing it as temporal."""
+    import numpy as np
+
+    n = 5000
+    # Dates at the rows of the evenly spaced sample only, free text or invalid dates elsewhere
+    sampled = np.zeros(n, dtype=bool)
+    sampled[np.linspace(0, n - 1, 1000).astype(np.int64)] = True
+    dates = pd.date_range("2000-01-01", periods=n, freq="D").strftime("%Y-%m-%d")
+    df = pd.DataFrame(
+        {
+            "notes": np.where(sampled, dates, "see the attached notes"),
+            "period": np.where(sampled, [20000101, 20001228] * (n // 2), 20000532),
+        }
+    )
+    df.maintain_metadata()
+    assert df.data_type["notes"] == "nominal"
+    assert df.data_type["period"] != "temporal"
+
+
+def test_parallel_type_inference(monkeypatch):
+    """Tests that columns typed on several threads are read from plain pandas columns, not from the dataframe."""
+    import threading
+    from lux.core.frame import LuxDataFrame
+
+    df = pd.read_csv("lux/data/car.csv")
+    df["Id"] = range(len(df))
+    df.maintain_metadata()
+    threads = set()
+    getitem = LuxDataFrame.__getitem__
+
+    def record_getitem(self, key):
+        threads.add(threading.current_thread())
+        return getitem(self, key)
+
+    monkeypatch.setattr(LuxDataFrame, "__getitem__", record_getitem)
+    lux.config.metadata_workers = 4
+    try:
+        parallel_df = pd.read_csv("lux/data/car.csv")
+        parallel_df["Id"] = range(len(parallel_df))
+        parallel_df.maintain_metadata()
+    finally:
+        lux.config.metadata_workers = 1
+    assert parallel_df.data_type == df.data_type
+    assert threads <= {threading.main_thread()}
+
+
 def test_set_data_type():
     df = pd.read_csv(
         "https://github.com/lux-org/lux-datasets/blob/master/data/real_estate_tutorial.csv?raw=true"
@@ -301,6 +377,74 @@ def test_ID():
     }
 
 
+def test_approx_cardinality(restore_config):
+    """Tests that high-cardinality columns are sketched instead of storing their unique values."""
+    import numpy as np
+    from lux.utils.sketch_utils import HyperLogLog
+
+    lux.config.approx_cardinality_threshold = 1000
+    n = 20000
+    df = pd.DataFrame(
+        {
+            "user_id": np.arange(n),
+            "code": [f"C-{x:06d}" for x in np.random.default_rng(0).permutation(n)],
+            "score": np.random.default_rng(1).normal(size=n),
+            "group": np.arange(n) % 7,
+        }
+    )
+    df.maintain_metadata()
+    assert df.data_type == {
+        "user_id": "id",
+        "code": "id",
+        "score": "quantitative",
+        "group": "nominal",
+    }
+    for attr in ["user_id", "code", "score"]:
+        assert attr not in df.unique_values
+        assert abs(df.cardinality[attr] - n) <= 0.02 * n
+        assert isinstance(df._column_stats[attr]["sketch"], HyperLogLog)
+    assert df.cardinality["group"] == 7
+    assert sorted(df.unique_values["group"]) == list(range(7))
+    assert df._column_stats["group"]["sketch"] is None
+
+    # Sketches of chunks merge into the sketch of the whole column
+    first, second = HyperLogLog(), HyperLogLog()
+    first.update(df["code"].values[: n // 2])
+    second.update(df["code"].values[n // 2 :])
+    merged = first.copy().merge(second)
+    assert np.array_equal(merged.registers, df._column_stats["code"]["sketch"].registers)
+    assert merged.count() > first.count()
+
+
+def test_check_evenly_spaced_id(restore_config):
+    import numpy as np
+    from lux.utils.utils import check_if_id_like, is_evenly_spaced
+
+    lux.config.approx_cardinality_threshold = 1000
+    n = 5000
+    shuffled = np.random.default_rng(0).permutation(n)
+    df = pd.DataFrame(
+        {
+            "step": np.arange(0, 3 * n, 3),
+            "countdown": np.arange(n, 0, -1),
+            "shuffled": shuffled,
+            "gap": np.append(np.arange(n - 1), n + 10),
+            "repeated": np.arange(n) // 2,
+            "timestamp": np.arange(n, dtype=float) * 0.5,
+        }
+    )
+    df.maintain_metadata()
+    assert is_evenly_spaced(df, "step") and is_evenly_spaced(df, "countdown")
+    assert is_evenly_spaced(df, "timestamp")
+    assert not is_evenly_spaced(df, "shuffled")
+    assert not is_evenly_spaced(df, "gap")
+    assert not is_evenly_spaced(df, "repeated")
+    # Evenly spaced and almost all unique attributes are ID-like, regardless of their cardinality estimate
+    for attr in ["step", "countdown", "shuffled", "gap"]:
+        assert check_if_id_like(df, attr)
+    assert not check_if_id_like(df, "repeated")
+
+
 def test_id_aug_test():
     """Tests in a different dataset
     Reference: https://www.kaggle.com/arashnic/hr-analytics-job-change-of-data-scientists